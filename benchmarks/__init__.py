@@ -0,0 +1,5 @@
+"""
+Benchmark suite for report generation on synthetic leagues.
+
+Run with: PYTHONPATH=src python -m benchmarks.run
+"""
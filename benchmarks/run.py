@@ -0,0 +1,175 @@
+"""
+benchmarks.run
+
+Times report generation on synthetic 12-, 14- and 32-team leagues and
+compares against a stored baseline.
+
+    PYTHONPATH=src python -m benchmarks.run                  # run + compare
+    PYTHONPATH=src python -m benchmarks.run --save-baseline  # refresh baseline
+    PYTHONPATH=src python -m benchmarks.run --sizes 32 --only trade_radar
+
+For each (function, league size) it reports the median and min wall time
+over --rounds runs and the peak traced allocation of one extra run. A
+result is flagged as a regression when its median is more than
+--tolerance slower than the baseline (and at least 1 ms slower, to
+ignore timer noise on tiny functions). Exits non-zero on regressions.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+os.environ.setdefault("LEAGUE_ID", "benchmark")
+os.environ.setdefault("FANTASY_AI_ROS_DISK_CACHE", "false")  # never touch the user's cache
+os.environ.setdefault("FANTASY_AI_HISTORY", "false")
+
+with contextlib.redirect_stdout(io.StringIO()):  # config modules print on import
+    from fantasy_ai.context import LeagueContext
+    from fantasy_ai.reports.weekly import weekly_report
+    from fantasy_ai.reports.trade_radar import trade_radar
+    from fantasy_ai.reports.strategy_engine import generate_weekly_strategy
+    from fantasy_ai.analysis.lineup_optimizer import suggest_lineup_swaps
+    from fantasy_ai.analysis.waiver_gems import WaiverIndex, get_top_waiver_gems
+    from fantasy_ai.analysis.recommendations import recommend_stashes
+    from fantasy_ai.analysis.league_index import LeagueIndex
+    from fantasy_ai.analysis.projected_outcome import simulate_league_week
+    from fantasy_ai.scoring import ros_score
+    from fantasy_ai.scoring.ros_score import generate_ros_scores
+    from fantasy_ai.utils.players import PlayerTable
+
+from benchmarks.synthetic import make_league, make_players
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+SIZES = (12, 14, 32)
+
+
+def build_context(data: Dict[str, Any], table: PlayerTable) -> LeagueContext:
+    """A LeagueContext fully seeded with synthetic data (no HTTP)."""
+    ctx = LeagueContext(data["league"]["league_id"], week=data["week"], display_name=data["display_name"])
+    return ctx.preload(
+        league=data["league"],
+        users=data["users"],
+        rosters=data["rosters"],
+        players=table,
+        matchups=data["matchups"],
+        transactions=data["transactions"],
+        projections=data["projections"],
+        schedule=data["schedule"],
+    )
+
+
+def cases(data: Dict[str, Any], table: PlayerTable) -> Dict[str, Callable[[], Any]]:
+    """Benchmarked callables for one league; each builds a fresh context so nothing is memoized across runs."""
+    week = data["week"]
+    me = data["display_name"]
+    users = {u["user_id"]: u["display_name"] for u in data["users"]}
+    rosters = data["rosters"]
+    matchups = data["matchups"]
+    proj = data["projections"]
+    ros = generate_ros_scores(table)
+    my_roster = next(r for r in rosters if users[r["owner_id"]] == me)
+    rostered = {pid for r in rosters for pid in r["players"]}
+    waiver_index = WaiverIndex(table, ros, proj)
+    rostered_mask = waiver_index.rostered_mask(rostered)
+
+    return {
+        "weekly_report": lambda: weekly_report(week, include_ros=True, ctx=build_context(data, table)),
+        "trade_radar": lambda: trade_radar(matchups, rosters, users, table, ros, proj, week, my_display_name=me,
+                                           roster_positions=data["league"]["roster_positions"]),
+        "suggest_lineup_swaps": lambda: suggest_lineup_swaps(
+            rosters, table, ros, week, player_proj_map=proj, users=users, my_display_name=me,
+            roster_positions=data["league"]["roster_positions"]),
+        "optimal_lineups_all": lambda: suggest_lineup_swaps(
+            rosters, table, ros, week, player_proj_map=proj, users=users,
+            roster_positions=data["league"]["roster_positions"]),
+        "get_top_waiver_gems": lambda: get_top_waiver_gems(
+            table, ros, rostered, player_proj_map=proj, my_roster=my_roster),
+        # every manager's query against one shared index + rostered bitmap
+        "waiver_gems_all_managers": lambda: [
+            get_top_waiver_gems(table, ros, rostered_mask, player_proj_map=proj, my_roster=r, index=waiver_index)
+            for r in rosters],
+        "recommend_stashes": lambda: recommend_stashes(table, roster=my_roster, ros_scores=ros),
+        "generate_ros_scores": lambda: (ros_score._memo.clear(), generate_ros_scores(table)),
+        "generate_ros_scores_memo": lambda: generate_ros_scores(table),
+        "simulate_league_week": lambda: simulate_league_week(LeagueIndex(rosters, matchups), table, proj),
+        "generate_weekly_strategy": lambda: generate_weekly_strategy(week, ctx=build_context(data, table)),
+    }
+
+
+def measure(fn: Callable[[], Any], rounds: int) -> Dict[str, float]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()  # warm-up
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fantasy AI report benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="League sizes (teams)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--only", nargs="+", help="Benchmark only these functions")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown vs baseline (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to baseline.json")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    players = make_players()
+    table = PlayerTable.from_records(players)
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results: Dict[str, Dict[str, Any]] = {}
+    regressions = []
+
+    if not args.json:
+        print(f"{'benchmark':38} {'median ms':>10} {'min ms':>10} {'peak KB':>10} {'vs base':>9}")
+    for teams in args.sizes:
+        data = make_league(teams=teams, players=players)
+        for name, fn in cases(data, table).items():
+            if args.only and name not in args.only:
+                continue
+            key = f"{name}[{teams}]"
+            res = results[key] = measure(fn, args.rounds)
+            base = baseline.get(key)
+            change = ""
+            if base:
+                ratio = res["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+                change = f"{(ratio - 1) * 100:+.0f}%"
+                if ratio > 1 + args.tolerance and res["median_ms"] - base["median_ms"] > 1.0:
+                    regressions.append(key)
+                    change += " ⚠️"
+            if not args.json:
+                print(f"{key:38} {res['median_ms']:10.2f} {res['min_ms']:10.2f} {res['peak_kb']:10.1f} {change:>9}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.save_baseline:
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"💾 Baseline written to {BASELINE_PATH}")
+    if regressions:
+        print(f"❌ Regressions (> {args.tolerance:.0%} slower than baseline): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+benchmarks.synthetic
+
+Deterministic synthetic Sleeper data for benchmarks: a ~12k player dump,
+users, rosters, matchups (already merged with projections, as
+fetch_matchups returns them), the scored weeks so far, the remaining
+schedule and transactions, for any league size.
+"""
+
+import random
+from typing import Any, Dict, List
+
+NFL_TEAMS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB",
+    "HOU", "IND", "JAX", "KC", "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG",
+    "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS",
+]
+# Rough share of the Sleeper dump per position (most entries are not fantasy relevant)
+POSITION_MIX = [("QB", 0.06), ("RB", 0.11), ("WR", 0.16), ("TE", 0.08), ("K", 0.03),
+                ("OL", 0.18), ("DL", 0.14), ("LB", 0.12), ("DB", 0.12)]
+ROSTER_POSITIONS = ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "SUPER_FLEX", "K", "DEF"]
+PLAYOFF_WEEK_START = 15
+PROJECTION_MEANS = {"QB": 17.0, "RB": 10.0, "WR": 10.0, "TE": 7.0, "K": 8.0, "DEF": 7.0}
+
+
+def make_players(n: int = 12000, seed: int = 7) -> Dict[str, Dict[str, Any]]:
+    """A players/nfl-shaped dump (already field-projected) with team DEF entries."""
+    rng = random.Random(seed)
+    positions, weights = zip(*POSITION_MIX)
+    players = {}
+    for team in NFL_TEAMS:
+        players[team] = {"player_id": team, "position": "DEF", "fantasy_positions": ["DEF"],
+                         "team": team, "first_name": team, "last_name": "Defense", "active": True}
+    for i in range(n - len(NFL_TEAMS)):
+        pid = str(1000 + i)
+        pos = rng.choices(positions, weights)[0]
+        active = rng.random() < 0.45
+        players[pid] = {
+            "player_id": pid,
+            "full_name": f"Player {pid}",
+            "first_name": "Player",
+            "last_name": pid,
+            "position": pos,
+            "fantasy_positions": [pos],
+            "team": rng.choice(NFL_TEAMS) if active else None,
+            "status": "Active" if active else "Inactive",
+            "active": active,
+        }
+    # ADP for the fantasy-relevant top of the pool
+    relevant = [pid for pid, p in players.items() if p["position"] in PROJECTION_MEANS and p.get("team")]
+    rng.shuffle(relevant)
+    for rank, pid in enumerate(relevant[:600]):
+        players[pid]["adp"] = round(rank * 0.33 + rng.random(), 1)
+    return players
+
+
+def make_projections(players: Dict[str, Dict[str, Any]], seed: int = 11) -> Dict[str, float]:
+    """player_id -> projected points for every fantasy-relevant player on a team."""
+    rng = random.Random(seed)
+    return {
+        pid: round(max(0.0, rng.gauss(PROJECTION_MEANS[p["position"]], 4.0)), 2)
+        for pid, p in players.items()
+        if p["position"] in PROJECTION_MEANS and p.get("team")
+    }
+
+
+def make_league(teams: int = 12, bench: int = 7, week: int = 5, players: Dict[str, Any] = None,
+                seed: int = 3) -> Dict[str, Any]:
+    """
+    Build a full synthetic league snapshot.
+
+    Returns a dict with league, users, rosters, matchups, schedule (raw
+    matchups for every regular-season week: scored before `week`, unplayed
+    from `week` on), transactions,
+    players, projections and display_name (the benchmarked "my" team).
+    """
+    rng = random.Random(seed + teams)
+    players = players or make_players()
+    projections = make_projections(players)
+
+    pools: Dict[str, List[str]] = {}
+    for pid in sorted(projections, key=projections.get, reverse=True):
+        pools.setdefault(players[pid]["position"], []).append(pid)
+
+    def draft(pos: str) -> str:
+        return pools[pos].pop(rng.randrange(min(8, len(pools[pos]))))
+
+    users, rosters = [], []
+    for rid in range(1, teams + 1):
+        uid = f"user{rid}"
+        users.append({"user_id": uid, "display_name": f"Manager{rid}"})
+        starters = []
+        for slot in ROSTER_POSITIONS:
+            pos = {"FLEX": rng.choice(["RB", "WR", "TE"]),
+                   "SUPER_FLEX": rng.choice(["QB", "RB", "WR"])}.get(slot, slot)
+            starters.append(draft(pos))
+        bench_ids = [draft(rng.choice(["QB", "RB", "RB", "WR", "WR", "TE"])) for _ in range(bench)]
+        rosters.append({
+            "roster_id": rid,
+            "owner_id": uid,
+            "players": starters + bench_ids,
+            "starters": starters,
+            "settings": {"wins": rng.randint(0, week - 1), "fpts": rng.randint(300, 600)},
+        })
+
+    matchups = []
+    order = list(range(teams))
+    rng.shuffle(order)
+    for slot, idx in enumerate(order):
+        r = rosters[idx]
+        proj = sum(projections.get(pid, 0.0) for pid in r["starters"])
+        matchups.append({
+            "roster_id": r["roster_id"],
+            "matchup_id": slot // 2 + 1,
+            "points": 0.0,
+            "starters": r["starters"],
+            "players": r["players"],
+            "display_points": proj,
+            "player_points": {pid: projections.get(pid, 0.0) for pid in r["players"]},
+        })
+
+    # Pairings for the rest of the regular season (raw matchups, no projections)
+    # (own RNG so the rest of the snapshot is unchanged)
+    sched_rng = random.Random(seed * 31 + teams)
+    schedule = {week: matchups}
+    for w in range(week + 1, PLAYOFF_WEEK_START):
+        pairing = list(range(teams))
+        sched_rng.shuffle(pairing)
+        schedule[w] = [
+            {"roster_id": rosters[idx]["roster_id"], "matchup_id": slot // 2 + 1, "points": 0.0,
+             "starters": rosters[idx]["starters"], "players": rosters[idx]["players"]}
+            for slot, idx in enumerate(pairing)
+        ]
+    for w in range(1, week):
+        pairing = list(range(teams))
+        sched_rng.shuffle(pairing)
+        schedule[w] = []
+        for slot, idx in enumerate(pairing):
+            r = rosters[idx]
+            proj = sum(projections.get(pid, 0.0) for pid in r["starters"])
+            schedule[w].append({"roster_id": r["roster_id"], "matchup_id": slot // 2 + 1,
+                                "points": round(max(0.0, sched_rng.gauss(proj, 20.0)), 2),
+                                "starters": r["starters"], "players": r["players"]})
+
+    free_agents = [pid for pool in pools.values() for pid in pool]
+    transactions = []
+    for t in range(teams * 4):
+        rid = rng.randint(1, teams)
+        add = rng.choice(free_agents)
+        drop = rng.choice(rosters[rid - 1]["players"])
+        transactions.append({
+            "transaction_id": str(900000 + t),
+            "type": rng.choice(["waiver", "free_agent", "free_agent", "trade"]),
+            "status": "complete",
+            "roster_ids": [rid],
+            "creator": f"user{rid}",
+            "adds": {add: rid},
+            "drops": {drop: rid},
+            "leg": week,
+        })
+
+    league = {
+        "league_id": f"bench{teams}",
+        "name": f"Benchmark League ({teams} teams)",
+        "season": "2025",
+        "week": week,
+        "total_rosters": teams,
+        "roster_positions": ROSTER_POSITIONS + ["BN"] * bench,
+        "settings": {"num_teams": teams, "playoff_teams": 6, "playoff_week_start": PLAYOFF_WEEK_START,
+                     "last_scored_leg": week - 1},
+        "scoring_settings": {"rec": 1.0},
+    }
+    return {
+        "league": league,
+        "users": users,
+        "rosters": rosters,
+        "matchups": matchups,
+        "schedule": schedule,
+        "transactions": transactions,
+        "players": players,
+        "projections": projections,
+        "display_name": "Manager1",
+        "week": week,
+    }
@@ -0,0 +1,81 @@
+"""
+fantasy_ai.analysis.league_index
+
+One-pass lookup tables over a league snapshot (rosters plus, optionally,
+one week of matchups), so reports resolve rosters, opponents and player
+ownership with dict lookups instead of scanning lists inside loops.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class LeagueIndex:
+    """
+    Lookups built once per snapshot:
+
+      roster(roster_id)          roster_id -> roster
+      roster_of_owner(owner_id)  owner_id  -> roster
+      roster_of_player(pid)      player_id -> owning roster
+      pair(matchup_id)           matchup_id -> [entry, entry]
+      entry(roster_id)           roster_id -> that roster's matchup entry
+      opponent(roster_id)        roster_id -> opponent's matchup entry
+    """
+
+    def __init__(self, rosters: List[Dict[str, Any]], matchups: Optional[List[Dict[str, Any]]] = None):
+        self.rosters = rosters or []
+        self.by_roster_id: Dict[Any, Dict[str, Any]] = {}
+        self.by_owner_id: Dict[Any, Dict[str, Any]] = {}
+        self.player_owner: Dict[str, Dict[str, Any]] = {}
+        for r in self.rosters:
+            self.by_roster_id[r.get("roster_id")] = r
+            if r.get("owner_id") is not None:
+                self.by_owner_id.setdefault(r["owner_id"], r)
+            for pid in r.get("players") or []:
+                self.player_owner[pid] = r
+
+        # matchup_id -> entries in feed order; matchups without an id (byes) have no pair
+        self.pairs: Dict[Any, List[Dict[str, Any]]] = {}
+        self.entries: Dict[Any, Dict[str, Any]] = {}
+        for m in matchups or []:
+            if "roster_id" in m:
+                self.entries[m["roster_id"]] = m
+            mid = m.get("matchup_id")
+            if mid is not None:
+                self.pairs.setdefault(mid, []).append(m)
+
+    @property
+    def rostered_ids(self) -> set:
+        """Every player id on any roster."""
+        return set(self.player_owner)
+
+    def roster(self, roster_id: Any) -> Optional[Dict[str, Any]]:
+        return self.by_roster_id.get(roster_id)
+
+    def roster_of_owner(self, owner_id: Any) -> Optional[Dict[str, Any]]:
+        return self.by_owner_id.get(owner_id)
+
+    def roster_of_player(self, player_id: Any) -> Optional[Dict[str, Any]]:
+        return self.player_owner.get(player_id)
+
+    def pair(self, matchup_id: Any) -> List[Dict[str, Any]]:
+        return self.pairs.get(matchup_id, [])
+
+    def entry(self, roster_id: Any) -> Optional[Dict[str, Any]]:
+        return self.entries.get(roster_id)
+
+    def opponent(self, roster_id: Any) -> Optional[Dict[str, Any]]:
+        """Matchup entry of the team facing roster_id this week (None on a bye)."""
+        entry = self.entries.get(roster_id)
+        if entry is None:
+            return None
+        return next((m for m in self.pair(entry.get("matchup_id")) if m.get("roster_id") != roster_id), None)
+
+    def opponent_roster(self, roster_id: Any) -> Optional[Dict[str, Any]]:
+        opp = self.opponent(roster_id)
+        return self.by_roster_id.get(opp.get("roster_id")) if opp else None
+
+    def head_to_head(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Yield each two-team matchup once, in feed order."""
+        for entries in self.pairs.values():
+            if len(entries) == 2:
+                yield entries[0], entries[1]
@@ -3,23 +3,194 @@ fantasy_ai.analysis.lineup_optimizer
 
 Suggests optimal starting lineups based on projections, ROS scores,
 and positional depth.
+
+Lineups are solved as an assignment problem over the league's starting
+slots (roster_positions), so flex slots (FLEX, SUPER_FLEX, REC_FLEX,
+WRRB_FLEX, IDP_FLEX) are filled legally and the result is the best
+lineup overall rather than a list of pairwise swaps.
 """
 
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence, Tuple
+
 from fantasy_ai.utils.helpers import normalize_name
 
+# Which player positions each starting slot accepts.
+SLOT_ELIGIBILITY: Dict[str, frozenset] = {
+    "QB": frozenset({"QB"}),
+    "RB": frozenset({"RB"}),
+    "WR": frozenset({"WR"}),
+    "TE": frozenset({"TE"}),
+    "K": frozenset({"K"}),
+    "DEF": frozenset({"DEF"}),
+    "DL": frozenset({"DL", "DE", "DT"}),
+    "LB": frozenset({"LB"}),
+    "DB": frozenset({"DB", "CB", "S"}),
+    "FLEX": frozenset({"RB", "WR", "TE"}),
+    "WRRB_FLEX": frozenset({"WR", "RB"}),
+    "REC_FLEX": frozenset({"WR", "TE"}),
+    "SUPER_FLEX": frozenset({"QB", "RB", "WR", "TE"}),
+    "IDP_FLEX": frozenset({"DL", "DE", "DT", "LB", "DB", "CB", "S"}),
+}
+
+# roster_positions entries that are not starting slots.
+NON_STARTING_SLOTS = frozenset({"BN", "IR", "TAXI"})
+
+# Tie-breakers far below projection precision: fill a slot with a 0-point
+# player rather than leave it empty, and keep the current starter on equal
+# projections (no churn tips).
+_FILL_BONUS = 1e-4
+_KEEP_BONUS = 1e-7
+
+
+def starting_slots(roster_positions: Optional[Sequence[str]]) -> List[str]:
+    """Starting slots from a league's roster_positions (bench/IR/taxi dropped)."""
+    return [s for s in (roster_positions or []) if s not in NON_STARTING_SLOTS]
+
+
+def player_positions(player: Mapping[str, Any]) -> frozenset:
+    """Every position a player is eligible at (fantasy_positions, else position)."""
+    positions = player.get("fantasy_positions") or ([player["position"]] if player.get("position") else [])
+    return frozenset(positions)
+
+
+def slot_accepts(slot: str, positions: frozenset) -> bool:
+    return not positions.isdisjoint(SLOT_ELIGIBILITY.get(slot, (slot,)))
+
+
+def _assign(cost: List[List[float]]) -> List[int]:
+    """
+    Minimum-cost assignment of rows to distinct columns (Hungarian method,
+    O(rows² · cols)); requires rows <= cols. Returns the column per row.
+    """
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)  # p[j]: row (1-based) assigned to column j
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    result = [-1] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            result[p[j] - 1] = j - 1
+    return result
+
 
-def suggest_lineup_swaps(rosters, players, ros_scores, week, player_proj_map=None, users=None, my_display_name=None):
+def best_lineup(pool: Sequence[str], slots: Sequence[str], eligible_at: Mapping[str, frozenset],
+                pts: Mapping[str, float], keep: Collection[str] = ()) -> List[Tuple[str, Optional[str], float]]:
     """
-    Suggest bench-to-starter swaps for a specific roster (my_display_name) based on player-level projections and ROS scores.
+    Core solver: the best legal lineup from pool as (slot, player_id or
+    None, points) per slot, in slot order.
+
+    eligible_at: player_id -> positions (player_positions()); pts: player_id -> points
+    keep: current starters, which win ties against equal projections
+    """
+    # Only players that fit some slot can start
+    candidates = [pid for pid in pool if any(slot_accepts(s, eligible_at[pid]) for s in slots)]
+    lineup: List[Tuple[str, Optional[str], float]] = []
+    if slots:
+        width = max(len(candidates), len(slots))  # dummy columns = empty slot
+        cost = []
+        for slot in slots:
+            row = []
+            for pid in candidates:
+                if slot_accepts(slot, eligible_at[pid]):
+                    row.append(-(_FILL_BONUS + pts[pid] + (_KEEP_BONUS if pid in keep else 0.0)))
+                else:
+                    row.append(0.0)
+            row.extend([0.0] * (width - len(candidates)))
+            cost.append(row)
+        for i, col in enumerate(_assign(cost)):
+            pid = candidates[col] if col < len(candidates) and cost[i][col] < 0 else None
+            lineup.append((slots[i], pid, pts[pid] if pid else 0.0))
+    return lineup
+
+
+def optimal_lineup(roster: Mapping[str, Any], slots: Sequence[str], players: Mapping[str, Any],
+                   points: Mapping[str, float]) -> Dict[str, Any]:
+    """
+    Best legal lineup for one roster.
+
+    roster: roster dict (players, starters)
+    slots: starting slots in order, e.g. starting_slots(league["roster_positions"])
+    players: player_id -> player metadata (dict or PlayerTable)
+    points: player_id -> projected points used for ranking
+
+    Returns {"lineup": [(slot, player_id or None, points)], "optimal_points",
+    "current_points", "gain", "start": [player_id], "bench": [player_id]}.
+    """
+    current = [pid for pid in (roster.get("starters") or []) if pid and pid != "0"]
+    current_set = set(current)
+    pool = [pid for pid in dict.fromkeys((roster.get("players") or []) + current) if pid and pid != "0"]
+    pts = {pid: float(points.get(pid, 0.0) or 0.0) for pid in pool}
+    eligible_at = {pid: player_positions(players.get(pid, {})) for pid in pool}
+    lineup = best_lineup(pool, slots, eligible_at, pts, keep=current_set)
+
+    chosen = {pid for _, pid, _ in lineup if pid}
+    optimal_points = sum(p for _, _, p in lineup)
+    current_points = sum(pts.get(pid, 0.0) for pid in current)
+    return {
+        "lineup": lineup,
+        "optimal_points": round(optimal_points, 2),
+        "current_points": round(current_points, 2),
+        "gain": round(optimal_points - current_points, 2),
+        "start": [pid for _, pid, _ in lineup if pid and pid not in current_set],
+        "bench": [pid for pid in current if pid not in chosen],
+    }
+
+
+def suggest_lineup_swaps(rosters, players, ros_scores, week, player_proj_map=None, users=None, my_display_name=None,
+                         roster_positions=None, min_gain=1.0):
+    """
+    Suggest the lineup changes that reach the optimal lineup for a specific roster (my_display_name).
 
     rosters: list of roster dicts from fetch_rosters()
     players: dict of player_id -> player metadata from fetch_players()
     ros_scores: dict of player_id -> ROS score
     week: int, current week number
-    player_proj_map: optional dict of player_id (str) -> projected points for this week
+    player_proj_map: optional dict of player_id (str) -> projected points for this week;
+                     when omitted, lineups are ranked by ROS score instead
     users: dict of user_id -> display_name
-    my_display_name: str, the display name of the roster owner to filter on
+    my_display_name: str, the display name of the roster owner to filter on (None = every roster)
+    roster_positions: league roster_positions; when omitted each starter keeps its own position as its slot
+    min_gain: smallest projected improvement worth a tip
     """
+    points = player_proj_map if player_proj_map is not None else (ros_scores or {})
+    slots = starting_slots(roster_positions)
+
     tips = []
     for r in rosters:
         owner_id = r.get("owner_id", "Unknown")
@@ -29,40 +200,26 @@ def suggest_lineup_swaps(rosters, players, ros_scores, week, player_proj_map=Non
         if my_display_name and owner_name != my_display_name:
             continue
 
-        starters = r.get("starters", []) or []
-        bench = [p for p in (r.get("players") or []) if p not in starters]
-
-        for s_pid in starters:
-            s_player = players.get(s_pid, {})
-            # Prefer live projection from player_proj_map
-            s_proj = None
-            if player_proj_map is not None:
-                s_proj = player_proj_map.get(str(s_pid))
-            if s_proj is None:
-                s_proj = s_player.get("projected_points") or ros_scores.get(s_pid, 0)
-            s_proj = float(s_proj or 0.0)
-
-            # Skip inactive/placeholder starters at core positions
-            if s_proj == 0 and s_player.get("position") in ["QB", "RB", "WR", "TE"]:
-                continue
-
-            for b_pid in bench:
-                b_player = players.get(b_pid, {})
-                b_proj = None
-                if player_proj_map is not None:
-                    b_proj = player_proj_map.get(str(b_pid))
-                if b_proj is None:
-                    b_proj = b_player.get("projected_points") or ros_scores.get(b_pid, 0)
-                b_proj = float(b_proj or 0.0)
-
-                if b_proj > max(s_proj + 2, 10):
-                    s_name = normalize_name(s_player)
-                    b_name = normalize_name(b_player)
-                    tips.append(
-                        f"  ✅ {owner_name}: Start {b_name} ({b_proj:.1f}) over {s_name} ({s_proj:.1f})"
-                    )
+        roster_slots = slots or [
+            players.get(pid, {}).get("position") or "BN" for pid in (r.get("starters") or [])
+        ]
+        result = optimal_lineup(r, starting_slots(roster_slots), players, points)
+        if result["gain"] < min_gain:
+            continue
+
+        tips.append(
+            f"  📋 {owner_name}: optimal lineup projects {result['optimal_points']:.1f} pts "
+            f"(+{result['gain']:.1f} over current {result['current_points']:.1f})"
+        )
+        slot_of = {pid: slot for slot, pid, _ in result["lineup"] if pid}
+        for pid in result["start"]:
+            p = players.get(pid, {})
+            tips.append(f"  ✅ Start {normalize_name(p)} at {slot_of[pid]} ({points.get(pid, 0.0) or 0.0:.1f})")
+        for pid in result["bench"]:
+            p = players.get(pid, {})
+            tips.append(f"  ⬇️ Bench {normalize_name(p)} ({points.get(pid, 0.0) or 0.0:.1f})")
 
     if not tips:
         tips.append("  No lineup changes suggested this week.")
 
-    return tips
\ No newline at end of file
+    return tips
@@ -3,47 +3,238 @@ fantasy_ai.analysis.matchup_context
 
 Provides contextual data for weekly matchups, including opponent strength,
 schedule difficulty, and player availability.
+
+Defense-vs-position (DvP) rankings are computed from weekly player stats:
+the average fantasy points each defense allows per game to each
+position, ranked from 1 (fewest allowed: tough) to the number of
+defenses (most allowed: soft). MatchupMatrix combines them with the team
+schedule (schedule_mapper) into dense player × week arrays once, so a
+matchup lookup is a dict hit plus two array reads.
+
+Weekly stats come from FANTASY_AI_NFL_STATS:
+
+  - a JSON file: {week: [entry, ...]} or a list of entries with "week"
+  - an http(s) URL template with {season} and {week} placeholders (e.g.
+    Sleeper's stats feed or a local stand-in); completed weeks are kept
+    in the disk cache permanently
+
+Entries follow the Sleeper stats feed: team, opponent (optional; taken
+from the schedule when missing), position (or player.position) and
+stats.pts_ppr / pts_half_ppr / pts_std (or pts).
 """
 
-# Mock defensive rankings by position (FantasyPros-style)
+import json
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from fantasy_ai.analysis.schedule_mapper import TeamSchedule, opponent_rows
+from fantasy_ai.utils.fetch import (
+    PROJECTION_POINT_FIELDS,
+    PROJECTIONS_TTL_LIVE,
+    fetch_cached,
+    fetch_concurrently,
+    fetch_state,
+    week_locked,
+)
+from fantasy_ai.utils.players import as_player_table
+
+STATS_SOURCE = os.getenv("FANTASY_AI_NFL_STATS")
+
+# Weeks covered by the dense matrices (regular season plus playoffs)
+MAX_WEEK = 18
+
+# Rank thresholds for the difficulty labels (out of 32 defenses)
+TOUGH_MAX_RANK = 8
+NEUTRAL_MAX_RANK = 24
+
+DefenseRankings = Dict[str, Dict[str, int]]
+
+
+def _entry_position(entry: Mapping[str, Any]) -> Optional[str]:
+    return entry.get("position") or (entry.get("player") or {}).get("position")
+
+
+def _entry_points(entry: Mapping[str, Any], field: str) -> float:
+    stats = entry.get("stats") or {}
+    return float(stats.get(field) or stats.get("pts") or entry.get("pts") or 0.0)
+
+
+def load_weekly_stats(source: Optional[str] = None, weeks: Optional[Iterable[int]] = None,
+                      season: Optional[Any] = None) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    {week: stat entries} from a file or URL template (default
+    FANTASY_AI_NFL_STATS). weeks defaults to every completed week of the
+    season (URL sources) or everything in the file. Returns {} when no
+    source is set.
+    """
+    source = source or STATS_SOURCE
+    if not source:
+        return {}
+
+    if source.startswith("http://") or source.startswith("https://"):
+        state = fetch_state()
+        season = season or state.get("season")
+        if weeks is None:
+            weeks = range(1, int(state.get("week") or 1))
+
+        def load(week):
+            ttl = None if week_locked(season, week) else PROJECTIONS_TTL_LIVE
+            url = source.format(season=season, week=week)
+            return fetch_cached(url, f"nfl_stats_{season}_{week}_{source}", ttl)
+
+        results = fetch_concurrently({str(w): (lambda w=w: load(w)) for w in weeks})
+        return {
+            int(w): list(feed.values()) if isinstance(feed, dict) else list(feed or [])
+            for w, feed in results.items()
+        }
+
+    with open(source, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if isinstance(data, Mapping):
+        weekly = {int(w): list(entries or []) for w, entries in data.items()}
+    else:
+        weekly = {}
+        for entry in data or []:
+            if entry.get("week") not in (None, ""):
+                weekly.setdefault(int(entry["week"]), []).append(entry)
+    wanted = set(weeks) if weeks is not None else None
+    return {w: entries for w, entries in weekly.items() if wanted is None or w in wanted}
+
+
+def compute_defense_rankings(weekly_stats: Mapping[int, List[Dict[str, Any]]],
+                             team_schedule: Optional[TeamSchedule] = None,
+                             scoring_key: str = "ppr") -> DefenseRankings:
+    """
+    {position: {defense team: rank}} from weekly stat entries; rank 1
+    allows the fewest fantasy points per game to that position.
+    """
+    field = PROJECTION_POINT_FIELDS.get(scoring_key, f"pts_{scoring_key}")
+    allowed: Dict[str, Dict[str, float]] = {}      # pos -> defense -> points allowed
+    games: Dict[str, set] = {}                     # defense -> weeks faced an offense
+
+    for week, entries in weekly_stats.items():
+        for entry in entries:
+            pos = _entry_position(entry)
+            opp = entry.get("opponent") or (team_schedule or {}).get(entry.get("team"), {}).get(week)
+            if not pos or not opp:
+                continue
+            by_def = allowed.setdefault(pos, {})
+            by_def[opp] = by_def.get(opp, 0.0) + _entry_points(entry, field)
+            games.setdefault(opp, set()).add(week)
+
+    rankings: DefenseRankings = {}
+    for pos, by_def in allowed.items():
+        per_game = sorted(by_def, key=lambda d: (by_def[d] / len(games[d]), d))
+        rankings[pos] = {defense: rank for rank, defense in enumerate(per_game, 1)}
+    return rankings
 
-DEFENSE_RANKINGS = {
-    "WR": {"CIN": 30, "CAR": 28, "ARI": 31},
-    "RB": {"CIN": 29, "CAR": 30, "ARI": 32},
-    "TE": {"CIN": 27, "CAR": 25, "ARI": 31},
-    "QB": {"CIN": 26, "CAR": 24, "ARI": 30},
-    "DEF": {"CIN": 31, "CAR": 29, "ARI": 32}
-}
 
-# Mock schedule: player_id → opponent team for given week
-PLAYER_SCHEDULE = {
-    "1234": {15: "CIN"},
-    "5678": {15: "ARI"},
-    "9101": {15: "NE"},
-    # Add more as needed
-}
+def difficulty_label(rank: int, defenses: int = 32) -> str:
+    """Difficulty bucket for a DvP rank (thresholds scaled to the number of defenses)."""
+    scale = defenses / 32 if defenses else 1.0
+    if rank <= TOUGH_MAX_RANK * scale:
+        return "tough matchup"
+    if rank <= NEUTRAL_MAX_RANK * scale:
+        return "neutral matchup"
+    return "soft matchup"
 
-def get_matchup_difficulty(player, week, player_schedule=None):
+
+class MatchupMatrix:
+    """
+    Dense player × week opponent / DvP-rank matrices over a PlayerTable.
+
+      opponent(pid, week)  opponent team or None (bye / unknown)
+      rank(pid, week)      DvP rank of that opponent vs the player's position, or None
+      difficulty(pid, week) "W15 vs CIN (soft matchup)"-style string
+
+    Built once per schedule / stats snapshot (LeagueContext.matchup_matrix);
+    every lookup afterwards is O(1).
+    """
+
+    def __init__(self, players, team_schedule: TeamSchedule, defense_rankings: DefenseRankings,
+                 weeks: int = MAX_WEEK):
+        self.table = as_player_table(players)
+        table = self.table
+        self.weeks = weeks
+
+        # Team vocabulary: the table's team codes, plus teams only the schedule knows
+        self.teams: List[str] = list(table.labels["team"])
+        scheduled = set(team_schedule) | {opp for by_week in team_schedule.values() for opp in by_week.values()}
+        self.teams.extend(sorted(scheduled - set(self.teams)))
+        self.team_index = {t: i for i, t in enumerate(self.teams)}
+
+        # (team + 1, week + 1) opponents; row -1 = no team
+        self.team_opponents = opponent_rows(team_schedule, self.teams, weeks)
+
+        # (position + 1, team + 1) DvP ranks; row / column -1 = unknown
+        positions = table.labels["position"]
+        self.rank_table = np.full((len(positions) + 1, len(self.teams) + 1), -1, dtype=np.int16)
+        self.defenses = {pos: len(ranks) for pos, ranks in defense_rankings.items()}
+        for p, pos in enumerate(positions):
+            for team, rank in (defense_rankings.get(pos) or {}).items():
+                if team in self.team_index:
+                    self.rank_table[p, self.team_index[team]] = rank
+
+        # The dense player × week matrices (row -1 codes pick the trailing "unknown" row)
+        self.opponents = self.team_opponents[table.codes["team"]]
+        self.ranks = self.rank_table[table.codes["position"][:, None], self.opponents]
+
+    def _cell(self, pid: Any, week: int):
+        i = self.table.index.get(str(pid)) if pid is not None else None
+        if i is None or not 0 < week <= self.weeks:
+            return None
+        return i
+
+    def opponent(self, pid: Any, week: int) -> Optional[str]:
+        i = self._cell(pid, week)
+        if i is None:
+            return None
+        code = self.opponents[i, week]
+        return self.teams[code] if code >= 0 else None
+
+    def rank(self, pid: Any, week: int) -> Optional[int]:
+        i = self._cell(pid, week)
+        if i is None:
+            return None
+        rank = int(self.ranks[i, week])
+        return rank if rank > 0 else None
+
+    def difficulty(self, pid: Any, week: int) -> str:
+        opponent = self.opponent(pid, week)
+        pos = self.table.label("position", self.table.index[str(pid)]) if opponent else None
+        if not opponent or pos not in self.defenses:
+            return "Unknown matchup"
+        rank = self.rank(pid, week)
+        if rank is None:
+            return f"W{week} vs {opponent} (no data)"
+        return f"W{week} vs {opponent} ({difficulty_label(rank, self.defenses[pos])})"
+
+
+def get_matchup_difficulty(player, week, player_schedule=None, defense_rankings=None, matrix=None):
     """
     Returns matchup difficulty string for a player in a given week.
     Example: "W15 vs CIN (soft matchup)"
+
+    matrix: a MatchupMatrix; when given this is an O(1) lookup by player_id.
+    Otherwise the opponent comes from player_schedule ({pid: {week: opp}},
+    see schedule_mapper.build_player_schedule) and the rank from
+    defense_rankings (compute_defense_rankings).
     """
     pid = player.get("player_id")
+    if matrix is not None and pid in matrix.table:
+        return matrix.difficulty(pid, week)
+
     pos = player.get("position", "UNK")
     opponent = player_schedule.get(pid, {}).get(week) if player_schedule else None
-   
-    if not opponent or pos not in DEFENSE_RANKINGS:
+    rankings = defense_rankings or {}
+
+    if not opponent or pos not in rankings:
         return "Unknown matchup"
 
-    rank = DEFENSE_RANKINGS[pos].get(opponent)
+    rank = rankings[pos].get(opponent)
     if rank is None:
         return f"W{week} vs {opponent} (no data)"
 
-    if rank <= 8:
-        label = "tough matchup"
-    elif rank <= 24:
-        label = "neutral matchup"
-    else:
-        label = "soft matchup"
-
-    return f"W{week} vs {opponent} ({label})"
\ No newline at end of file
+    return f"W{week} vs {opponent} ({difficulty_label(rank, len(rankings[pos]))})"
@@ -3,58 +3,191 @@ fantasy_ai.analysis.projected_outcome
 
 Generates projected outcomes for matchups based on current rosters,
 player projections, and scoring settings.
+
+Weekly matchups are simulated with a seeded Monte Carlo: every starter's
+score is drawn from a position-specific distribution around its
+projection (gamma for skill positions, so scores are right-skewed and
+never negative; normal for K/DEF, which can go below zero), and all
+trials are drawn at once as a NumPy matrix.
+
+  FANTASY_AI_SIM_TRIALS   trials per matchup (default 20000)
+  FANTASY_AI_SIM_SEED     base random seed (default 2024)
 """
 
-def simulate_weekly_matchup(my_roster_ids, opp_roster_ids, matchups):
-    """
-    Returns projected points for both teams and win probability.
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
-    Uses player-level projections from each matchup's 'player_points' dict
-    (populated by fetch_matchups) if available. Falls back to 0.0 if no
-    projection is found for a player.
-    """
-    # Build a single player_id -> projection map from all matchups
+import numpy as np
+
+SIM_TRIALS = int(os.getenv("FANTASY_AI_SIM_TRIALS", "20000"))
+SIM_SEED = int(os.getenv("FANTASY_AI_SIM_SEED", "2024"))
+
+# Per-position spread of weekly scores: coefficient of variation around the projection
+# and the distribution family. Positions not listed use DEFAULT_VOLATILITY.
+POSITION_VOLATILITY: Dict[str, Dict[str, Any]] = {
+    "QB": {"cv": 0.35, "dist": "gamma"},
+    "RB": {"cv": 0.50, "dist": "gamma"},
+    "WR": {"cv": 0.55, "dist": "gamma"},
+    "TE": {"cv": 0.60, "dist": "gamma"},
+    "K": {"cv": 0.45, "dist": "normal"},
+    "DEF": {"cv": 0.70, "dist": "normal"},
+}
+DEFAULT_VOLATILITY: Dict[str, Any] = {"cv": 0.55, "dist": "gamma"}
+# Smallest standard deviation given to any starter (points)
+MIN_SD = 1.5
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _proj_map_from_matchups(matchups: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """player_id -> projection merged from each matchup's 'player_points' (fetch_matchups)."""
     player_proj_map = {}
-    for m in matchups:
-        player_points = m.get("player_points", {}) or {}
-        for pid, pts in player_points.items():
+    for m in matchups or []:
+        for pid, pts in (m.get("player_points") or {}).items():
             player_proj_map[str(pid)] = float(pts or 0.0)
+    return player_proj_map
+
+
+def _lineup_params(roster_ids: Iterable[Any], player_proj_map: Mapping[str, float],
+                   players: Optional[Mapping[str, Any]]):
+    """Arrays of mean, sd and a gamma/normal flag for one lineup (empty slots dropped)."""
+    means, sds, is_gamma = [], [], []
+    for pid in roster_ids:
+        if not pid or pid == "0":
+            continue
+        mean = float(player_proj_map.get(str(pid), 0.0) or 0.0)
+        pos = (players.get(pid, {}) if players is not None else {}).get("position")
+        vol = POSITION_VOLATILITY.get(pos, DEFAULT_VOLATILITY)
+        means.append(mean)
+        sds.append(max(abs(mean) * vol["cv"], MIN_SD))
+        is_gamma.append(vol["dist"] == "gamma" and mean > 0)
+    return np.array(means), np.array(sds), np.array(is_gamma, dtype=bool)
+
+
+def lineup_distribution(roster_ids: Iterable[Any], player_proj_map: Mapping[str, float],
+                        players: Optional[Mapping[str, Any]] = None) -> Tuple[float, float]:
+    """(mean, sd) of a lineup's weekly total, treating starters as independent."""
+    means, sds, _ = _lineup_params(roster_ids, player_proj_map, players)
+    return float(means.sum()), float(np.sqrt((sds ** 2).sum()))
+
+
+def _draw(rng: np.random.Generator, means: np.ndarray, sds: np.ndarray, is_gamma: np.ndarray,
+          trials: int) -> np.ndarray:
+    """Total lineup score per trial."""
+    total = np.zeros(trials)
+    if is_gamma.any():
+        m, s = means[is_gamma], sds[is_gamma]
+        shape = (m / s) ** 2  # mean = k·θ, var = k·θ²
+        total += rng.gamma(shape, s * s / m, size=(trials, m.size)).sum(axis=1)
+    normal = ~is_gamma
+    if normal.any():
+        total += rng.normal(means[normal], sds[normal], size=(trials, int(normal.sum()))).sum(axis=1)
+    return total
 
-    def total_proj(roster_ids):
-        return sum(float(player_proj_map.get(str(pid), 0.0)) for pid in roster_ids)
 
-    my_score = total_proj(my_roster_ids)
-    opp_score = total_proj(opp_roster_ids)
+def _seed_for(my_roster_ids: Iterable[Any], opp_roster_ids: Iterable[Any], seed: int) -> List[int]:
+    """Stable per-matchup seed so each matchup gets its own but reproducible stream."""
+    key = ",".join(map(str, my_roster_ids)) + "|" + ",".join(map(str, opp_roster_ids))
+    return [seed, zlib.crc32(key.encode("utf-8"))]
 
-    # Simple win probability model
-    diff = my_score - opp_score
-    if diff == 0:
-        win_prob = 50
-    elif diff > 0:
-        win_prob = min(90, 50 + diff * 2)
-    else:
-        win_prob = max(10, 50 + diff * 2)
+
+def simulate_weekly_matchup(my_roster_ids, opp_roster_ids, matchups=None, players=None, player_proj_map=None,
+                            trials=None, seed=None):
+    """
+    Monte Carlo simulation of one weekly matchup.
+
+    my_roster_ids / opp_roster_ids: starter player ids of each side
+    matchups: fetch_matchups() output; only used to build projections when
+              player_proj_map is not given
+    players: optional player_id -> metadata (dict or PlayerTable) for positions
+    player_proj_map: optional player_id (str) -> projected points
+    trials / seed: default FANTASY_AI_SIM_TRIALS / FANTASY_AI_SIM_SEED
+
+    Returns projected points for both teams, win probability (%), score
+    percentiles, the margin distribution and the upset chance / typical
+    upset margin for the underdog.
+    """
+    if player_proj_map is None:
+        player_proj_map = _proj_map_from_matchups(matchups)
+    trials = trials or SIM_TRIALS
+    seed = SIM_SEED if seed is None else seed
+    my_roster_ids = list(my_roster_ids or [])
+    opp_roster_ids = list(opp_roster_ids or [])
+
+    rng = np.random.default_rng(_seed_for(my_roster_ids, opp_roster_ids, seed))
+    my_params = _lineup_params(my_roster_ids, player_proj_map, players)
+    opp_params = _lineup_params(opp_roster_ids, player_proj_map, players)
+    my_totals = _draw(rng, *my_params, trials)
+    opp_totals = _draw(rng, *opp_params, trials)
+    margin = my_totals - opp_totals
+
+    my_score = float(my_params[0].sum())
+    opp_score = float(opp_params[0].sum())
+    win_prob = (np.count_nonzero(margin > 0) + 0.5 * np.count_nonzero(margin == 0)) / trials * 100
+
+    # Underdog = lower projection; upset = underdog outscores the favorite
+    underdog_margin = -margin if my_score >= opp_score else margin
+    upsets = underdog_margin[underdog_margin > 0]
+
+    def pct(values: np.ndarray) -> Dict[str, float]:
+        return {f"p{q}": round(float(v), 1) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
 
     return {
         "my_score": round(my_score, 1),
         "opp_score": round(opp_score, 1),
-        "win_prob": round(win_prob, 1)
+        "win_prob": round(float(win_prob), 1),
+        "my_percentiles": pct(my_totals),
+        "opp_percentiles": pct(opp_totals),
+        "margin_percentiles": pct(margin),
+        "upset_prob": round(upsets.size / trials * 100, 1),
+        "upset_margin": round(float(np.median(upsets)), 1) if upsets.size else 0.0,
+        "trials": trials,
     }
 
 
-def project_season_outcome(current_record, remaining_schedule, matchups):
+def simulate_league_week(index, players=None, player_proj_map=None, trials=None, seed=None):
+    """
+    Simulate every head-to-head matchup of a week.
+
+    index: LeagueIndex built with that week's matchups (ctx.index_for(week));
+           starters come from each matchup entry, falling back to the roster
+    Returns {matchup_id: {"roster_ids": (a, b), **simulate_weekly_matchup(...)}}.
+    """
+    if player_proj_map is None:
+        player_proj_map = _proj_map_from_matchups(m for pair in index.pairs.values() for m in pair)
+    results = {}
+    for a, b in index.head_to_head():
+        lineups = [
+            entry.get("starters") or (index.roster(entry.get("roster_id")) or {}).get("starters") or []
+            for entry in (a, b)
+        ]
+        result = simulate_weekly_matchup(lineups[0], lineups[1], players=players, player_proj_map=player_proj_map,
+                                         trials=trials, seed=seed)
+        results[a.get("matchup_id")] = {"roster_ids": (a.get("roster_id"), b.get("roster_id")), **result}
+    return results
+
+
+def project_season_outcome(current_record, remaining_schedule, matchups, players=None, player_proj_map=None):
     """
     Simulates remaining games and returns projected record and playoff odds.
 
     Uses player-level projections from matchups['player_points'] if available.
     """
+    if player_proj_map is None:
+        player_proj_map = _proj_map_from_matchups(matchups)
     wins = current_record.get("wins", 0)
     losses = current_record.get("losses", 0)
 
+    simulated = {}
     for matchup in remaining_schedule:
         my_roster = matchup.get("my_roster", [])
         opp_roster = matchup.get("opp_roster", [])
-        result = simulate_weekly_matchup(my_roster, opp_roster, matchups)
+        key = (tuple(my_roster), tuple(opp_roster))
+        if key not in simulated:  # repeated lineups need only one simulation
+            simulated[key] = simulate_weekly_matchup(my_roster, opp_roster, players=players,
+                                                     player_proj_map=player_proj_map)
+        result = simulated[key]
         if result["win_prob"] >= 50:
             wins += 1
         else:
@@ -71,4 +204,4 @@ def project_season_outcome(current_record, remaining_schedule, matchups):
         "projected_record": f"{wins}-{losses}",
         "playoff_odds": f"{playoff_odds}%",
         "note": "Based on current roster and projected matchups"
-    }
\ No newline at end of file
+    }
@@ -5,7 +5,10 @@ Provides tactical suggestions for adds, trades, and stashes based on
 roster context, positional depth, and ROS upside.
 """
 
+import numpy as np
+
 from fantasy_ai.utils.helpers import normalize_name
+from fantasy_ai.utils.players import as_player_table
 
 
 def recommend_adds(added_player_ids, players, my_display_name=None, users=None, rosters=None):
@@ -62,24 +65,25 @@ def recommend_stashes(players, roster=None, ros_scores=None, limit=5):
     if not roster:
         return []
 
+    table = as_player_table(players)
     rostered_ids = set(roster.get("players", []))
     depth_map = {}
     for pid in rostered_ids:
-        p = players.get(pid, {})
+        p = table.get(pid, {})
         pos = p.get("position", "UNK")
         depth_map[pos] = depth_map.get(pos, 0) + 1
 
-    # Filter unrostered players
-    unrostered = [pid for pid in players if pid not in rostered_ids]
+    # Column scan: unrostered players at thin positions with ROS upside
+    thin_positions = [pos for pos in table.labels["position"] if depth_map.get(pos, 0) < 2]
+    if depth_map.get("UNK", 0) < 2:
+        thin_positions.append(None)  # players without a position count as "UNK"
+    ros = table.column_from(ros_scores or {})
+    mask = (ros > 120) & table.label_mask("position", thin_positions) & ~table.member_mask(rostered_ids)
 
     stash_candidates = []
-    for pid in unrostered:
-        p = players.get(pid, {})
-        pos = p.get("position", "UNK")
-        team = p.get("team", "FA")
-        ros_val = ros_scores.get(pid, 0.0) if ros_scores else 0.0
-        if depth_map.get(pos, 0) < 2 and ros_val > 120:
-            stash_candidates.append((ros_val, normalize_name(p), pos, team))
+    for i in np.flatnonzero(mask):
+        p = table.row(i)
+        stash_candidates.append((float(ros[i]), normalize_name(p), p.get("position", "UNK"), p.get("team", "FA")))
 
     stash_candidates.sort(reverse=True)
     return [f"Stash {name} ({pos}, {team}) — ROS: {ros:.1f}" for ros, name, pos, team in stash_candidates[:limit]]
\ No newline at end of file
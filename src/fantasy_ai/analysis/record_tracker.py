@@ -2,29 +2,118 @@
 fantasy_ai.analysis.record_tracker
 
 Tracks team records, streaks, and playoff qualification scenarios.
+
+build_standings() folds any number of weeks of raw matchups (e.g.
+LeagueContext.standings_for(), which fetches weeks 1..N concurrently
+and keeps completed weeks cached permanently) into cumulative W/L/T,
+points for / against and streaks for every team.
 """
 
-def calculate_team_record(roster_id, matchups):
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from fantasy_ai.analysis.league_index import LeagueIndex
+
+
+def _week_results(matchups, index=None) -> Iterator[Tuple[Any, float, float]]:
     """
-    Returns a dict: {"wins": X, "losses": Y}
+    Yield (roster_id, points, opponent points) for every team with a played
+    head-to-head game this week. Pairings where neither side has scored yet
+    are not played and are skipped.
     """
-    wins = 0
-    losses = 0
-
-    for m in matchups:
-        if m.get("roster_id") != roster_id:
+    index = index or LeagueIndex([], matchups)
+    for a, b in index.head_to_head():
+        pts_a = float(a.get("points") or 0.0)
+        pts_b = float(b.get("points") or 0.0)
+        if pts_a == 0.0 and pts_b == 0.0:
             continue
+        yield a.get("roster_id"), pts_a, pts_b
+        yield b.get("roster_id"), pts_b, pts_a
+
+
+def _result(points: float, opp_points: float) -> str:
+    return "W" if points > opp_points else "L" if points < opp_points else "T"
+
+
+def calculate_team_record(roster_id, matchups, index=None):
+    """
+    Returns a dict: {"wins": X, "losses": Y, "ties": Z} for one week of matchups.
+
+    index: optional LeagueIndex already built over these matchups
+    For a season record use build_standings() / LeagueContext.standings_for().
+    """
+    record = {"wins": 0, "losses": 0, "ties": 0}
+    key = {"W": "wins", "L": "losses", "T": "ties"}
+    for rid, pts, opp_pts in _week_results(matchups, index):
+        if rid == roster_id:
+            record[key[_result(pts, opp_pts)]] += 1
+    return record
+
+
+def build_standings(weekly_matchups: Mapping[int, List[Dict[str, Any]]],
+                    rosters: Optional[List[Dict[str, Any]]] = None) -> Dict[Any, Dict[str, Any]]:
+    """
+    Cumulative standings from several weeks of matchups.
+
+    weekly_matchups: {week: raw matchups} (fetch_week_matchups / ctx.schedule_for)
+    rosters: optional; teams that have not played yet still get a 0-0 entry
+
+    Returns {roster_id: {"wins", "losses", "ties", "points_for",
+    "points_against", "results": ["W", "L", ...] in week order,
+    "streak": e.g. "W3" ("" before the first game)}}.
+    """
+    standings: Dict[Any, Dict[str, Any]] = {}
+
+    def entry(roster_id):
+        if roster_id not in standings:
+            standings[roster_id] = {"wins": 0, "losses": 0, "ties": 0,
+                                    "points_for": 0.0, "points_against": 0.0, "results": []}
+        return standings[roster_id]
+
+    for r in rosters or []:
+        entry(r.get("roster_id"))
+
+    key = {"W": "wins", "L": "losses", "T": "ties"}
+    for week in sorted(weekly_matchups):
+        for rid, pts, opp_pts in _week_results(weekly_matchups[week]):
+            rec = entry(rid)
+            result = _result(pts, opp_pts)
+            rec[key[result]] += 1
+            rec["points_for"] += pts
+            rec["points_against"] += opp_pts
+            rec["results"].append(result)
+
+    for rec in standings.values():
+        rec["points_for"] = round(rec["points_for"], 2)
+        rec["points_against"] = round(rec["points_against"], 2)
+        rec["streak"] = streak(rec["results"])
+    return standings
+
+
+def streak(results: List[str]) -> str:
+    """Current streak from a result list, e.g. ["W", "L", "L"] -> "L2"."""
+    if not results:
+        return ""
+    last = results[-1]
+    n = 0
+    for r in reversed(results):
+        if r != last:
+            break
+        n += 1
+    return f"{last}{n}"
+
 
-        matchup_id = m.get("matchup_id")
-        my_score = m.get("points", 0)
+def format_record(record: Mapping[str, Any]) -> str:
+    """"W-L", or "W-L-T" when the team has ties."""
+    text = f"{record.get('wins', 0)}-{record.get('losses', 0)}"
+    return text + f"-{record['ties']}" if record.get("ties") else text
 
-        # Find opponent in same matchup
-        opp = next((x for x in matchups if x.get("matchup_id") == matchup_id and x.get("roster_id") != roster_id), None)
-        opp_score = opp.get("points", 0) if opp else 0
 
-        if my_score > opp_score:
-            wins += 1
-        elif my_score < opp_score:
-            losses += 1
+def rank_standings(standings: Mapping[Any, Dict[str, Any]]) -> List[Tuple[Any, Dict[str, Any]]]:
+    """(roster_id, record) pairs ordered by win percentage, then points for."""
+    def sort_key(item):
+        rec = item[1]
+        games = rec["wins"] + rec["losses"] + rec["ties"]
+        pct = (rec["wins"] + 0.5 * rec["ties"]) / games if games else 0.0
+        return -pct, -rec["points_for"]
 
-    return {"wins": wins, "losses": losses}
\ No newline at end of file
+    return sorted(standings.items(), key=sort_key)
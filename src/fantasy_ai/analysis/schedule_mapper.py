@@ -2,28 +2,105 @@
 fantasy_ai.analysis.schedule_mapper
 
 Maps and analyzes team schedules for strength-of-schedule insights.
+
+The season's team schedule is loaded from FANTASY_AI_NFL_SCHEDULE, which
+may be:
+
+  - a JSON file: {team: {week: opponent}}, or a list of games with
+    week / home / away (the shape of Sleeper's schedule feed)
+  - a CSV file with week, home and away columns
+  - an http(s) URL serving either JSON shape (cached on disk for
+    FANTASY_AI_NFL_SCHEDULE_TTL seconds, default one day), e.g. a local
+    stand-in server
+
+Every shape is normalized to {team: {week: opponent}} with int weeks.
 """
 
-TEAM_SCHEDULE = {
-    "CAR": {15: "CIN"},
-    "HOU": {15: "CIN"},
-    "JAX": {15: "CIN"},
-    "ARI": {15: "CIN"},
-    "CIN": {15: "CAR"},
-    # Add more teams as needed
-}
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+from fantasy_ai.utils.fetch import fetch_cached
+from fantasy_ai.utils.players import as_player_table
+
+SCHEDULE_SOURCE = os.getenv("FANTASY_AI_NFL_SCHEDULE")
+SCHEDULE_TTL = int(os.getenv("FANTASY_AI_NFL_SCHEDULE_TTL", "86400"))
+
+TeamSchedule = Dict[str, Dict[int, str]]
+
+
+def normalize_schedule(data: Any) -> TeamSchedule:
+    """Turn any supported schedule shape into {team: {week: opponent}}."""
+    schedule: TeamSchedule = {}
+    if isinstance(data, Mapping):
+        for team, weeks in data.items():
+            for week, opp in (weeks or {}).items():
+                if opp:
+                    schedule.setdefault(team, {})[int(week)] = opp
+        return schedule
+
+    for game in data or []:
+        week, home, away = game.get("week"), game.get("home"), game.get("away")
+        if week in (None, "") or not home or not away:
+            continue
+        schedule.setdefault(home, {})[int(week)] = away
+        schedule.setdefault(away, {})[int(week)] = home
+    return schedule
+
+
+def load_team_schedule(source: Optional[str] = None) -> TeamSchedule:
+    """
+    Load and normalize the season schedule from a file or URL
+    (default FANTASY_AI_NFL_SCHEDULE). Returns {} when no source is set.
+    """
+    source = source or SCHEDULE_SOURCE
+    if not source:
+        return {}
+    if source.startswith("http://") or source.startswith("https://"):
+        return fetch_cached(source, f"nfl_schedule_{source}", SCHEDULE_TTL, transform=normalize_schedule)
+    with open(source, newline="", encoding="utf-8") as fh:
+        if source.lower().endswith(".csv"):
+            return normalize_schedule(list(csv.DictReader(fh)))
+        return normalize_schedule(json.load(fh))
+
 
-def build_player_schedule(players, team_schedule=TEAM_SCHEDULE, target_week=15):
+def opponent_rows(team_schedule: Mapping[str, Mapping[int, str]], teams: Iterable[str],
+                  weeks: int) -> np.ndarray:
     """
-    Returns a dict: player_id → opponent_team for target_week
+    Dense (len(teams) + 1, weeks + 1) int16 matrix of opponent indexes into
+    `teams` (-1 = bye / unknown). Column 0 is unused so weeks index directly;
+    the extra last row serves players without a team (code -1).
     """
-    player_schedule = {}
-    for pid, p in players.items():
-        team = p.get("team")
-        if not team or team not in team_schedule:
+    teams = list(teams)
+    lookup = {team: i for i, team in enumerate(teams)}
+    out = np.full((len(teams) + 1, weeks + 1), -1, dtype=np.int16)
+    for team, by_week in team_schedule.items():
+        row = lookup.get(team)
+        if row is None:
             continue
-        weekly_opponents = team_schedule.get(team, {})
-        opponent = weekly_opponents.get(target_week)
-        if opponent:
-            player_schedule[pid] = {target_week: opponent}
-    return player_schedule
\ No newline at end of file
+        for week, opp in by_week.items():
+            if 0 < week <= weeks and opp in lookup:
+                out[row, week] = lookup[opp]
+    return out
+
+
+def build_player_schedule(players, team_schedule=None, target_week=15):
+    """
+    Returns a dict: player_id → {target_week: opponent_team}
+
+    team_schedule defaults to load_team_schedule(). For lookups across
+    many weeks use matchup_context.MatchupMatrix instead.
+    """
+    if team_schedule is None:
+        team_schedule = load_team_schedule()
+    table = as_player_table(players)
+
+    # Opponent per team code, then one pass over the rows whose team plays
+    opp_by_code = [team_schedule.get(team, {}).get(target_week) for team in table.labels["team"]]
+    codes = table.codes["team"]
+    playing = np.array([c for c, opp in enumerate(opp_by_code) if opp], dtype=np.int16)
+    rows = np.flatnonzero(np.isin(codes, playing))
+    return {table.ids[i]: {target_week: opp_by_code[codes[i]]} for i in rows.tolist()}
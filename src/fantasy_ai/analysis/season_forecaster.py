@@ -3,11 +3,291 @@ fantasy_ai.analysis.season_forecaster
 
 Forecasts season outcomes, playoff odds, and win probabilities
 based on current standings and projections.
+
+Current records come from the cumulative standings over completed weeks
+(LeagueContext.standings_for), or the rosters' own records before any
+week has been scored.
+
+The whole league is simulated at once: every remaining regular-season
+game on the real schedule (Sleeper publishes future pairings), then
+seeding (division winners first when the league has divisions, then
+record, then points for) and the playoff bracket with byes and optional
+re-seeding. Trials run in batches of NumPy arrays; large runs spread the
+batches over a thread pool (NumPy's draws, sorts and arithmetic release
+the GIL). Threads rather than processes, since forecasts are called from
+worker threads where forking would be unsafe.
+
+Each team's weekly score is modelled as a normal distribution whose mean
+and spread come from its current starters' projections (see
+projected_outcome.lineup_distribution), falling back to its season
+scoring average when there are no projections.
+
+  FANTASY_AI_SEASON_TRIALS   simulated seasons (default 100000)
+  FANTASY_AI_SIM_WORKERS     threads for large runs (default: CPU count)
 """
 
-def forecast_season(my_roster, opp_roster, matchups, players):
-    # Placeholder logic
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fantasy_ai.analysis.league_index import LeagueIndex
+from fantasy_ai.analysis.projected_outcome import SIM_SEED, lineup_distribution
+
+SEASON_TRIALS = int(os.getenv("FANTASY_AI_SEASON_TRIALS", "100000"))
+SIM_WORKERS = int(os.getenv("FANTASY_AI_SIM_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# Seasons per vectorized batch (bounds memory: batch x games floats per draw)
+BATCH_SIZE = 10000
+# Below this many trials a single thread is as fast
+PARALLEL_MIN_TRIALS = 2 * BATCH_SIZE
+
+# Relative weekly spread used when a team has no player projections
+FALLBACK_CV = 0.2
+
+
+def playoff_settings(league: Dict[str, Any]) -> Dict[str, Any]:
+    """Playoff format from Sleeper league settings."""
+    s = league.get("settings") or {}
+    return {
+        "playoff_teams": int(s.get("playoff_teams") or 6),
+        "playoff_week_start": int(s.get("playoff_week_start") or 15),
+        "reseed": int(s.get("playoff_seed_type") or 0) == 1,
+        # 0: one week per round, 1: two-week championship, 2: two weeks every round
+        "playoff_round_type": int(s.get("playoff_round_type") or 0),
+    }
+
+
+def round_weeks(playoff_round_type: int, slots_left: int) -> int:
+    """Weeks a playoff round lasts; slots_left == 2 is the championship."""
+    if playoff_round_type == 2 or (playoff_round_type == 1 and slots_left == 2):
+        return 2
+    return 1
+
+
+def bracket_order(size: int) -> List[int]:
+    """Standard bracket positions of 0-based seeds, e.g. 8 -> [0, 7, 3, 4, 1, 6, 2, 5]."""
+    order = [0]
+    while len(order) < size:
+        n = len(order) * 2
+        order = [x for s in order for x in (s, n - 1 - s)]
+    return order
+
+
+def _simulate_batch(model: Dict[str, Any], trials: int, seed: Sequence[int]) -> Dict[str, np.ndarray]:
+    """Simulate `trials` seasons; returns per-team counts."""
+    rng = np.random.default_rng(list(seed))
+    mean, sd = model["mean"], model["sd"]
+    n_teams = mean.size
+    games = model["games"]  # (G, 2) team indexes
+
+    wins = np.tile(model["wins"], (trials, 1))
+    pf = np.tile(model["points_for"], (trials, 1))
+    if len(games):
+        # Both sides of every game in one float32 draw: columns [side a | side b]
+        sides = np.concatenate([games[:, 0], games[:, 1]])
+        scores = rng.standard_normal((trials, sides.size), dtype=np.float32)
+        scores *= sd[sides].astype(np.float32)
+        scores += mean[sides].astype(np.float32)
+        n_games = len(games)
+        a_won = (scores[:, :n_games] > scores[:, n_games:]).astype(np.float32)
+
+        # (G, T) one-hot maps scatter per-game results onto teams with a matmul
+        onehot = np.eye(n_teams, dtype=np.float32)[sides]
+        onehot_a, onehot_b = onehot[:n_games], onehot[n_games:]
+        wins += a_won @ (onehot_a - onehot_b) + onehot_b.sum(axis=0)  # b wins whatever a does not
+        pf += scores @ onehot
+
+    # Seeding key: record first, points for as the tiebreak (PF < 1e5 for any season)
+    key = wins * 1e5 + pf
+    for members in model["divisions"]:
+        best = members[np.argmax(key[:, members], axis=1)]
+        key[np.arange(trials), best] += 1e9  # division winners seed ahead of wildcards
+    order = np.argsort(-key, axis=1, kind="stable")
+
+    n_playoff = min(model["playoff_teams"], n_teams)
+    seeds = order[:, :n_playoff]
+    size = 1 << max(n_playoff - 1, 0).bit_length()
+    n_byes = size - n_playoff
+
+    # Bracket: team index per slot (-1 = bye) and the seed number used for re-seeding
+    positions = np.array(bracket_order(size))
+    slot_seed = np.broadcast_to(positions, (trials, size)).copy()
+    slots = np.full((trials, size), -1)
+    real = positions < n_playoff
+    slots[:, real] = seeds[:, positions[real]]
+
+    reseed, round_type = model["reseed"], model["playoff_round_type"]
+    first_round = True
+    while slots.shape[1] > 1:
+        k = slots.shape[1]
+        if reseed and not first_round:
+            idx = np.argsort(slot_seed, axis=1)
+            slots = np.take_along_axis(slots, idx, axis=1)
+            slot_seed = np.take_along_axis(slot_seed, idx, axis=1)
+            ta, tb = slots[:, :k // 2], slots[:, ::-1][:, :k // 2]
+            sa, sb = slot_seed[:, :k // 2], slot_seed[:, ::-1][:, :k // 2]
+        else:
+            ta, tb = slots[:, 0::2], slots[:, 1::2]
+            sa, sb = slot_seed[:, 0::2], slot_seed[:, 1::2]
+        weeks = round_weeks(round_type, k)
+        pa = rng.normal(mean[ta] * weeks, sd[ta] * np.sqrt(weeks))
+        pb = rng.normal(mean[tb] * weeks, sd[tb] * np.sqrt(weeks))
+        a_adv = (tb < 0) | ((ta >= 0) & (pa > pb))
+        slots = np.where(a_adv, ta, tb)
+        slot_seed = np.where(a_adv, sa, sb)
+        first_round = False
+
+    return {
+        "wins": wins.sum(axis=0),
+        "playoffs": np.bincount(seeds.ravel(), minlength=n_teams),
+        "byes": np.bincount(seeds[:, :n_byes].ravel(), minlength=n_teams),
+        "titles": np.bincount(slots[:, 0], minlength=n_teams),
+        "trials": np.array(trials),
+    }
+
+
+def simulate_season(teams: Dict[Any, Dict[str, Any]], schedule: List[Tuple[Any, Any]],
+                    settings: Dict[str, Any], trials: Optional[int] = None, seed: Optional[int] = None,
+                    workers: Optional[int] = None) -> Dict[Any, Dict[str, Any]]:
+    """
+    Simulate the rest of the season for every team.
+
+    teams: roster_id -> {"wins", "losses", "ties", "points_for", "mean", "sd", "division"}
+    schedule: remaining regular-season games as (roster_id, roster_id) pairs
+    settings: playoff_settings(league)
+    trials / seed: default FANTASY_AI_SEASON_TRIALS / FANTASY_AI_SIM_SEED
+    workers: threads (default FANTASY_AI_SIM_WORKERS; 1 = calling thread only)
+
+    Batches are seeded by their position, so results do not depend on the
+    number of workers.
+
+    Returns roster_id -> {"playoff_odds", "bye_odds", "title_odds" (percent),
+    "avg_wins", "projected_record"}.
+    """
+    trials = trials or SEASON_TRIALS
+    seed = SIM_SEED if seed is None else seed
+    workers = workers or SIM_WORKERS
+
+    ids = list(teams)
+    pos = {rid: i for i, rid in enumerate(ids)}
+    games = np.array([(pos[a], pos[b]) for a, b in schedule if a in pos and b in pos], dtype=np.int64).reshape(-1, 2)
+    by_division: Dict[Any, List[int]] = {}
+    for rid, t in teams.items():
+        if t.get("division"):
+            by_division.setdefault(t["division"], []).append(pos[rid])
+    model = {
+        "mean": np.array([float(teams[r]["mean"]) for r in ids]),
+        "sd": np.array([float(teams[r]["sd"]) for r in ids]),
+        "wins": np.array([teams[r].get("wins", 0) + 0.5 * teams[r].get("ties", 0) for r in ids], dtype=np.float64),
+        "points_for": np.array([float(teams[r].get("points_for", 0.0)) for r in ids]),
+        "games": games,
+        "divisions": [np.array(m) for m in by_division.values()] if len(by_division) > 1 else [],
+        "playoff_teams": settings["playoff_teams"],
+        "reseed": settings["reseed"],
+        "playoff_round_type": settings["playoff_round_type"],
+    }
+
+    batches = [(min(BATCH_SIZE, trials - start), (seed, i)) for i, start in enumerate(range(0, trials, BATCH_SIZE))]
+    if workers > 1 and len(batches) > 1 and trials >= PARALLEL_MIN_TRIALS:
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches)), thread_name_prefix="season-sim") as pool:
+            parts = list(pool.map(lambda batch: _simulate_batch(model, *batch), batches))
+    else:
+        parts = [_simulate_batch(model, *batch) for batch in batches]
+    total = {k: sum(p[k] for p in parts) for k in parts[0]}
+
+    games_left = np.bincount(games.ravel(), minlength=len(ids)) if len(games) else np.zeros(len(ids))
+    results = {}
+    for i, rid in enumerate(ids):
+        t = teams[rid]
+        avg_wins = float(total["wins"][i]) / trials
+        played = t.get("wins", 0) + t.get("losses", 0) + t.get("ties", 0)
+        avg_losses = played + games_left[i] - avg_wins - 0.5 * t.get("ties", 0)
+        record = f"{round(avg_wins)}-{round(avg_losses)}" + (f"-{t['ties']}" if t.get("ties") else "")
+        results[rid] = {
+            "playoff_odds": round(100.0 * float(total["playoffs"][i]) / trials, 1),
+            "bye_odds": round(100.0 * float(total["byes"][i]) / trials, 1),
+            "title_odds": round(100.0 * float(total["titles"][i]) / trials, 1),
+            "avg_wins": round(avg_wins, 2),
+            "projected_record": record,
+        }
+    return results
+
+
+def build_season_model(league: Dict[str, Any], rosters: List[Dict[str, Any]],
+                       schedule_matchups: Dict[int, List[Dict[str, Any]]], player_proj_map: Dict[str, float],
+                       players=None, standings: Optional[Dict[Any, Dict[str, Any]]] = None):
+    """
+    Team models and remaining games from Sleeper data.
+
+    Current records / points for come from standings
+    (record_tracker.build_standings) when any game has been played, else
+    from each roster's settings; schedule_matchups maps each remaining
+    week to its raw matchups.
+    Returns (teams, schedule, settings) for simulate_season().
+    """
+    played_any = any(rec.get("results") for rec in (standings or {}).values())
+    teams = {}
+    for r in rosters:
+        s = r.get("settings") or {}
+        if played_any:
+            rec = standings.get(r["roster_id"]) or {}
+            wins, losses, ties = rec.get("wins", 0), rec.get("losses", 0), rec.get("ties", 0)
+            points_for = float(rec.get("points_for") or 0.0)
+        else:
+            wins, losses, ties = int(s.get("wins") or 0), int(s.get("losses") or 0), int(s.get("ties") or 0)
+            points_for = float(s.get("fpts") or 0) + float(s.get("fpts_decimal") or 0) / 100
+        mean, sd = lineup_distribution(r.get("starters") or [], player_proj_map, players)
+        if mean <= 0:
+            played = wins + losses + ties
+            mean = points_for / played if played else 0.0
+            sd = max(mean * FALLBACK_CV, 1.0)
+        teams[r["roster_id"]] = {
+            "wins": wins, "losses": losses, "ties": ties, "points_for": points_for,
+            "mean": mean, "sd": sd, "division": s.get("division"),
+        }
+
+    # Teams with nothing to go on play at the league average
+    known = [t["mean"] for t in teams.values() if t["mean"] > 0]
+    average = float(np.mean(known)) if known else 100.0
+    for t in teams.values():
+        if t["mean"] <= 0:
+            t["mean"], t["sd"] = average, average * FALLBACK_CV
+
+    schedule = [
+        (a["roster_id"], b["roster_id"])
+        for week in sorted(schedule_matchups)
+        for a, b in LeagueIndex([], schedule_matchups[week]).head_to_head()
+    ]
+    return teams, schedule, playoff_settings(league)
+
+
+def forecast_league(ctx, week: Optional[int] = None, trials: Optional[int] = None,
+                    workers: Optional[int] = None) -> Dict[Any, Dict[str, Any]]:
+    """
+    Playoff, bye and title odds for every roster, simulating from `week`
+    (default: the current week) through the end of the regular season.
+    """
+    week = week or ctx.week
+    settings = playoff_settings(ctx.league)
+    remaining = list(range(week, settings["playoff_week_start"]))
+    standings = ctx.standings_for(week - 1) if week > 1 else None
+    teams, schedule, settings = build_season_model(
+        ctx.league, ctx.rosters, ctx.schedule_for(remaining), ctx.player_proj_map_for(week), ctx.players,
+        standings=standings,
+    )
+    return simulate_season(teams, schedule, settings, trials=trials, workers=workers)
+
+
+def forecast_season(ctx, roster_id, week: Optional[int] = None, trials: Optional[int] = None):
+    """Season forecast for one roster: projected record and playoff / bye / title odds."""
+    forecast = forecast_league(ctx, week=week, trials=trials).get(roster_id)
+    if not forecast:
+        return {"projected_record": "N/A", "playoff_odds": "N/A", "bye_odds": "N/A", "title_odds": "N/A"}
     return {
-        "projected_record": "8-6",
-        "playoff_odds": "62%"
-    }
\ No newline at end of file
+        "projected_record": forecast["projected_record"],
+        "playoff_odds": f"{forecast['playoff_odds']:.1f}%",
+        "bye_odds": f"{forecast['bye_odds']:.1f}%",
+        "title_odds": f"{forecast['title_odds']:.1f}%",
+    }
@@ -5,16 +5,7 @@ Core strategic analysis engine. Combines multiple analysis modules
 to produce a unified strategy digest.
 """
 
-from fantasy_ai.utils.config import LEAGUE_ID, SLEEPER_DISPLAY_NAME
-from fantasy_ai.utils.fetch import (
-    fetch_league_info,
-    fetch_users,
-    fetch_rosters,
-    fetch_players,
-    fetch_matchups,
-    fetch_transactions
-)
-from fantasy_ai.scoring.ros_score import generate_ros_scores
+from fantasy_ai.context import LeagueContext
 from fantasy_ai.analysis.waiver_gems import get_top_waiver_gems
 from fantasy_ai.analysis.lineup_optimizer import suggest_lineup_swaps
 from fantasy_ai.analysis.season_forecaster import forecast_season
@@ -26,26 +17,23 @@ from fantasy_ai.analysis.recommendations import (
 from fantasy_ai.analysis.projected_outcome import simulate_weekly_matchup
 from fantasy_ai.utils.helpers import normalize_name
 
-def generate_strategy_digest(week=None, ros_scores=None):
-    if not LEAGUE_ID:
+def generate_strategy_digest(week=None, ros_scores=None, ctx=None):
+    ctx = ctx or LeagueContext(week=week)
+    if not ctx.league_id:
         return "❌ LEAGUE_ID not set in environment"
 
-    league = fetch_league_info(LEAGUE_ID)
-    week = week or league.get("week") or 1
-    players = fetch_players()
-    users = {
-        u["user_id"]: u.get("display_name", f"User {u['user_id']}")
-        for u in fetch_users(LEAGUE_ID)
-    }
-    rosters = fetch_rosters(LEAGUE_ID)
-    matchups = fetch_matchups(LEAGUE_ID, week)
-    txns = fetch_transactions(LEAGUE_ID, week)
-    ros_scores = ros_scores or generate_ros_scores(players)
+    week = week or ctx.week
+    players = ctx.players
+    users = ctx.user_names
+    rosters = ctx.rosters
+    index = ctx.index_for(week)
+    txns = ctx.transactions_for(week)
+    ros_scores = ros_scores or ctx.ros_scores
 
     output_lines = [f"\n🧠 Strategy Digest — Week {week}"]
 
     # 🏆 Waiver Gems
-    rostered_ids = {pid for r in rosters for pid in r.get("players", [])}
+    rostered_ids = index.rostered_ids
     top_waivers = get_top_waiver_gems(players, ros_scores, rostered_ids)
     output_lines.append("\n🏆 Top Waiver Gems")
     for p in top_waivers:
@@ -57,27 +45,27 @@ def generate_strategy_digest(week=None, ros_scores=None):
 
     # 📝 Lineup Optimization
     output_lines.append("\n📝 Lineup Optimization")
-    lineup_tips = suggest_lineup_swaps(rosters, players, ros_scores, week)
+    lineup_tips = suggest_lineup_swaps(rosters, players, ros_scores, week,
+                                       roster_positions=ctx.league.get("roster_positions"))
     output_lines.extend(lineup_tips)
 
     # 🔮 Matchup Forecast
     output_lines.append("\n🔮 Matchup Forecast")
-    my_roster = next(
-        (r for r in rosters if users.get(r.get("owner_id")) == SLEEPER_DISPLAY_NAME),
-        None
-    )
-    opp_roster = next(
-        (r for r in rosters if r["roster_id"] != my_roster["roster_id"]),
-        None
+    my_roster = ctx.my_roster
+    # This week's actual opponent; fall back to any other roster on a bye
+    opp_roster = (
+        index.opponent_roster(my_roster["roster_id"])
+        or next((r for r in rosters if r["roster_id"] != my_roster["roster_id"]), None)
     ) if my_roster else None
 
     if my_roster and opp_roster:
         result = simulate_weekly_matchup(
             my_roster.get("starters", []),
             opp_roster.get("starters", []),
-            players
+            players=players,
+            player_proj_map=ctx.player_proj_map_for(week)
         )
-        season = forecast_season(my_roster, opp_roster, matchups, players)
+        season = forecast_season(ctx, my_roster["roster_id"], week)
         output_lines.append(f"  - Win Prob: {result['win_prob']}%")
         output_lines.append(f"  - Season Projection: {season['projected_record']}, {season['playoff_odds']} playoff odds")
 
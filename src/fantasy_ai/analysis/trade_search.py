@@ -0,0 +1,239 @@
+"""
+fantasy_ai.analysis.trade_search
+
+Searches concrete trades between one roster and every other roster in
+the league: 1-for-1, 2-for-1 (either direction) and 2-for-2. Each trade
+is scored by the change in both sides' optimal-lineup ROS value
+(lineup_optimizer), and only offers that improve both lineups are kept.
+
+Exact lineup solves are the expensive part, so every candidate is first
+checked against an upper bound on each side's gain: the exact lineup
+value left after giving players away, plus for each incoming player its
+ROS score minus the weakest starter in the slot group it can reach (a
+group with an open slot displaces nothing). Optimal lineup value is
+submodular in the roster, so those per-player bounds add up to a valid
+bound for the whole package and pruning never drops a qualifying offer.
+
+search_trades only reports the best few offers, so once it holds
+`limit` of them their weakest gain for me becomes a rising floor for the
+bounds as well. A trade is hidden when a smaller trade with the same
+partner (a subset of both sides) is at least as good for both teams;
+shapes are searched smallest first, so that is decided on arrival.
+"""
+
+import heapq
+from itertools import combinations
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from fantasy_ai.analysis.league_index import LeagueIndex
+from fantasy_ai.analysis.lineup_optimizer import best_lineup, player_positions, slot_accepts, starting_slots
+
+# (players I give, players I get)
+TRADE_SHAPES = ((1, 1), (2, 1), (1, 2), (2, 2))
+
+
+def slot_groups(slots: Sequence[str], eligibilities: Iterable[FrozenSet[str]]) -> List[int]:
+    """
+    Group id per slot: slots are in the same group when some player can
+    fill both (directly or through a chain, e.g. RB - FLEX - WR, or a
+    dual-position RB/WR linking the RB and WR slots).
+    """
+    parent = list(range(len(slots)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for positions in eligibilities:
+        accepting = [i for i, s in enumerate(slots) if slot_accepts(s, positions)]
+        for i in accepting[1:]:
+            parent[find(i)] = find(accepting[0])
+    return [find(i) for i in range(len(slots))]
+
+
+class _Side:
+    """One roster's pool plus memoized lineup solves for 'pool minus these players'."""
+
+    def __init__(self, roster: Mapping[str, Any], search: "TradeSearch"):
+        self.roster = roster
+        self.search = search
+        self.pool = [pid for pid in dict.fromkeys((roster.get("players") or []) + (roster.get("starters") or []))
+                     if pid and pid != "0"]
+        self.keep = frozenset(pid for pid in (roster.get("starters") or []) if pid)
+        self._solved: Dict[FrozenSet[str], Tuple[float, List[float]]] = {}
+        self.value = self.without(frozenset())[0]
+        # Pieces worth trading: anything with a ROS score
+        self.pieces = [pid for pid in self.pool if search.pts.get(pid, 0.0) > 0]
+
+    def without(self, gone: FrozenSet[str]) -> Tuple[float, List[float]]:
+        """(lineup value, per-slot values) of the pool minus `gone`."""
+        hit = self._solved.get(gone)
+        if hit is None:
+            hit = self.search.solve([pid for pid in self.pool if pid not in gone], self.keep)
+            self._solved[gone] = hit
+        return hit
+
+    def bound_terms(self, gone: FrozenSet[str], candidates: Sequence[str]) -> Tuple[float, Dict[str, float]]:
+        """
+        Gain bound pieces after giving `gone` away: the (exact, <= 0) value
+        change, plus per incoming candidate the most it could add. A trade's
+        bound is the first plus the sum of the second over its incoming players.
+        """
+        value, slot_values = self.without(gone)
+        pts, reach = self.search.pts, self.search.reach
+        terms = {}
+        for pid in candidates:
+            slots = reach[pid]
+            terms[pid] = max(0.0, pts[pid] - min(slot_values[i] for i in slots)) if slots else 0.0
+        return value - self.value, terms
+
+    def gain(self, gone: FrozenSet[str], incoming: Sequence[str]) -> float:
+        """Exact change in optimal lineup value."""
+        pool = [pid for pid in self.pool if pid not in gone] + list(incoming)
+        return self.search.solve(pool, self.keep)[0] - self.value
+
+
+class TradeSearch:
+    """
+    Trade search over one league snapshot.
+
+    rosters: roster dicts; players: player_id -> metadata (dict or PlayerTable)
+    ros_scores: player_id -> ROS score (the value being optimized)
+    roster_positions: league roster_positions (starting slots)
+    """
+
+    def __init__(self, rosters: List[Dict[str, Any]], players, ros_scores: Mapping[str, float],
+                 roster_positions: Optional[Sequence[str]]):
+        self.index = LeagueIndex(rosters)
+        self.slots = starting_slots(roster_positions)
+        pool = {pid for r in rosters for pid in (r.get("players") or []) + (r.get("starters") or []) if pid}
+        self.pts = {pid: float(ros_scores.get(pid, 0.0) or 0.0) for pid in pool}
+        self.eligible_at = {pid: player_positions(players.get(pid, {})) for pid in pool}
+
+        # Slot indexes each player could ever displace a starter from
+        groups = slot_groups(self.slots, set(self.eligible_at.values()))
+        self.reach: Dict[str, Tuple[int, ...]] = {}
+        for pid, positions in self.eligible_at.items():
+            touched = {groups[i] for i, s in enumerate(self.slots) if slot_accepts(s, positions)}
+            self.reach[pid] = tuple(i for i, g in enumerate(groups) if g in touched)
+
+        self.solves = 0
+        self._sides: Dict[Any, _Side] = {}
+
+    def solve(self, pool: List[str], keep=frozenset()) -> Tuple[float, List[float]]:
+        self.solves += 1
+        lineup = best_lineup(pool, self.slots, self.eligible_at, self.pts, keep)
+        slot_values = [p for _, _, p in lineup]
+        return sum(slot_values), slot_values
+
+    def side(self, roster_id: Any) -> _Side:
+        if roster_id not in self._sides:
+            self._sides[roster_id] = _Side(self.index.roster(roster_id) or {}, self)
+        return self._sides[roster_id]
+
+    def offers(self, my_roster_id: Any, partner_id: Any, min_gain: float = 1.0,
+               board: Optional["_Board"] = None) -> List[Dict[str, Any]]:
+        """
+        Mutually beneficial, non-dominated trades with one partner (unsorted).
+
+        board: when given, offers are also posted there and candidates whose
+        bound cannot beat its floor are skipped.
+        """
+        floor = (lambda: max(min_gain, board.floor)) if board is not None else (lambda: min_gain)
+        me, them = self.side(my_roster_id), self.side(partner_id)
+        sizes = {n for shape in TRADE_SHAPES for n in shape}
+        my_sets = {n: [frozenset(c) for c in combinations(me.pieces, n)] for n in sizes}
+        their_sets = {n: [frozenset(c) for c in combinations(them.pieces, n)] for n in sizes}
+        my_bounds = {give: me.bound_terms(give, them.pieces) for n in sizes for give in my_sets[n]}
+        their_bounds = {get: them.bound_terms(get, me.pieces) for n in sizes for get in their_sets[n]}
+
+        found = []
+        for n_give, n_get in TRADE_SHAPES:
+            for give in my_sets[n_give]:
+                my_base, my_terms = my_bounds[give]
+                if my_base + sum(sorted(my_terms.values(), reverse=True)[:n_get]) < floor():
+                    continue  # no package of n_get players can make this worth it for me
+                for get in their_sets[n_get]:
+                    if my_base + sum(my_terms[q] for q in get) < floor():
+                        continue
+                    their_base, their_terms = their_bounds[get]
+                    if their_base + sum(their_terms[g] for g in give) < min_gain:
+                        continue
+                    my_gain = me.gain(give, tuple(get))
+                    if my_gain < floor():
+                        continue
+                    their_gain = them.gain(get, tuple(give))
+                    if their_gain < min_gain:
+                        continue
+                    trade = {"partner": partner_id, "give": give, "get": get,
+                             "my_gain": my_gain, "their_gain": their_gain}
+                    if _dominated(trade, found):
+                        continue
+                    found.append(trade)
+                    if board is not None:
+                        board.post(trade)
+        return found
+
+
+def _dominated(trade: Dict[str, Any], others: List[Dict[str, Any]]) -> bool:
+    """True when a smaller trade (subset of both sides) does at least as well for both teams."""
+    give, get = trade["give"], trade["get"]
+    for o in others:
+        if (len(o["give"]) + len(o["get"]) < len(give) + len(get)
+                and o["give"] <= give and o["get"] <= get
+                and o["my_gain"] >= trade["my_gain"] and o["their_gain"] >= trade["their_gain"]):
+            return True
+    return False
+
+
+class _Board:
+    """The best `limit` offers by my gain seen so far; floor is the weakest of them once full."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.gains: List[float] = []
+        self.offers: List[Dict[str, Any]] = []
+
+    @property
+    def floor(self) -> float:
+        return self.gains[0] if len(self.gains) >= self.limit else float("-inf")
+
+    def post(self, trade: Dict[str, Any]) -> None:
+        self.offers.append(trade)
+        if len(self.gains) < self.limit:
+            heapq.heappush(self.gains, trade["my_gain"])
+        elif trade["my_gain"] > self.gains[0]:
+            heapq.heapreplace(self.gains, trade["my_gain"])
+
+
+def search_trades(rosters: List[Dict[str, Any]], players, ros_scores: Mapping[str, float],
+                  roster_positions: Optional[Sequence[str]], my_roster_id: Any,
+                  min_gain: float = 1.0, limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    Ranked mutually beneficial offers between my roster and every other roster.
+
+    Returns up to `limit` dicts {"partner": roster_id, "give": [player_id],
+    "get": [player_id], "my_gain", "their_gain"}, best for me first (ties:
+    better for the partner first). Trades that only add a passenger to a
+    smaller trade that is at least as good for both sides are dropped.
+    """
+    search = TradeSearch(rosters, players, ros_scores, roster_positions)
+    if not search.slots or search.index.roster(my_roster_id) is None:
+        return []
+
+    board = _Board(max(1, limit))
+    for r in rosters:
+        if r.get("roster_id") != my_roster_id:
+            search.offers(my_roster_id, r.get("roster_id"), min_gain, board)
+
+    found = sorted(board.offers, key=lambda t: (-t["my_gain"], -t["their_gain"], len(t["give"]) + len(t["get"])))
+    def by_value(pid):
+        return -search.pts[pid]
+
+    return [
+        dict(t, give=sorted(t["give"], key=by_value), get=sorted(t["get"], key=by_value),
+             my_gain=round(t["my_gain"], 1), their_gain=round(t["their_gain"], 1))
+        for t in found[:limit]
+    ]
@@ -3,53 +3,110 @@ fantasy_ai.analysis.waiver_gems
 
 Identifies high-value waiver wire pickups based on projections,
 ROS scores, and positional scarcity.
+
+WaiverIndex partitions the scored player pool by position once, with
+each partition pre-sorted by its ranking score. A query then only
+skips rostered rows (a boolean bitmap over the table), takes the
+first `limit` of each wanted position and heap-merges them, so only the
+winners are ever turned into player dicts. One index (and one rostered
+bitmap) serves every manager's query in a run.
 """
 
-def get_top_waiver_gems(players, ros_scores, rostered_ids, player_proj_map=None, my_roster=None, limit=5):
+import heapq
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from fantasy_ai.utils.players import PlayerTable, as_player_table
+
+
+class WaiverIndex:
+    """
+    Scored waiver candidates partitioned by position.
+
+    players: PlayerTable (or dict of player_id -> metadata)
+    ros_scores: player_id -> ROS score
+    player_proj_map: optional player_id -> this week's projection; ranks
+                     players that have no ROS score
+    """
+
+    def __init__(self, players, ros_scores: Mapping[str, float],
+                 player_proj_map: Optional[Mapping[str, float]] = None):
+        self.table = as_player_table(players)
+        table = self.table
+        self.ros = table.column_from(ros_scores or {})
+        self.proj = table.column_from(player_proj_map) if player_proj_map else np.zeros(len(table))
+
+        # Rank by ROS score if available, otherwise by current-week projection
+        self.score = np.where(self.ros > 0, self.ros, self.proj)
+        rows = np.flatnonzero(self.score > 0)
+        rows = rows[np.argsort(-self.score[rows], kind="stable")]  # ties keep table order
+
+        # position code (-1 = no position) -> candidate rows, best first
+        codes = table.codes["position"][rows]
+        self.partitions: Dict[int, np.ndarray] = {
+            int(c): rows[codes == c] for c in np.unique(codes)
+        }
+
+    def rostered_mask(self, rostered_ids: Iterable[Any]) -> np.ndarray:
+        """Boolean bitmap over table rows; build once per league and reuse across queries."""
+        return self.table.member_mask(rostered_ids)
+
+    def top(self, positions: Iterable[Optional[str]], rostered: Union[np.ndarray, Iterable[Any]],
+            limit: int = 5) -> List[int]:
+        """
+        Rows of the best `limit` unrostered candidates at the given
+        positions (None = players without a position), best first.
+        """
+        if not isinstance(rostered, np.ndarray):
+            rostered = self.rostered_mask(rostered)
+        lookup = {label: c for c, label in enumerate(self.table.labels["position"])}
+        codes = {-1 if pos is None else lookup[pos] for pos in positions if pos is None or pos in lookup}
+
+        streams = []
+        for code in codes:
+            part = self.partitions.get(code)
+            if part is None:
+                continue
+            free = part[~rostered[part]][:limit]
+            streams.append(((-self.score[i], i) for i in free.tolist()))
+        return [i for _, i in heapq.merge(*streams)][:limit]
+
+    def candidate(self, i: int) -> Dict[str, Any]:
+        """Player dict for one winning row, with its ros_score / week_proj attached."""
+        p = self.table.row(i)
+        p["ros_score"] = float(self.ros[i]) if self.ros[i] > 0 else None
+        p["week_proj"] = float(self.proj[i]) if self.proj[i] > 0 else None
+        return p
+
+
+def get_top_waiver_gems(players, ros_scores, rostered_ids, player_proj_map=None, my_roster=None, limit=5,
+                        index=None):
     """
     Returns top waiver gems for your team, filtered by positional need and ranked by ROS or W{week} projection.
 
     - Filters out players already on your roster.
     - Prioritizes positions where your depth < 2.
     - Ranks by ROS score if available, otherwise by current-week projection.
+
+    rostered_ids: set of rostered player ids, or a WaiverIndex.rostered_mask() bitmap
+    index: optional WaiverIndex built over the same players / scores, reused across calls
     """
     if not my_roster:
         return []
 
+    index = index or WaiverIndex(players, ros_scores, player_proj_map)
+    table: PlayerTable = index.table
+
     # Build positional depth map for your roster
     my_depth_map = {}
     for pid in my_roster.get("players", []):
-        p = players.get(pid, {})
+        p = table.get(pid, {})
         pos = p.get("position", "UNK")
         my_depth_map[pos] = my_depth_map.get(pos, 0) + 1
 
-    # Filter unrostered players
-    unrostered = [pid for pid in players if pid not in rostered_ids]
-
-    # Prioritize positions where depth < 2
-    def sort_key(pid):
-        ros_val = ros_scores.get(pid, 0.0)
-        proj_val = player_proj_map.get(str(pid), 0.0) if player_proj_map else 0.0
-        return ros_val if ros_val > 0 else proj_val
-
-    candidates = []
-    for pid in unrostered:
-        p = players.get(pid, {})
-        pos = p.get("position", "UNK")
-        if my_depth_map.get(pos, 0) >= 2:
-            continue  # Skip positions where you're already covered
-
-        ros_val = ros_scores.get(pid, 0.0)
-        proj_val = player_proj_map.get(str(pid), 0.0) if player_proj_map else 0.0
-
-        if ros_val > 0 or proj_val > 0:
-            p_copy = p.copy()
-            p_copy["ros_score"] = ros_val if ros_val > 0 else None
-            p_copy["week_proj"] = proj_val if proj_val > 0 else None
-            candidates.append(p_copy)
-
-    # Sort and limit
-    candidates.sort(key=lambda p: sort_key(p.get("player_id")), reverse=True)
-    return candidates[:limit]
+    thin_positions = [pos for pos in table.labels["position"] if my_depth_map.get(pos, 0) < 2]
+    if my_depth_map.get("UNK", 0) < 2:
+        thin_positions.append(None)
 
- 
\ No newline at end of file
+    return [index.candidate(i) for i in index.top(thin_positions, rostered_ids, limit)]
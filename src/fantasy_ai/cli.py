@@ -4,11 +4,22 @@ fantasy_ai.cli
 Command-line interface entry point for the Fantasy AI toolkit.
 Parses CLI arguments, orchestrates report generation, and triggers
 analysis modules. Intended for local execution or automation workflows.
+
+Batch mode (--leagues / --leagues-file) runs one command for many
+leagues in one process: league-independent data (players, ROS scores,
+projections feed, NFL schedule) is loaded once and shared, and the
+leagues run on FANTASY_AI_LEAGUE_WORKERS threads (default 4). Outputs
+are printed in the order the leagues were given.
+
+`serve` keeps the league contexts warm in one long-running process,
+refreshing data on per-source cadences and running the digest /
+strategy jobs on cron schedules (see fantasy_ai.daemon).
 """
 
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # 🔧 Load environment variables from .env
@@ -19,64 +30,216 @@ os.environ["PYTHONPATH"] = os.getenv("PYTHONPATH", "src")
 
 # 📦 Core config and delivery
 from fantasy_ai.utils.config import LEAGUE_ID
-from fantasy_ai.utils.delivery import send_email, send_discord
-from fantasy_ai.cli_helpers import fetch_current_week
+from fantasy_ai.utils.delivery import close_smtp, deliver
+from fantasy_ai.context import LeagueContext, SharedData
+from fantasy_ai.utils import timing
+from fantasy_ai.daemon import Daemon, parse_jobs
 
 # 📈 Reports Modules
 from fantasy_ai.reports.weekly import weekly_report
 from fantasy_ai.reports.waivers import waivers
-from fantasy_ai.reports.trade_radar import trade_radar
+from fantasy_ai.reports.trade_radar import trade_radar_report
 from fantasy_ai.reports.digest import digest
 from fantasy_ai.reports.strategy_engine import generate_weekly_strategy 
 
-def run_digest(week: int):
+COMMANDS = ["weekly-report", "waivers", "trade-radar", "digest", "strategy"]
+
+# Leagues processed at once in batch mode (each still fetches with up to FANTASY_AI_FETCH_WORKERS threads)
+LEAGUE_WORKERS = int(os.getenv("FANTASY_AI_LEAGUE_WORKERS", "4"))
+
+def run_digest(week: int, ctx=None, echo=True, label=None):
     """Generate full digest and send via email/Discord."""
-    output = digest(week_override=week)
-    print(output)
+    with timing.stage("Digest"):
+        output = digest(week_override=week, ctx=ctx)
+    if echo:
+        print(output)
 
     subject = f"Weekly Digest — Week {week}"
-    send_email(subject, output)
-    send_discord(output)
+    if label:
+        subject = f"{label} — {subject}"
+    with timing.stage("Delivery"):
+        deliver(subject, output)
+    return output
 
-def run_strategy(week: int):
+def run_strategy(week: int, ctx=None, echo=True, label=None):
     """Generate strategy digest and send via email/Discord."""
-    output = generate_weekly_strategy(week)
-    print(output)
+    with timing.stage("Strategy"):
+        output = generate_weekly_strategy(week, ctx=ctx)
+    if echo:
+        print(output)
 
     subject = f"Strategy Digest — Week {week}"
-    send_email(subject, output)
-    send_discord(output)
+    if label:
+        subject = f"{label} — {subject}"
+    with timing.stage("Delivery"):
+        deliver(subject, output)
+    return output
+
+def run_command(command: str, ctx, echo=True, label=None):
+    """Run one CLI command against a context; returns the report text."""
+    week = ctx.week
+    match command:
+        case "weekly-report":
+            output = weekly_report(week, ctx=ctx)
+        case "waivers":
+            output = waivers(week, ctx=ctx)
+        case "trade-radar":
+            output = trade_radar_report(week, ctx=ctx)
+        case "digest":
+            return run_digest(week, ctx=ctx, echo=echo, label=label)
+        case "strategy":
+            return run_strategy(week, ctx=ctx, echo=echo, label=label)
+    if echo:
+        print(output)
+    return output
+
+def read_leagues_file(path):
+    """
+    [(league_id, display_name or None)] from a leagues file: one league
+    per line, optionally followed by the display name of "my" team in
+    that league; blank lines and # comments are ignored.
+    """
+    leagues = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split(None, 1)
+            leagues.append((parts[0], parts[1].strip() if len(parts) > 1 else None))
+    return leagues
+
+def run_batch(command: str, leagues, week=None, workers=None):
+    """
+    Run a command for many leagues in one process.
+
+    Shared data is loaded up front, then each league gets its own
+    LeagueContext (over the same SharedData) on a bounded thread pool.
+    A failing league is reported and does not stop the others.
+    Returns the number of failed leagues.
+    """
+    shared = SharedData()
+    with timing.stage("Shared data"):
+        shared.ros_scores  # loads the player table too
+
+    def run_one(league_id, display_name):
+        ctx = LeagueContext(league_id, week=week, display_name=display_name, shared=shared)
+        with timing.stage(f"League {league_id}"):
+            ctx.prefetch(week)
+            label = ctx.league.get("name") or f"League {league_id}"
+            return run_command(command, ctx, echo=False, label=label)
+
+    workers = max(1, min(workers or LEAGUE_WORKERS, len(leagues)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="league") as pool:
+        futures = [(league_id, pool.submit(run_one, league_id, name)) for league_id, name in leagues]
+
+    close_smtp()
+
+    failed = 0
+    for league_id, fut in futures:
+        print(f"\n===== League {league_id} =====")
+        try:
+            print(fut.result())
+        except Exception as e:
+            failed += 1
+            print(f"❌ League {league_id} failed: {e}")
+    return failed
+
+def serve(leagues, week=None, job_specs=None):
+    """Run the daemon over the given leagues until interrupted."""
+    try:
+        jobs = parse_jobs(job_specs)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    unknown = sorted({command for command, _ in jobs} - set(COMMANDS))
+    if unknown:
+        print(f"❌ Unknown job command(s): {', '.join(unknown)}")
+        sys.exit(1)
+
+    shared = SharedData()
+    contexts = [LeagueContext(league_id, week=week, display_name=name, shared=shared) for league_id, name in leagues]
+    labelled = len(contexts) > 1
+
+    def runner(command, ctx):
+        label = (ctx.league.get("name") or f"League {ctx.league_id}") if labelled else None
+        return run_command(command, ctx, label=label)
+
+    Daemon(contexts, jobs, runner, after_job=lambda command: close_smtp()).run()
 
 def main():
     parser = argparse.ArgumentParser(description="Fantasy AI CLI")
     parser.add_argument(
         "command",
-        choices=["weekly-report", "waivers", "trade-radar", "digest", "strategy"],
-        help="Command to run"
+        choices=COMMANDS + ["serve"],
+        help="Command to run (serve: long-running daemon with scheduled jobs)"
     )
     parser.add_argument(
         "--week",
         type=int,
         help="NFL week number (optional, auto-detect if omitted)"
     )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-stage timings and HTTP counters; append a JSON summary to logs/timings.jsonl"
+    )
+    parser.add_argument(
+        "--leagues",
+        help="Comma-separated league ids: run the command for each (batch mode)"
+    )
+    parser.add_argument(
+        "--leagues-file",
+        help="File with one league id per line, optionally followed by my display name (batch mode)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help=f"Leagues processed concurrently in batch mode (default {LEAGUE_WORKERS})"
+    )
+    parser.add_argument(
+        "--job",
+        action="append",
+        metavar="COMMAND=CRON",
+        help='serve: scheduled job, e.g. --job "digest=0 9 * * 2" (repeatable; '
+             'default FANTASY_AI_DIGEST_CRON / FANTASY_AI_STRATEGY_CRON)'
+    )
     args = parser.parse_args()
-    week = args.week or fetch_current_week()
+
+    if args.timings:
+        timing.enable()
+
+    leagues = [(lid.strip(), None) for lid in (args.leagues or "").split(",") if lid.strip()]
+    if args.leagues_file:
+        leagues += read_leagues_file(args.leagues_file)
+    if (args.leagues or args.leagues_file) and not leagues:
+        print("❌ No league ids given")
+        sys.exit(1)
+
+    if args.command == "serve":
+        if not leagues and not LEAGUE_ID:
+            print("❌ LEAGUE_ID not set in environment")
+            sys.exit(1)
+        serve(leagues or [(LEAGUE_ID, None)], week=args.week, job_specs=args.job)
+        return
+
+    if leagues:
+        failed = run_batch(args.command, leagues, week=args.week, workers=args.workers)
+        timing.write_summary(command=args.command, league_id=[lid for lid, _ in leagues], week=args.week)
+        sys.exit(1 if failed else 0)
 
     if not LEAGUE_ID:
         print("❌ LEAGUE_ID not set in environment")
         sys.exit(1)
 
-    match args.command:
-        case "weekly-report":
-            weekly_report(week)
-        case "waivers":
-            waivers(week)
-        case "trade-radar":
-            trade_radar(week)
-        case "digest":
-            run_digest(week)
-        case "strategy":
-            run_strategy(week)
+    # One context per run: every endpoint is fetched at most once
+    ctx = LeagueContext(LEAGUE_ID, week=args.week)
+    week = ctx.week
+
+    run_command(args.command, ctx)
+    close_smtp()
+
+    timing.write_summary(command=args.command, league_id=LEAGUE_ID, week=week)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,393 @@
+"""
+fantasy_ai.context
+
+Run-scoped league context shared by every report in a single CLI run.
+Each dataset (league info, users, rosters, matchups, transactions,
+players, ROS scores) is fetched lazily on first access and at most once,
+so composite reports like the digest stop refetching the same endpoints.
+
+League-independent datasets (the player table, ROS scores, the NFL
+schedule and matchup matrices) live in a SharedData that several
+contexts can share, so a batch run over many leagues loads them once.
+The projections feed is shared process-wide by fetch_projection_stats
+already; each league only rescores it.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from fantasy_ai.utils.config import LEAGUE_ID, SLEEPER_DISPLAY_NAME
+from fantasy_ai.utils.fetch import (
+    fetch_concurrently,
+    fetch_league_info,
+    fetch_users,
+    fetch_rosters,
+    fetch_matchups,
+    fetch_projections,
+    fetch_week_matchups,
+    fetch_transactions,
+    fetch_player_table,
+    week_locked,
+)
+from fantasy_ai.utils import history
+from fantasy_ai.utils.players import PlayerTable
+from fantasy_ai.utils.transaction_store import TRANSACTION_STORE, TransactionStore
+from fantasy_ai.analysis.league_index import LeagueIndex
+from fantasy_ai.analysis.matchup_context import MatchupMatrix, compute_defense_rankings, load_weekly_stats
+from fantasy_ai.analysis.schedule_mapper import load_team_schedule
+from fantasy_ai.analysis.record_tracker import build_standings
+from fantasy_ai.analysis.waiver_gems import WaiverIndex
+from fantasy_ai.scoring.ros_score import generate_ros_scores
+
+
+class _Memo:
+    """Per-key, load-once storage shared by the context classes."""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, loading it once (thread-safe per key)."""
+        if key in self._data:
+            return self._data[key]
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._data:
+                self._data[key] = loader()
+        return self._data[key]
+
+    def _drop(self, keys) -> None:
+        """Forget memoized datasets: exact keys, or every key under a "name:" prefix."""
+        with self._locks_guard:
+            for key in list(self._data):
+                if any(key == k or (k.endswith(":") and key.startswith(k)) for k in keys):
+                    del self._data[key]
+
+
+class SharedData(_Memo):
+    """
+    League-independent datasets, loaded lazily and at most once.
+
+    One instance backs every LeagueContext of a batch run; a context
+    created without one gets its own.
+    """
+
+    # preload() names that belong here rather than to a league
+    DATASETS = ("players", "ros_scores")
+
+    @property
+    def players(self) -> PlayerTable:
+        return self._get("players", fetch_player_table)
+
+    @property
+    def ros_scores(self) -> Dict[str, float]:
+        return self._get("ros_scores", lambda: generate_ros_scores(self.players))
+
+    @property
+    def team_schedule(self):
+        """NFL schedule {team: {week: opponent}}; {} when no source is configured."""
+        return self._get("team_schedule", load_team_schedule)
+
+    def matchup_matrix_for(self, season: Any) -> Optional[MatchupMatrix]:
+        """MatchupMatrix for a season (see LeagueContext.matchup_matrix)."""
+        def load():
+            schedule = self.team_schedule
+            if not schedule:
+                return None
+            rankings = compute_defense_rankings(load_weekly_stats(season=season), schedule)
+            return MatchupMatrix(self.players, schedule, rankings)
+
+        return self._get(f"matchup_matrix:{season}", load)
+
+    def refresh(self) -> None:
+        """Forget everything; the next access reloads (players through the disk cache's TTL)."""
+        self._drop(["players", "ros_scores", "team_schedule", "matchup_matrix:"])
+
+
+class LeagueContext(_Memo):
+    """
+    Lazily loaded, memoized view of one league for one run.
+
+    league_id: Sleeper league id (defaults to LEAGUE_ID from the environment)
+    week: week the run is about (defaults to the league's reported week)
+    display_name: Sleeper display name of "my" team
+    shared: SharedData to draw league-independent datasets from (default: a private one)
+    """
+
+    def __init__(self, league_id: Optional[str] = None, week: Optional[int] = None,
+                 display_name: Optional[str] = None, shared: Optional[SharedData] = None):
+        super().__init__()
+        self.league_id = league_id or LEAGUE_ID
+        self._week = week
+        self.display_name = (display_name if display_name is not None else SLEEPER_DISPLAY_NAME or "").strip()
+        self.shared = shared if shared is not None else SharedData()
+        self._week_fixed = week is not None
+
+    def preload(self, week: Optional[int] = None, **datasets: Any) -> "LeagueContext":
+        """
+        Seed datasets that were obtained elsewhere (synthetic data, a shared
+        batch cache, a long-running process) so they are never fetched.
+
+        Accepts league, users, rosters, players, ros_scores, plus matchups,
+        transactions and projections for the given week (default: the
+        context's week) and schedule ({week: raw matchups}, see schedule_for()).
+        players and ros_scores are seeded into the SharedData.
+        """
+        week_keyed = {"matchups", "transactions", "projections"}
+        for name, value in datasets.items():
+            if name in SharedData.DATASETS:
+                self.shared._data[name] = value
+            elif name == "schedule":
+                for w, raw in value.items():
+                    self._data[f"raw_matchups:{w}"] = raw
+            elif name in week_keyed:
+                self._data[f"{name}:{week or self.week}"] = value
+            else:
+                self._data[name] = value
+        return self
+
+    def prefetch(self, week: Optional[int] = None, max_workers: Optional[int] = None) -> "LeagueContext":
+        """
+        Load every independent dataset a report needs in parallel.
+
+        League info, users, rosters, players and transactions do not depend
+        on each other, so a cold run costs roughly one round trip instead of
+        one per endpoint; matchups and projections follow as soon as the
+        league's scoring settings are in. Already-loaded datasets are
+        skipped. Returns self for chaining.
+        """
+        week = week or self._week
+        loaders = {
+            "league": lambda: self.league,
+            "users": lambda: self.users,
+            "rosters": lambda: self.rosters,
+            "players": lambda: self.players,
+        }
+        if week is not None:
+            loaders[f"matchups:{week}"] = lambda: self.matchups_for(week)
+            loaders[f"transactions:{week}"] = lambda: self.transactions_for(week)
+            loaders[f"projections:{week}"] = lambda: self.projections_for(week)
+        pending = {key: fn for key, fn in loaders.items()
+                   if key not in self._data and key not in self.shared._data}
+        if pending:
+            fetch_concurrently(pending, max_workers=max_workers)
+        return self
+
+    def refresh(self, *groups: str) -> "LeagueContext":
+        """
+        Forget datasets so their next access refetches them. Groups:
+
+          "league"       league info, users, rosters, matchups, transactions
+                         and the raw matchups of weeks not final yet (the
+                         current week follows the league when not fixed)
+          "projections"  projections and the matchups they are merged into
+          "players"      the shared player table and ROS scores
+
+        Views derived from them (indexes, masks, standings) go too.
+        Returns self for chaining.
+        """
+        keys = set()
+        if "players" in groups:
+            self.shared.refresh()
+            keys |= {"rostered_mask", "waiver_index:"}
+        if "projections" in groups:
+            keys |= {"projections:", "matchups:", "index:", "waiver_index:"}
+        if "league" in groups:
+            keys |= {"league", "users", "user_names", "rosters", "my_roster", "index", "rostered_mask",
+                     "matchups:", "transactions:", "season_transactions:", "standings:", "index:", "waiver_index:"}
+            if "league" in self._data:  # decided with the old league info; weeks final since then are refetched
+                keys |= {key for key in self._data
+                         if key.startswith("raw_matchups:") and not self.week_final(int(key.split(":", 1)[1]))}
+            if not self._week_fixed:
+                self._week = None
+        self._drop(keys)
+        return self
+
+    # --- League-level data -------------------------------------------------
+
+    @property
+    def league(self) -> Dict[str, Any]:
+        return self._get("league", lambda: fetch_league_info(self.league_id))
+
+    @property
+    def week(self) -> int:
+        if self._week is None:
+            self._week = self.league.get("week") or 1
+        return self._week
+
+    @property
+    def users(self) -> List[Dict[str, Any]]:
+        return self._get("users", lambda: fetch_users(self.league_id))
+
+    @property
+    def user_names(self) -> Dict[str, str]:
+        """user_id -> display_name"""
+        return self._get("user_names", lambda: {
+            u["user_id"]: u.get("display_name", f"User {u['user_id']}") for u in self.users
+        })
+
+    @property
+    def rosters(self) -> List[Dict[str, Any]]:
+        return self._get("rosters", lambda: fetch_rosters(self.league_id))
+
+    @property
+    def my_roster(self) -> Optional[Dict[str, Any]]:
+        return self._get("my_roster", lambda: next(
+            (r for r in self.rosters if self.user_names.get(r.get("owner_id")) == self.display_name),
+            None,
+        ))
+
+    @property
+    def index(self) -> LeagueIndex:
+        """Roster lookups (by roster id, owner id, player id) without matchups."""
+        return self._get("index", lambda: LeagueIndex(self.rosters))
+
+    @property
+    def rostered_mask(self):
+        """Boolean bitmap over player table rows: True where the player is on any roster."""
+        return self._get("rostered_mask", lambda: self.players.member_mask(self.index.rostered_ids))
+
+    @property
+    def players(self) -> PlayerTable:
+        """Columnar player pool; also usable as a read-only {player_id: record} mapping."""
+        return self.shared.players
+
+    @property
+    def matchup_matrix(self) -> Optional[MatchupMatrix]:
+        """
+        Player × week opponents and defense-vs-position ranks, or None when
+        no NFL schedule source is configured (FANTASY_AI_NFL_SCHEDULE).
+        """
+        return self.shared.matchup_matrix_for(self.league.get("season"))
+
+    @property
+    def ros_scores(self) -> Dict[str, float]:
+        return self.shared.ros_scores
+
+    # --- Week-level data ---------------------------------------------------
+
+    def matchups_for(self, week: int) -> List[Dict[str, Any]]:
+        """Matchups (with merged, league-scored projections) for a given week."""
+        return self._get(f"matchups:{week}", lambda: fetch_matchups(
+            self.league_id, week,
+            scoring_settings=self.league.get("scoring_settings"), season=self.league.get("season"),
+        ))
+
+    def projections_for(self, week: int) -> Dict[str, float]:
+        """
+        player_id -> projected points for every player in the week's
+        projections feed, scored with the league's scoring_settings.
+        """
+        return self._get(f"projections:{week}", lambda: fetch_projections(
+            week, season=self.league.get("season"), scoring_settings=self.league.get("scoring_settings"),
+        ))
+
+    def transactions_for(self, week: int) -> List[Dict[str, Any]]:
+        """Transactions for a given week (through the transaction store unless it is disabled)."""
+        def load():
+            if not TRANSACTION_STORE:
+                return fetch_transactions(self.league_id, week)
+            return TransactionStore(self.league_id).sync([week], self.week_final)[week]
+
+        return self._get(f"transactions:{week}", load)
+
+    def season_transactions(self, week: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        {week: transactions} for weeks 1..week (default: the context's week).
+        Closed weeks come from the transaction store, so only open weeks
+        cost a request.
+        """
+        week = week or self.week
+
+        def load():
+            weeks = list(range(1, week + 1))
+            if not TRANSACTION_STORE:
+                return {w: self.transactions_for(w) for w in weeks}
+            by_week = TransactionStore(self.league_id).sync(
+                [w for w in weeks if f"transactions:{w}" not in self._data], self.week_final)
+            for w, txns in by_week.items():
+                self._data.setdefault(f"transactions:{w}", txns)
+            return {w: self.transactions_for(w) for w in weeks}
+
+        return self._get(f"season_transactions:{week}", load)
+
+    def week_final(self, week: int) -> bool:
+        """
+        True once a week has been scored and can no longer change: up to the
+        league's last_scored_leg when Sleeper reports it, else any week
+        before the current NFL week.
+        """
+        last_scored = (self.league.get("settings") or {}).get("last_scored_leg")
+        if last_scored is not None:
+            return week <= int(last_scored)
+        return week_locked(self.league.get("season"), week)
+
+    def raw_matchups_for(self, week: int) -> List[Dict[str, Any]]:
+        """
+        A week's matchups without projections (cheap; used for schedules and
+        standings). Completed weeks come from the permanent disk cache.
+        """
+        return self._get(f"raw_matchups:{week}",
+                         lambda: fetch_week_matchups(self.league_id, week, final=self.week_final(week)))
+
+    def schedule_for(self, weeks: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        {week: raw matchups} for several weeks. Completed weeks are read from
+        the history store in one query; the rest are fetched in parallel.
+        """
+        final = [w for w in weeks if f"raw_matchups:{w}" not in self._data and self.week_final(w)]
+        for w, raw in history.final_matchups(self.league_id, final).items():
+            self._data.setdefault(f"raw_matchups:{w}", raw)
+        pending = {
+            f"raw_matchups:{w}": (lambda w=w: self.raw_matchups_for(w))
+            for w in weeks if f"raw_matchups:{w}" not in self._data
+        }
+        if pending:
+            fetch_concurrently(pending)
+        return {w: self.raw_matchups_for(w) for w in weeks}
+
+    def standings_for(self, week: Optional[int] = None, include_live: bool = False) -> Dict[Any, Dict[str, Any]]:
+        """
+        Cumulative standings (record_tracker.build_standings) over weeks
+        1..week (default: the context's week). Only completed weeks count
+        unless include_live, so a game in progress is not a result yet.
+        """
+        week = week or self.week
+
+        def load():
+            weeks = [w for w in range(1, week + 1) if include_live or self.week_final(w)]
+            return build_standings(self.schedule_for(weeks), self.rosters)
+
+        return self._get(f"standings:{week}:{int(include_live)}", load)
+
+    def index_for(self, week: int) -> LeagueIndex:
+        """Roster lookups plus matchup pairs / opponents for a given week."""
+        return self._get(f"index:{week}", lambda: LeagueIndex(self.rosters, self.matchups_for(week)))
+
+    def waiver_index_for(self, week: int) -> WaiverIndex:
+        """Position-partitioned waiver candidates ranked by ROS score / the week's projection."""
+        return self._get(f"waiver_index:{week}", lambda: WaiverIndex(
+            self.players, self.ros_scores, self.player_proj_map_for(week)
+        ))
+
+    def player_proj_map_for(self, week: int) -> Dict[str, float]:
+        """
+        player_id (str) -> league-scored projected points for a given week,
+        rostered players and free agents alike (see projections_for()).
+        """
+        return self.projections_for(week)
+
+    @property
+    def matchups(self) -> List[Dict[str, Any]]:
+        return self.matchups_for(self.week)
+
+    @property
+    def transactions(self) -> List[Dict[str, Any]]:
+        return self.transactions_for(self.week)
+
+    @property
+    def player_proj_map(self) -> Dict[str, float]:
+        return self.player_proj_map_for(self.week)
@@ -0,0 +1,212 @@
+"""
+fantasy_ai.daemon
+
+Long-running mode: keeps league contexts warm in memory, refreshes each
+data source on its own cadence and runs report jobs on cron schedules,
+so a scheduled digest is a few milliseconds of compute over data that
+is already loaded instead of a cold process doing all of its I/O.
+
+Refresh cadences (seconds):
+
+  FANTASY_AI_REFRESH_PLAYERS      player table + ROS scores (default FANTASY_AI_PLAYERS_TTL, one day)
+  FANTASY_AI_REFRESH_PROJECTIONS  projections feed (default FANTASY_AI_PROJECTIONS_TTL_LIVE, one hour)
+  FANTASY_AI_REFRESH_LEAGUE       league, rosters, matchups, transactions (default 300)
+
+Jobs are "command=cron" pairs with standard five-field cron expressions
+in local time (minute hour day-of-month month day-of-week; *, lists,
+ranges and /steps). Defaults come from FANTASY_AI_DIGEST_CRON (default
+"0 9 * * 2") and FANTASY_AI_STRATEGY_CRON (default "0 9 * * 4"); an
+empty value or "off" disables a job.
+"""
+
+import os
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from fantasy_ai.context import LeagueContext
+from fantasy_ai.utils import timing
+from fantasy_ai.utils.fetch import PLAYERS_CACHE_TTL, PROJECTIONS_TTL_LIVE
+
+REFRESH_INTERVALS = {
+    "players": int(os.getenv("FANTASY_AI_REFRESH_PLAYERS", str(PLAYERS_CACHE_TTL))),
+    "projections": int(os.getenv("FANTASY_AI_REFRESH_PROJECTIONS", str(PROJECTIONS_TTL_LIVE))),
+    "league": int(os.getenv("FANTASY_AI_REFRESH_LEAGUE", "300")),
+}
+
+DEFAULT_JOBS = {
+    "digest": os.getenv("FANTASY_AI_DIGEST_CRON", "0 9 * * 2"),
+    "strategy": os.getenv("FANTASY_AI_STRATEGY_CRON", "0 9 * * 4"),
+}
+
+# Wait before retrying a refresh that failed (network down, API errors)
+REFRESH_RETRY = 60
+
+
+class CronSchedule:
+    """
+    A five-field cron expression: minute hour day-of-month month day-of-week
+    (0-7, 0 and 7 = Sunday). When both day fields are restricted a day
+    matching either one fires, as in cron.
+    """
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expr: str):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        fields = [self._parse(part, lo, hi) for part, (lo, hi) in zip(parts, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {d % 7 for d in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse(part: str, lo: int, hi: int) -> Set[int]:
+        values: Set[int] = set()
+        for item in part.split(","):
+            rng, _, step = item.partition("/")
+            if rng == "*":
+                start, end = lo, hi
+            elif "-" in rng:
+                start, end = (int(v) for v in rng.split("-", 1))
+            else:
+                start = end = int(rng)
+                if step:
+                    end = hi
+            if not lo <= start <= end <= hi:
+                raise ValueError(f"cron field {item!r} out of range {lo}-{hi}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, day: datetime) -> bool:
+        dom = day.day in self.days
+        dow = (day.weekday() + 1) % 7 in self.weekdays  # cron counts from Sunday
+        if self.any_day or self.any_weekday:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after `after`."""
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)  # e.g. Feb 30 never matches
+        while t < limit:
+            if t.month not in self.months or not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"cron expression never fires: {self.expr!r}")
+
+
+def parse_jobs(specs: Optional[Sequence[str]] = None) -> List[Tuple[str, CronSchedule]]:
+    """
+    [(command, schedule)] from "command=cron" strings, or from the
+    FANTASY_AI_*_CRON defaults when none are given.
+    """
+    if specs:
+        pairs = [spec.split("=", 1) for spec in specs]
+        if any(len(pair) != 2 for pair in pairs):
+            raise ValueError("jobs must look like command=\"m h dom mon dow\"")
+    else:
+        pairs = list(DEFAULT_JOBS.items())
+    return [(command.strip(), CronSchedule(expr)) for command, expr in pairs
+            if expr.strip() and expr.strip().lower() != "off"]
+
+
+class Daemon:
+    """
+    Refresh-and-run loop over warm league contexts (all sharing one SharedData).
+
+    contexts: LeagueContext per league
+    jobs: [(command, CronSchedule)]
+    runner: callable(command, ctx) that renders and delivers one report
+    intervals: refresh cadence per group (see LeagueContext.refresh)
+    after_job: optional callable(command) run once a job has gone through every league
+    """
+
+    def __init__(self, contexts: List[LeagueContext], jobs: List[Tuple[str, CronSchedule]],
+                 runner: Callable[[str, LeagueContext], Any], intervals: Optional[Dict[str, int]] = None,
+                 clock: Callable[[], datetime] = datetime.now,
+                 after_job: Optional[Callable[[str], Any]] = None):
+        self.contexts = contexts
+        self.jobs = jobs
+        self.runner = runner
+        self.after_job = after_job
+        self.intervals = dict(intervals or REFRESH_INTERVALS)
+        self.clock = clock
+        self.stop_event = threading.Event()
+
+        now = clock()
+        self.next_refresh = {group: now for group in self.intervals}
+        self.next_run = [schedule.next_after(now) for _, schedule in jobs]
+
+    def warm(self) -> None:
+        """Load what the reports need so jobs start from memory."""
+        for ctx in self.contexts:
+            ctx.prefetch(ctx.week)
+            ctx.ros_scores
+            ctx.standings_for()
+
+    def refresh(self, groups: Sequence[str]) -> bool:
+        """Refresh data groups for every league, then re-warm; False if anything failed."""
+        with timing.stage(f"Refresh {'+'.join(groups)}"):
+            try:
+                for ctx in self.contexts:
+                    ctx.refresh(*groups)
+                self.warm()
+            except Exception as e:
+                print(f"⚠️ Refresh of {', '.join(groups)} failed ({e}) — retrying in {REFRESH_RETRY}s")
+                return False
+        return True
+
+    def run_job(self, command: str) -> None:
+        """Run one job for every league (errors are reported, not raised)."""
+        for ctx in self.contexts:
+            timing.reset()
+            try:
+                self.runner(command, ctx)
+            except Exception as e:
+                print(f"❌ {command} for league {ctx.league_id} failed: {e}")
+            timing.write_summary(command=command, league_id=ctx.league_id, week=ctx.week, mode="daemon")
+        if self.after_job:
+            self.after_job(command)
+
+    def tick(self) -> datetime:
+        """Do whatever is due now; returns when something is next due."""
+        now = self.clock()
+        due = [group for group, at in self.next_refresh.items() if at <= now]
+        if due:
+            ok = self.refresh(due)
+            for group in due:
+                wait = self.intervals[group] if ok else min(REFRESH_RETRY, self.intervals[group])
+                self.next_refresh[group] = now + timedelta(seconds=wait)
+
+        for i, (command, schedule) in enumerate(self.jobs):
+            if self.next_run[i] <= now:
+                self.run_job(command)
+                self.next_run[i] = schedule.next_after(max(now, self.clock()))
+
+        return min(list(self.next_refresh.values()) + self.next_run)
+
+    def run(self) -> None:
+        """Loop until stop() (or SIGINT / SIGTERM when run from the main thread)."""
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: self.stop())
+
+        for (command, _), at in zip(self.jobs, self.next_run):
+            print(f"🗓️ {command}: next run {at:%a %Y-%m-%d %H:%M}")
+        while not self.stop_event.is_set():
+            next_due = self.tick()
+            self.stop_event.wait(max(0.0, (next_due - self.clock()).total_seconds()))
+        print("👋 Daemon stopped")
+
+    def stop(self) -> None:
+        self.stop_event.set()
@@ -6,30 +6,46 @@ weekly matchups, waiver activity, strategy recommendations,
 and trade radar.
 """
 
-from fantasy_ai.scoring.ros_score import generate_ros_scores
-from fantasy_ai.utils.fetch import fetch_players
-from fantasy_ai.utils.config import LEAGUE_ID
+from fantasy_ai.context import LeagueContext
 from fantasy_ai.reports.weekly import weekly_report
 from fantasy_ai.reports.waivers import waivers
 from fantasy_ai.analysis.strategist import generate_strategy_digest
-from fantasy_ai.reports.trade_radar import trade_radar
+from fantasy_ai.reports.trade_radar import trade_radar_report
+from fantasy_ai.utils.timing import stage
 
-def digest(week_override=None):
-    """Generate full tactical digest for the given week."""
-    if not LEAGUE_ID:
+def digest(week_override=None, ctx=None):
+    """
+    Generate full tactical digest for the given week.
+
+    All sections share one LeagueContext, so each endpoint is fetched
+    (and the player dump parsed / scored) once per digest.
+    """
+    ctx = ctx or LeagueContext(week=week_override)
+    if not ctx.league_id:
         return "❌ LEAGUE_ID not set in environment"
 
-    players = fetch_players()
-    ros_scores = generate_ros_scores(players)
+    with stage("Data load"):
+        ctx.prefetch(week_override)
+    with stage("ROS scoring"):
+        ros_scores = ctx.ros_scores
+
+    with stage("Weekly Report"):
+        weekly = weekly_report(week_override, include_ros=True, ctx=ctx)
+    with stage("Waivers"):
+        waiver_section = waivers(week_override, ros_scores=ros_scores, ctx=ctx)
+    with stage("Strategy Recommendations"):
+        strategy = generate_strategy_digest(week_override, ros_scores=ros_scores, ctx=ctx)
+    with stage("Trade Radar"):
+        radar = trade_radar_report(week_override, ros_scores=ros_scores, ctx=ctx)
 
     sections = [
         f"\n📧 Weekly Digest — Week {week_override or 'Auto'}\n",
-        weekly_report(week_override, include_ros=True),
-        waivers(week_override, ros_scores=ros_scores),
+        weekly,
+        waiver_section,
         "\n🧠 Strategy Recommendations",
-        generate_strategy_digest(week_override, ros_scores=ros_scores),
+        strategy,
         "\n📊 Trade Radar",
-        trade_radar(week_override, ros_scores=ros_scores)
+        radar
     ]
 
     # Filter out any None values and join with newlines
@@ -2,13 +2,19 @@
 fantasy_ai.reports.trade_radar
 
 Identifies potential trade opportunities based on projected points,
-positional depth, and ROS scores.
+positional depth, and ROS scores, plus concrete mutually beneficial
+offers from analysis.trade_search when the league's roster_positions
+are known.
 """
 
+from fantasy_ai.context import LeagueContext
+from fantasy_ai.analysis.league_index import LeagueIndex
+from fantasy_ai.analysis.trade_search import search_trades
 from fantasy_ai.utils.helpers import normalize_name
 
 
-def trade_radar(matchups, rosters, users, players, ros_scores, player_proj_map, week, my_display_name=None):
+def trade_radar(matchups, rosters, users, players, ros_scores, player_proj_map, week, my_display_name=None,
+                index=None, roster_positions=None, trade_limit=5):
     """
     Return strategic trade targets based on scoring gaps, depth leverage, and matchup context.
 
@@ -22,7 +28,11 @@ def trade_radar(matchups, rosters, users, players, ros_scores, player_proj_map,
     player_proj_map: dict of player_id (str) -> projected points for this week
     week: int, current week number
     my_display_name: str, the display name of the roster owner to filter on
+    index: optional LeagueIndex over rosters (built here if omitted)
+    roster_positions: league roster_positions; enables the trade offer search for my roster
+    trade_limit: max number of trade offers listed
     """
+    index = index or LeagueIndex(rosters)
     output = [f"\n📊 Trade Radar — Week {week}"]
 
     # 🔍 Map roster_id → projected points (team level)
@@ -46,7 +56,7 @@ def trade_radar(matchups, rosters, users, players, ros_scores, player_proj_map,
     low_proj = sorted(proj_map.items(), key=lambda x: x[1])[:3]
 
     for rid, proj in low_proj:
-        owner = next((r for r in rosters if r["roster_id"] == rid), {})
+        owner = index.roster(rid) or {}
         user_id = owner.get("owner_id")
         user_name = users.get(user_id, f"Roster {rid}")
 
@@ -67,7 +77,8 @@ def trade_radar(matchups, rosters, users, players, ros_scores, player_proj_map,
                     )
 
         # 🔍 Buy-low candidates (based on ROS score vs projection)
-        bench = [pid for pid in owner.get("players", []) if pid not in owner.get("starters", [])]
+        starters = set(owner.get("starters") or [])
+        bench = [pid for pid in owner.get("players", []) if pid not in starters]
         for pid in bench:
             p = players.get(pid, {})
             player_name = normalize_name(p)
@@ -83,7 +94,57 @@ def trade_radar(matchups, rosters, users, players, ros_scores, player_proj_map,
 
         output.append("-" * 50)
 
+    # 🤝 Concrete offers that improve both optimal lineups
+    my_roster = next(
+        (r for r in rosters if my_display_name and users.get(r.get("owner_id")) == my_display_name), None
+    )
+    if my_roster and roster_positions and trade_limit:
+        offers = search_trades(rosters, players, ros_scores, roster_positions, my_roster["roster_id"],
+                               limit=trade_limit)
+        if offers:
+            output.append("🤝 Trade offers (ROS lineup value):")
+
+        def names(pids):
+            labels = []
+            for pid in pids:
+                p = players.get(pid, {})
+                labels.append(f"{normalize_name(p)} ({p.get('position', 'UNK')})")
+            return " + ".join(labels)
+
+        for t in offers:
+            partner = index.roster(t["partner"]) or {}
+            partner_name = users.get(partner.get("owner_id"), f"Roster {t['partner']}")
+            output.append(
+                f"  - Give {names(t['give'])} to {partner_name} for {names(t['get'])} — "
+                f"you +{t['my_gain']:.1f} ROS, them +{t['their_gain']:.1f}"
+            )
+
     if len(output) == 1:
         output.append("  No trade insights for your team this week.")
 
-    return "\n".join(output)
\ No newline at end of file
+    return "\n".join(output)
+
+
+def trade_radar_report(week=None, ros_scores=None, ctx=None):
+    """
+    Convenience wrapper: build the trade radar for a week from a LeagueContext.
+
+    Used by the CLI and the digest, which only know the week number.
+    """
+    ctx = ctx or LeagueContext(week=week)
+    if not ctx.league_id:
+        return "❌ LEAGUE_ID not set in environment"
+
+    week = week or ctx.week
+    return trade_radar(
+        ctx.matchups_for(week),
+        ctx.rosters,
+        ctx.user_names,
+        ctx.players,
+        ros_scores if ros_scores is not None else ctx.ros_scores,
+        ctx.player_proj_map_for(week),
+        week,
+        my_display_name=ctx.display_name,
+        index=ctx.index,
+        roster_positions=ctx.league.get("roster_positions"),
+    )
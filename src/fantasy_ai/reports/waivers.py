@@ -2,29 +2,81 @@
 fantasy_ai.reports.waivers
 
 Generates waiver wire activity reports for a given week,
-annotated with optional ROS scores.
+annotated with optional ROS scores, plus an optional season-to-date
+summary of adds and FAAB spent per manager (served from the transaction
+store; on a cold store that is one request per week so far).
+
+  FANTASY_AI_WAIVER_SEASON_SUMMARY   include the season summary (default false)
 """
 
-from fantasy_ai.utils.fetch import fetch_users, fetch_rosters, fetch_transactions, fetch_players
-from fantasy_ai.utils.config import LEAGUE_ID
+import os
+
+from fantasy_ai.context import LeagueContext
 from fantasy_ai.utils.helpers import normalize_name
 
-def waivers(week=None, ros_scores=None):
-    """Return waiver pickups and drops for a given week as a string."""
-    if not LEAGUE_ID:
+WAIVER_SEASON_SUMMARY = os.getenv("FANTASY_AI_WAIVER_SEASON_SUMMARY", "false").lower() == "true"
+
+
+def _creator(txn, users, index):
+    """Display name of whoever made a transaction."""
+    creator_id = txn.get("creator_id")
+    roster_id = (txn.get("roster_ids") or [None])[0]
+    if creator_id:
+        return users.get(creator_id, f"User {creator_id}")
+    if roster_id is not None:
+        roster_owner = index.roster(roster_id)
+        if roster_owner:
+            user_id = roster_owner.get("owner_id")
+            return users.get(user_id, f"User {user_id}")
+    return "Unknown"
+
+
+def season_waiver_activity(season_txns, users, index):
+    """
+    Lines summarizing completed waiver / free-agent adds and FAAB spent
+    per manager over {week: transactions}, busiest manager first.
+    """
+    totals = {}
+    for txns in season_txns.values():
+        for txn in txns:
+            if txn.get("type") not in ("waiver", "free_agent") or txn.get("status") not in (None, "complete"):
+                continue
+            name = _creator(txn, users, index)
+            adds, faab = totals.get(name, (0, 0))
+            totals[name] = (
+                adds + len(txn.get("adds") or {}),
+                faab + int((txn.get("settings") or {}).get("waiver_bid") or 0),
+            )
+
+    weeks = sorted(season_txns)
+    output = [f"\n📊 Season Waiver Activity — Weeks {weeks[0]}–{weeks[-1]}" if weeks else "\n📊 Season Waiver Activity"]
+    if not totals:
+        output.append("No waiver adds yet.")
+    for name, (adds, faab) in sorted(totals.items(), key=lambda kv: (-kv[1][0], -kv[1][1], kv[0])):
+        output.append(f"  {name:20} {adds:3d} adds, ${faab} FAAB")
+    return output
+
+def waivers(week=None, ros_scores=None, ctx=None, season_summary=None):
+    """
+    Return waiver pickups and drops for a given week as a string.
+
+    ctx: optional LeagueContext shared with other reports in the same run
+    season_summary: append season_waiver_activity (default FANTASY_AI_WAIVER_SEASON_SUMMARY)
+    """
+    ctx = ctx or LeagueContext()
+    if not ctx.league_id:
         return "❌ LEAGUE_ID not set in environment"
 
     week = week or 1
-    players = fetch_players()
-    users = {u["user_id"]: u.get("display_name", f"User {u['user_id']}") for u in fetch_users(LEAGUE_ID)}
-    rosters = fetch_rosters(LEAGUE_ID)
-    txns = fetch_transactions(LEAGUE_ID, week)
+    players = ctx.players
+    users = ctx.user_names
+    index = ctx.index
+    txns = ctx.transactions_for(week)
 
     output = [f"\n📥 Waiver Activity — Week {week}\n"]
 
     if not txns:
         output.append("No waiver transactions found.")
-        return "\n".join(output)
 
     for txn in txns:
         if txn["type"] not in ["waiver", "free_agent", "trade"]:
@@ -32,19 +84,7 @@ def waivers(week=None, ros_scores=None):
 
         adds = txn.get("adds") or {}
         drops = txn.get("drops") or {}
-
-        # Determine creator
-        creator_id = txn.get("creator_id")
-        roster_id = txn.get("roster_ids", [None])[0]
-        creator = "Unknown"
-
-        if creator_id:
-            creator = users.get(creator_id, f"User {creator_id}")
-        elif roster_id is not None:
-            roster_owner = next((r for r in rosters if r["roster_id"] == roster_id), None)
-            if roster_owner:
-                user_id = roster_owner.get("owner_id")
-                creator = users.get(user_id, f"User {user_id}")
+        creator = _creator(txn, users, index)
 
         # Annotate adds with ROS score
         for pid in adds:
@@ -70,4 +110,8 @@ def waivers(week=None, ros_scores=None):
 
         output.append("-" * 50)
 
+    if season_summary is None:
+        season_summary = WAIVER_SEASON_SUMMARY
+    if season_summary:
+        output.extend(season_waiver_activity(ctx.season_transactions(week), users, index))
     return "\n".join(output)
\ No newline at end of file
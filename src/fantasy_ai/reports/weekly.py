@@ -1,27 +1,28 @@
 """
 fantasy_ai.reports.weekly
 
-Generates weekly matchup reports with projections and optional
-rest-of-season scoring averages.
+Generates weekly matchup reports with projections, optional
+rest-of-season scoring averages, the league standings and, from the
+history store, how each team's score moved week over week.
 """
 
-from fantasy_ai.utils.config import LEAGUE_ID
-from fantasy_ai.utils.fetch import (
-    fetch_league_info,
-    fetch_matchups,
-    fetch_users,
-    fetch_rosters,
-    fetch_players
-)
-from fantasy_ai.scoring.ros_score import generate_ros_scores
+from fantasy_ai.context import LeagueContext
+from fantasy_ai.analysis.record_tracker import format_record, rank_standings
+from fantasy_ai.utils import history
+from fantasy_ai.utils.helpers import normalize_name
 
 
-def weekly_report(week_override=None, include_ros=False):
-    """Generate weekly matchup report with projections and optional ROS scoring."""
-    if not LEAGUE_ID:
+def weekly_report(week_override=None, include_ros=False, ctx=None):
+    """
+    Generate weekly matchup report with projections and optional ROS scoring.
+
+    ctx: optional LeagueContext shared with other reports in the same run
+    """
+    ctx = ctx or LeagueContext()
+    if not ctx.league_id:
         return "❌ LEAGUE_ID not set in environment"
 
-    league = fetch_league_info(LEAGUE_ID)
+    league = ctx.league
     season = league.get("season")
     reported_week = league.get("week")
 
@@ -32,16 +33,15 @@ def weekly_report(week_override=None, include_ros=False):
     else:
         off_season_note = None
 
-    users = {u["user_id"]: u.get("display_name", f"User {u['user_id']}") for u in fetch_users(LEAGUE_ID)}
-    rosters = fetch_rosters(LEAGUE_ID)
+    users = ctx.user_names
+    rosters = ctx.rosters
     roster_owner_map = {
         r["roster_id"]: users.get(r.get("owner_id"), f"Roster {r['roster_id']}")
         for r in rosters
     }
 
-    matchups = fetch_matchups(LEAGUE_ID, week)
-    players = fetch_players()
-    ros_scores = generate_ros_scores(players) if include_ros else {}
+    index = ctx.index_for(week)
+    ros_scores = ctx.ros_scores if include_ros else {}
 
     def avg_ros(roster):
         scores = [ros_scores.get(pid, 0) for pid in roster.get("players", [])]
@@ -53,18 +53,7 @@ def weekly_report(week_override=None, include_ros=False):
 
     output.append(f"\n🏈 Weekly Report — {league.get('name')} (Season {season}) — Week {week}\n")
 
-    seen_matchups = set()
-    for m in matchups:
-        mid = m.get("matchup_id")
-        if mid in seen_matchups:
-            continue
-        seen_matchups.add(mid)
-
-        teams = [mm for mm in matchups if mm.get("matchup_id") == mid]
-        if len(teams) != 2:
-            continue
-
-        t1, t2 = teams
+    for t1, t2 in index.head_to_head():
         name1 = roster_owner_map.get(t1["roster_id"], f"Roster {t1['roster_id']}")
         name2 = roster_owner_map.get(t2["roster_id"], f"Roster {t2['roster_id']}")
 
@@ -77,8 +66,8 @@ def weekly_report(week_override=None, include_ros=False):
         proj2 = float(t2.get("display_points", t2.get("projected_points", 0)) or 0.0)
         pts2 = pts2_actual if pts2_actual > 0 else proj2
 
-        ros1 = avg_ros(next((r for r in rosters if r["roster_id"] == t1["roster_id"]), {})) if include_ros else None
-        ros2 = avg_ros(next((r for r in rosters if r["roster_id"] == t2["roster_id"]), {})) if include_ros else None
+        ros1 = avg_ros(index.roster(t1["roster_id"]) or {}) if include_ros else None
+        ros2 = avg_ros(index.roster(t2["roster_id"]) or {}) if include_ros else None
 
         line1 = f"{name1:20}  {pts1:5.1f} pts  (proj {proj1:5.1f})"
         line2 = f"{name2:20}  {pts2:5.1f} pts  (proj {proj2:5.1f})"
@@ -89,4 +78,30 @@ def weekly_report(week_override=None, include_ros=False):
 
         output.extend([line1, line2, "-" * 50])
 
+    # Standings over completed weeks (past weeks come from the permanent cache)
+    standings = rank_standings(ctx.standings_for(week))
+    if any(rec["results"] for _, rec in standings):
+        output.append("\n📈 Standings")
+        for rank, (roster_id, rec) in enumerate(standings, 1):
+            name = roster_owner_map.get(roster_id, f"Roster {roster_id}")
+            output.append(
+                f"{rank:2}. {name:20}  {format_record(rec):7}  PF {rec['points_for']:7.1f}  "
+                f"PA {rec['points_against']:7.1f}  {rec['streak']}"
+            )
+
+    # Week-over-week movement between the last two completed weeks (history store)
+    last_final = next((w for w in range(week, 1, -1) if ctx.week_final(w)), None)
+    changes = history.week_over_week(ctx.league_id, last_final) if last_final else []
+    if changes:
+        output.append(f"\n📊 Week over Week — W{last_final - 1} → W{last_final}")
+        for c in changes:
+            name = roster_owner_map.get(c["roster_id"], f"Roster {c['roster_id']}")
+            output.append(f"  {name:20}  {c['prev_points']:6.1f} → {c['points']:6.1f}  ({c['delta']:+.1f})")
+        for m in history.player_movers(ctx.league_id, last_final):
+            p = ctx.players.get(m["player_id"], {})
+            output.append(
+                f"  {'🔺' if m['delta'] > 0 else '🔻'} {normalize_name(p)} ({p.get('position', 'UNK')}): "
+                f"{m['prev_points']:.1f} → {m['points']:.1f}"
+            )
+
     return "\n".join(output)
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+fantasy_ai.scoring.league_scoring
+
+Turns projected (or actual) stat lines into fantasy points under a
+league's own scoring_settings.
+
+A feed of stat lines is packed once into a StatMatrix (players × stat
+keys, float32). League points for every player are then a single
+matrix-vector product with the league's weights aligned to the same
+stat keys. Sleeper's stat keys and scoring_settings keys share names
+(rec, rush_yd, pass_td, bonus_rec_te, bonus_rush_yd_100,
+pts_allow_7_13, ...), so half-PPR, TE premium and bonus scoring need no
+special cases.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+
+class StatMatrix:
+    """
+    Dense stat lines for one feed.
+
+    ids: player ids (str), one per row
+    keys: stat key per column
+    values: float32 array (len(ids), len(keys)); missing stats are 0
+    """
+
+    def __init__(self, ids: List[str], keys: List[str], values: np.ndarray):
+        self.ids = ids
+        self.keys = keys
+        self.values = values
+        self.key_index = {k: j for j, k in enumerate(keys)}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state.pop("key_index", None)  # rebuilt on load
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.key_index = {k: j for j, k in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_feed(cls, feed: Any) -> "StatMatrix":
+        """
+        Pack a Sleeper stats/projections feed: a list of entries with
+        player_id and stats, or a {player_id: entry} dict.
+        """
+        if isinstance(feed, Mapping):
+            entries: Iterable = feed.items()
+        else:
+            entries = ((entry.get("player_id"), entry) for entry in feed or [])
+
+        ids: List[str] = []
+        key_index: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        vals: List[float] = []
+        for pid, entry in entries:
+            if pid is None:
+                continue
+            row = len(ids)
+            ids.append(str(pid))
+            for key, val in (entry.get("stats") or {}).items():
+                if not isinstance(val, (int, float)) or isinstance(val, bool) or not val:
+                    continue
+                col = key_index.setdefault(key, len(key_index))
+                rows.append(row)
+                cols.append(col)
+                vals.append(val)
+
+        values = np.zeros((len(ids), len(key_index)), dtype=np.float32)
+        values[rows, cols] = vals
+        return cls(ids, list(key_index), values)
+
+    def column(self, key: str) -> np.ndarray:
+        """One stat for every row (zeros when the feed never reports it)."""
+        j = self.key_index.get(key)
+        return self.values[:, j] if j is not None else np.zeros(len(self.ids), dtype=np.float32)
+
+    def points_field(self, field: str, fallback: str = "pts") -> Dict[str, float]:
+        """player_id -> a precomputed points stat (e.g. pts_ppr, else pts), non-zero only."""
+        pts = self.column(field)
+        pts = np.where(pts != 0, pts, self.column(fallback))
+        return self.to_map(pts)
+
+    def to_map(self, pts: np.ndarray) -> Dict[str, float]:
+        """player_id -> value for the non-zero entries of a per-row array (rounded to 0.01)."""
+        rows = np.flatnonzero(pts)
+        ids = self.ids
+        return dict(zip((ids[i] for i in rows.tolist()), np.round(pts[rows].astype(np.float64), 2).tolist()))
+
+
+def scoring_hash(scoring_settings: Optional[Mapping[str, Any]]) -> str:
+    """Stable short hash of a league's scoring_settings."""
+    blob = json.dumps(sorted((scoring_settings or {}).items()), separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def scoring_weights(matrix: StatMatrix, scoring_settings: Mapping[str, Any]) -> np.ndarray:
+    """scoring_settings as a float32 vector aligned to the matrix's stat keys (unscored stats = 0)."""
+    weights = np.zeros(len(matrix.keys), dtype=np.float32)
+    for key, weight in scoring_settings.items():
+        j = matrix.key_index.get(key)
+        if j is not None and isinstance(weight, (int, float)):
+            weights[j] = weight
+    return weights
+
+
+def league_points(matrix: StatMatrix, scoring_settings: Mapping[str, Any]) -> Dict[str, float]:
+    """player_id -> points under scoring_settings (stats · weights), non-zero only."""
+    if not len(matrix) or not matrix.keys:
+        return {}
+    return matrix.to_map(matrix.values @ scoring_weights(matrix, scoring_settings))
@@ -3,35 +3,136 @@ fantasy_ai.scoring.ros_score
 
 Calculates rest-of-season (ROS) scores for all players based on
 projections, performance trends, and positional value.
+
+Scores are computed for the whole pool at once as column operations on
+a PlayerTable: a formula produces a base score per row, which is then
+multiplied by a per-position weight. Formulas are pluggable through
+register_formula(); weights can be passed per call.
+
+Results are memoized by the table's content fingerprint plus a hash of
+the weights and formula, in process and (by default) in the disk cache,
+so repeated calls for the same snapshot cost a dict lookup and the next
+run with an unchanged dump skips scoring.
+
+  FANTASY_AI_ROS_FORMULA      default formula name (default "adp")
+  FANTASY_AI_ROS_DISK_CACHE   persist scores per snapshot (default true)
 """
 
-def generate_ros_scores(players: dict) -> dict:
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+from fantasy_ai.utils import cache
+from fantasy_ai.utils.players import PlayerTable, as_player_table
+
+POSITION_WEIGHTS: Dict[str, float] = {
+    "QB": 1.0,
+    "RB": 1.2,
+    "WR": 1.1,
+    "TE": 1.3,
+    "K": 0.6,
+    "DEF": 0.8,
+}
+
+ROS_FORMULA = os.getenv("FANTASY_AI_ROS_FORMULA", "adp")
+ROS_DISK_CACHE = os.getenv("FANTASY_AI_ROS_DISK_CACHE", "true").lower() == "true"
+
+# Snapshots kept in the in-process memo (a long-running process sees a few per day).
+MEMO_SIZE = 8
+
+Formula = Callable[[PlayerTable], np.ndarray]
+
+
+def adp_formula(table: PlayerTable) -> np.ndarray:
+    """Lower ADP = higher value; NaN where a player has no ADP."""
+    return np.round(200 - table.adp * 1.5, 1)
+
+
+FORMULAS: Dict[str, Formula] = {"adp": adp_formula}
+
+_memo: "OrderedDict[tuple, Dict[str, float]]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def register_formula(name: str, fn: Formula) -> None:
+    """
+    Add or replace a base-score formula. fn receives the PlayerTable and
+    returns a float array with one value per row (NaN = not scored).
+    """
+    FORMULAS[name] = fn
+    with _memo_lock:
+        _memo.clear()  # a replaced formula must not serve stale scores
+
+
+def config_hash(weights: Mapping[str, float], formula: str) -> str:
+    """Stable hash of the scoring configuration."""
+    fn = FORMULAS[formula]
+    blob = json.dumps(
+        {"weights": sorted(weights.items()), "formula": formula,
+         "impl": f"{fn.__module__}.{getattr(fn, '__qualname__', repr(fn))}"},
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def ros_score_array(table: PlayerTable, weights: Optional[Mapping[str, float]] = None,
+                    formula: Optional[str] = None) -> np.ndarray:
+    """
+    ROS score per table row as a float64 array (NaN = unscored), without memoization.
+    """
+    weights = POSITION_WEIGHTS if weights is None else weights
+    formula = formula or ROS_FORMULA
+
+    # Per-row weight via the position code column (NaN = unscored position)
+    weight_by_code = np.array(
+        [weights.get(label, np.nan) for label in table.labels["position"]] + [np.nan]
+    )
+    row_weights = weight_by_code[table.codes["position"]]  # code -1 picks the trailing NaN
+    return np.round(FORMULAS[formula](table) * row_weights, 1)
+
+
+def generate_ros_scores(players, weights: Optional[Mapping[str, float]] = None,
+                        formula: Optional[str] = None) -> dict:
     """
     Generate rest-of-season scores for Sleeper players using ADP and position weighting.
     Args:
-        players (dict): Sleeper player metadata keyed by player_id.
+        players (PlayerTable | dict): Sleeper player metadata keyed by player_id.
+        weights (dict): position -> multiplier (default POSITION_WEIGHTS).
+        formula (str): registered base-score formula (default FANTASY_AI_ROS_FORMULA).
     Returns:
-        dict: {player_id: ros_score}
+        dict: {player_id: ros_score} — shared between callers, treat as read-only.
     """
-    position_weights = {
-        "QB": 1.0,
-        "RB": 1.2,
-        "WR": 1.1,
-        "TE": 1.3,
-        "K": 0.6,
-        "DEF": 0.8,
-    }
-
-    ros_scores = {}
-    for pid, data in players.items():
-        adp = data.get("adp", None)
-        pos = data.get("position", None)
-
-        if adp is None or pos not in position_weights:
-            continue
-
-        base_score = round(200 - adp * 1.5, 1)  # Lower ADP = higher value
-        weighted_score = round(base_score * position_weights[pos], 1)
-        ros_scores[pid] = weighted_score
-
-    return ros_scores
\ No newline at end of file
+    weights = POSITION_WEIGHTS if weights is None else weights
+    formula = formula or ROS_FORMULA
+    table = as_player_table(players)
+    key = (table.fingerprint(), config_hash(weights, formula))
+
+    with _memo_lock:
+        scores = _memo.get(key)
+        if scores is not None:
+            _memo.move_to_end(key)
+            return scores
+
+    # One disk entry per config, replaced when the snapshot changes
+    cache_key = f"ros_scores_{key[1]}"
+    scores = None
+    if ROS_DISK_CACHE and (cache.read_meta(cache_key) or {}).get("snapshot") == key[0]:
+        scores = cache.load(cache_key)
+    if scores is None:
+        values = ros_score_array(table, weights, formula)
+        valid = np.flatnonzero(~np.isnan(values))
+        ids = table.ids
+        scores = dict(zip((ids[i] for i in valid), values[valid].tolist()))
+        if ROS_DISK_CACHE:
+            cache.store(cache_key, scores, {"snapshot": key[0], "config": key[1]})
+
+    with _memo_lock:
+        _memo[key] = scores
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return scores
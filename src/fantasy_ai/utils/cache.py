@@ -0,0 +1,142 @@
+"""
+fantasy_ai.utils.cache
+
+Small on-disk cache for large or slow-changing API payloads (e.g. the
+Sleeper player dump). Payloads are stored as gzip-compressed pickles so
+a hot read skips both the network and the JSON parse; a JSON sidecar
+keeps the fetch time and HTTP validators (ETag / Last-Modified) used for
+conditional revalidation. Writes are atomic and guarded by a lock file
+so overlapping cron runs never see a half-written entry.
+"""
+
+import gzip
+import json
+import os
+import pickle
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+CACHE_DIR = Path(os.getenv("FANTASY_AI_CACHE_DIR") or Path.home() / ".cache" / "fantasy_ai")
+VERBOSE = os.getenv("FANTASY_AI_VERBOSE", "false").lower() == "true"
+
+# A lock older than this is assumed to belong to a crashed run and is broken.
+STALE_LOCK_SECONDS = 300
+
+
+def _slug(key: str) -> str:
+    """Turn a cache key such as 'players/nfl' into a safe file stem."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_") or "default"
+
+
+def cache_path(key: str) -> Path:
+    """Return the payload path for a cache key."""
+    return CACHE_DIR / f"{_slug(key)}.pkl.gz"
+
+
+def meta_path(key: str) -> Path:
+    """Return the metadata sidecar path for a cache key."""
+    return CACHE_DIR / f"{_slug(key)}.meta.json"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write bytes to path via a temp file + rename so readers never see partial data."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read_meta(key: str) -> Optional[Dict[str, Any]]:
+    """Return the metadata dict for a key, or None if missing/corrupt."""
+    try:
+        return json.loads(meta_path(key).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(meta: Optional[Dict[str, Any]], ttl: Optional[float]) -> bool:
+    """True if the entry was fetched/revalidated within ttl seconds (None = never expires)."""
+    if not meta:
+        return False
+    if ttl is None:
+        return True
+    return time.time() - float(meta.get("fetched_at", 0)) < ttl
+
+
+def load(key: str) -> Optional[Any]:
+    """Return the cached payload for a key, or None if missing/corrupt."""
+    try:
+        with gzip.open(cache_path(key), "rb") as fh:
+            return pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        if VERBOSE:
+            print(f"[CACHE] miss/corrupt entry for {key}")
+        return None
+
+
+def store(key: str, payload: Any, meta: Optional[Dict[str, Any]] = None) -> None:
+    """Store a payload and its metadata; the payload is written before the sidecar."""
+    blob = gzip.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), compresslevel=3)
+    _atomic_write(cache_path(key), blob)
+    touch(key, meta)
+
+
+def touch(key: str, meta: Optional[Dict[str, Any]] = None) -> None:
+    """Mark an entry as freshly validated (e.g. after an HTTP 304)."""
+    meta = dict(meta or {})
+    meta["fetched_at"] = time.time()
+    _atomic_write(meta_path(key), json.dumps(meta).encode("utf-8"))
+
+
+@contextmanager
+def lock(key: str, timeout: float = 60.0, poll: float = 0.2) -> Iterator[bool]:
+    """
+    Cross-process lock for a cache key using an O_EXCL lock file.
+
+    Yields True if the lock was acquired, False if it timed out; callers
+    may still proceed since writes are atomic, they just lose the
+    "only one run downloads" guarantee.
+    """
+    path = CACHE_DIR / f"{_slug(key)}.lock"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    acquired = False
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            acquired = True
+            break
+        except FileExistsError:
+            try:
+                if time.time() - path.stat().st_mtime > STALE_LOCK_SECONDS:
+                    os.unlink(path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() >= deadline:
+                if VERBOSE:
+                    print(f"[CACHE] lock timeout for {key}, continuing unlocked")
+                break
+            time.sleep(poll)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
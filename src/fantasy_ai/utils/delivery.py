@@ -3,17 +3,41 @@ fantasy_ai.utils.delivery
 
 Handles output delivery channels such as email, Discord, or other
 integrations. Uses configuration from utils.config.
+
+deliver() sends a batch of messages on every configured channel at
+once (one thread per channel) and returns each channel's outcome and
+latency:
+
+  - email over SMTP keeps one authenticated connection for the whole
+    process (checked with NOOP before reuse, reopened when the server
+    dropped it), so a batch of digests logs in once; SendGrid goes
+    through the shared pooled HTTP session
+  - Discord bodies are split on line boundaries and posted in order,
+    following the webhook's rate-limit headers (X-RateLimit-Remaining /
+    X-RateLimit-Reset-After); 429s are retried after Retry-After by the
+    shared session (utils.http), the only retry layer
+
+  FANTASY_AI_DISCORD_CHUNK        max characters per Discord message body (default 1700)
 """
 
 import os
 import smtplib
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 
+from fantasy_ai.utils import http
+
 # Load environment variables from .env
 load_dotenv()
 
+DISCORD_CHUNK = int(os.getenv("FANTASY_AI_DISCORD_CHUNK", "1700"))
+
+Message = Tuple[str, str]  # (subject, body)
+
 def _mask(s): return s[:2] + "****" + s[-2:] if s else "None"
 
 # Debug print to confirm .env is loading
@@ -28,22 +52,90 @@ print("SMTP config:", {
     "sendgrid_key": _mask(os.getenv("SENDGRID_API_KEY"))
 })
 
+def _result(channel: str, ok: bool, sent: int, detail: str = "", seconds: float = 0.0) -> Dict[str, Any]:
+    return {"channel": channel, "ok": ok, "sent": sent, "detail": detail, "seconds": round(seconds, 3)}
+
+def _too_short(body: str) -> bool:
+    return not body or len(body.strip()) < 10
+
+# --- Email -----------------------------------------------------------------
+
 def send_email(subject: str, body: str):
-    if not body or len(body.strip()) < 10:
+    """Send one email with the configured provider; returns the channel result."""
+    return send_emails([(subject, body)])
+
+def send_emails(messages: Sequence[Message]) -> Dict[str, Any]:
+    """Send a batch of emails with the configured provider (one SMTP login for all of them)."""
+    start = time.perf_counter()
+    messages = [(s, b) for s, b in messages if not _too_short(b)]
+    if not messages:
         print("⚠️ Email body appears empty or too short — skipping send.")
-        return
+        return _result("email", True, 0, "skipped (empty)")
 
     provider = os.getenv("EMAIL_PROVIDER", "gmail").lower()
-    print(f"📤 Email body preview:\n{body[:300]}...\n---")
+    for _, body in messages:
+        print(f"📤 Email body preview:\n{body[:300]}...\n---")
 
     if provider == "sendgrid":
-        send_via_sendgrid(subject, body)
+        sent, errors = 0, []
+        for subject, body in messages:
+            error = send_via_sendgrid(subject, body)
+            if error:
+                errors.append(error)
+            else:
+                sent += 1
     elif provider == "gmail":
-        send_via_gmail(subject, body)
+        sent, errors = send_via_gmail(messages)
     else:
         print(f"❌ Unsupported EMAIL_PROVIDER: {provider}")
+        return _result("email", False, 0, f"unsupported provider {provider}")
+    return _result("email", not errors, sent, "; ".join(errors), time.perf_counter() - start)
 
-def send_via_gmail(subject: str, body: str):
+class _SMTPConnection:
+    """One authenticated SMTP connection shared by every send in the process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.server: Optional[smtplib.SMTP] = None
+        self.key = None
+
+    def get(self, host: str, port: int, user: str, password: str) -> smtplib.SMTP:
+        """Live connection for these credentials (call with self.lock held)."""
+        key = (host, port, user)
+        if self.server is not None and self.key == key:
+            try:
+                if self.server.noop()[0] == 250:
+                    return self.server
+            except smtplib.SMTPException:
+                pass
+        self.close()
+        server = smtplib.SMTP(host, port, timeout=30)
+        try:
+            server.starttls()
+            server.login(user, password)
+        except BaseException:
+            server.close()
+            raise
+        self.server, self.key = server, key
+        return server
+
+    def close(self) -> None:
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                self.server.close()
+        self.server = self.key = None
+
+_smtp = _SMTPConnection()
+
+def close_smtp():
+    """Log out of the shared SMTP connection (end of a batch or process)."""
+    with _smtp.lock:
+        _smtp.close()
+
+def send_via_gmail(messages: Sequence[Message]) -> Tuple[int, List[str]]:
+    """Send messages over the shared SMTP connection; returns (sent, errors)."""
     smtp_host = os.getenv("SMTP_HOST")
     smtp_port = int(os.getenv("SMTP_PORT", 587))
     smtp_user = os.getenv("SMTP_USER")
@@ -53,33 +145,49 @@ def send_via_gmail(subject: str, body: str):
 
     if not all([smtp_host, smtp_port, smtp_user, smtp_pass, email_to]):
         print("❌ Missing Gmail SMTP configuration in .env")
-        return
+        return 0, ["missing SMTP configuration"]
 
-    msg = EmailMessage()
-    msg["Subject"] = subject
-    msg["From"] = send_from
-    msg["To"] = email_to
-    msg.set_content(body)
+    sent, errors = 0, []
+    with _smtp.lock:
+        for subject, body in messages:
+            msg = EmailMessage()
+            msg["Subject"] = subject
+            msg["From"] = send_from
+            msg["To"] = email_to
+            msg.set_content(body)
 
-    try:
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
-        print("📧 Email sent successfully via Gmail.")
-    except smtplib.SMTPAuthenticationError as e:
-        print(f"❌ Gmail delivery failed: Authentication error — {e.smtp_error.decode()}")
-    except Exception as e:
-        print(f"❌ Gmail delivery failed: {e}")
+            for attempt in range(2):  # a connection the server dropped since the NOOP gets one reconnect
+                try:
+                    _smtp.get(smtp_host, smtp_port, smtp_user, smtp_pass).send_message(msg)
+                    sent += 1
+                    print("📧 Email sent successfully via Gmail.")
+                    break
+                except smtplib.SMTPServerDisconnected as e:
+                    _smtp.close()
+                    if attempt:
+                        errors.append(str(e))
+                        print(f"❌ Gmail delivery failed: {e}")
+                except smtplib.SMTPAuthenticationError as e:
+                    _smtp.close()
+                    errors.append("authentication error")
+                    print(f"❌ Gmail delivery failed: Authentication error — {e.smtp_error.decode()}")
+                    return sent, errors
+                except Exception as e:
+                    _smtp.close()
+                    errors.append(str(e))
+                    print(f"❌ Gmail delivery failed: {e}")
+                    break
+    return sent, errors
 
-def send_via_sendgrid(subject: str, body: str):
+def send_via_sendgrid(subject: str, body: str) -> Optional[str]:
+    """Send one email through SendGrid; returns an error description or None."""
     api_key = os.getenv("SENDGRID_API_KEY")
     email_to = os.getenv("EMAIL_TO")
     send_from = os.getenv("SMTP_FROM")
 
     if not all([api_key, email_to, send_from]):
         print("❌ Missing SendGrid configuration in .env")
-        return
+        return "missing SendGrid configuration"
 
     payload = {
         "personalizations": [{"to": [{"email": email_to}]}],
@@ -94,35 +202,142 @@ def send_via_sendgrid(subject: str, body: str):
     }
 
     try:
-        response = requests.post("https://api.sendgrid.com/v3/mail/send", json=payload, headers=headers)
+        response = http.post("https://api.sendgrid.com/v3/mail/send", json=payload, headers=headers)
         if response.status_code == 202:
             print("📧 Email sent successfully via SendGrid.")
-        else:
-            print(f"❌ SendGrid delivery failed: {response.status_code} — {response.text}")
+            return None
+        print(f"❌ SendGrid delivery failed: {response.status_code} — {response.text}")
+        return f"HTTP {response.status_code}"
     except Exception as e:
         print(f"❌ SendGrid delivery error: {e}")
+        return str(e)
+
+# --- Discord ---------------------------------------------------------------
+
+def chunk_lines(body: str, limit: int = DISCORD_CHUNK) -> List[str]:
+    """Split text into chunks of at most `limit` characters, breaking between lines (hard-splitting only over-long lines)."""
+    chunks, current = [], ""
+    for line in body.splitlines():
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            candidate = line
+        current = candidate
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+# webhook -> monotonic time before which the bucket is exhausted
+_discord_resume: Dict[str, float] = {}
+_discord_lock = threading.Lock()
+
+def _discord_wait(webhook: str) -> None:
+    with _discord_lock:
+        resume = _discord_resume.get(webhook, 0.0)
+    delay = resume - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+def _discord_note_limits(webhook: str, response) -> None:
+    """Remember when the webhook's bucket refills (from the rate-limit headers or a 429)."""
+    headers = response.headers
+    wait = _retry_after(response) if response.status_code == 429 else 0.0
+    if headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            wait = max(wait, float(headers.get("X-RateLimit-Reset-After") or 0))
+        except ValueError:
+            pass
+    if wait > 0:
+        with _discord_lock:
+            _discord_resume[webhook] = max(_discord_resume.get(webhook, 0.0), time.monotonic() + wait)
+
+def _retry_after(response) -> float:
+    try:
+        return float(response.json().get("retry_after") or 0)
+    except (ValueError, AttributeError):
+        try:
+            return float(response.headers.get("Retry-After") or 1)
+        except ValueError:
+            return 1.0
 
 def send_discord(body: str):
+    """Post a body to the Discord webhook in line-aligned parts; returns the channel result."""
+    return send_discords([body])
+
+def send_discords(bodies: Sequence[str]) -> Dict[str, Any]:
+    """Post several bodies in order, each in line-aligned parts, within the webhook's rate limits."""
+    start = time.perf_counter()
     webhook = os.getenv("DISCORD_WEBHOOK")
     if not webhook:
         print("❌ DISCORD_WEBHOOK not set in .env")
-        return
+        return _result("discord", False, 0, "DISCORD_WEBHOOK not set")
 
-    if not body or len(body.strip()) < 10:
+    bodies = [b for b in bodies if not _too_short(b)]
+    if not bodies:
         print("⚠️ Discord body appears empty or too short — skipping send.")
-        return
-
-    print(f"📤 Discord body preview:\n{body[:300]}...\n---")
+        return _result("discord", True, 0, "skipped (empty)")
 
-    chunks = [body[i:i+1700] for i in range(0, len(body), 1700)]
-
-    for i, chunk in enumerate(chunks):
-        payload = {"content": f"📦 Digest Part {i+1}:\n{chunk}"}
-        try:
-            response = requests.post(webhook, json=payload)
-            if response.status_code == 204:
+    sent, errors = 0, []
+    for body in bodies:
+        print(f"📤 Discord body preview:\n{body[:300]}...\n---")
+        for i, chunk in enumerate(chunk_lines(body)):
+            payload = {"content": f"📦 Digest Part {i+1}:\n{chunk}"}
+            _discord_wait(webhook)
+            try:
+                response = http.post(webhook, json=payload)  # 429s retried by the session
+            except Exception as e:
+                errors.append(str(e))
+                print(f"❌ Discord delivery error: {e}")
+                continue
+            _discord_note_limits(webhook, response)
+            if response.status_code in (200, 204):
+                sent += 1
                 print(f"💬 Discord message sent (Part {i+1}).")
             else:
+                errors.append(f"HTTP {response.status_code}")
                 print(f"❌ Discord delivery failed: {response.status_code} {response.text}")
+    return _result("discord", not errors, sent, "; ".join(errors), time.perf_counter() - start)
+
+# --- All channels ----------------------------------------------------------
+
+CHANNELS = {
+    "email": send_emails,
+    "discord": lambda messages: send_discords([body for _, body in messages]),
+}
+
+def deliver(subject: str, body: str, channels: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Send one message on every channel concurrently; see deliver_batch()."""
+    return deliver_batch([(subject, body)], channels)
+
+def deliver_batch(messages: Sequence[Message], channels: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Send messages on all channels (default: email and Discord) at the same
+    time, each channel sending the whole batch in order. Returns one
+    result per channel {"channel", "ok", "sent", "detail", "seconds"} and
+    prints a one-line outcome for each.
+    """
+    names = list(channels or CHANNELS)
+
+    def run(name):
+        start = time.perf_counter()
+        try:
+            result = CHANNELS[name](messages)
         except Exception as e:
-            print(f"❌ Discord delivery error: {e}")
\ No newline at end of file
+            result = _result(name, False, 0, str(e))
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, len(names)), thread_name_prefix="deliver") as pool:
+        results = list(pool.map(run, names))
+
+    for r in results:
+        status = "ok" if r["ok"] else "failed"
+        detail = f" — {r['detail']}" if r["detail"] else ""
+        print(f"📬 {r['channel']}: {status}, {r['sent']} sent in {r['seconds'] * 1000:.0f} ms{detail}")
+    return results
@@ -3,15 +3,55 @@ fantasy_ai.utils.fetch
 
 Provides functions to fetch data from the Sleeper API, including
 league info, rosters, matchups, transactions, and player data.
+
+League snapshots, rosters, matchups, transactions and league-scored
+projections are recorded into the SQLite history (utils.history) as
+they are downloaded.
 """
 
+import hashlib
 import os
+import threading
+import time
 import requests
-from typing import Any, Dict, List, Optional
-
-SLEEPER_API_BASE = "https://api.sleeper.app/v1"
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fantasy_ai.scoring.league_scoring import StatMatrix, league_points, scoring_hash
+from fantasy_ai.utils import cache, history, http, replay
+from fantasy_ai.utils.players import (
+    ACTIVE_PLAYERS_ONLY,
+    PLAYER_FIELDS,
+    PlayerTable,
+    iter_players,
+    parse_players,
+)
+
+SLEEPER_API_BASE = os.getenv("SLEEPER_API_BASE", "https://api.sleeper.app/v1")
 VERBOSE = os.getenv("FANTASY_AI_VERBOSE", "false").lower() == "true"
 
+# Sleeper asks clients to pull players/nfl at most once per day.
+PLAYERS_CACHE_TTL = int(os.getenv("FANTASY_AI_PLAYERS_TTL", "86400"))
+
+# Projection feed TTLs: short while a week can still change, long once it has locked.
+PROJECTIONS_TTL_LIVE = int(os.getenv("FANTASY_AI_PROJECTIONS_TTL_LIVE", "3600"))
+PROJECTIONS_TTL_LOCKED = int(os.getenv("FANTASY_AI_PROJECTIONS_TTL_LOCKED", str(7 * 86400)))
+STATE_CACHE_TTL = int(os.getenv("FANTASY_AI_STATE_TTL", "900"))
+SLEEPER_PROJECTIONS_BASE = os.getenv("SLEEPER_PROJECTIONS_BASE", "https://api.sleeper.com/projections/nfl")
+
+# Scoring key -> stat field in the projections feed
+PROJECTION_POINT_FIELDS = {"ppr": "pts_ppr", "half_ppr": "pts_half_ppr", "std": "pts_std"}
+
+# Max parallel requests for independent fetches; 1 restores the sequential path.
+FETCH_WORKERS = int(os.getenv("FANTASY_AI_FETCH_WORKERS", "6"))
+
+
+def _build_url(endpoint: str) -> str:
+    """Join a relative API path to SLEEPER_API_BASE; pass full URLs through."""
+    if endpoint.startswith("http://") or endpoint.startswith("https://"):
+        return endpoint
+    return f"{SLEEPER_API_BASE.rstrip('/')}/{endpoint.lstrip('/')}"
+
 
 def fetch(endpoint: str) -> Any:
     """
@@ -20,15 +60,12 @@ def fetch(endpoint: str) -> Any:
     or a full URL (http/https). Raises for HTTP errors.
     Returns parsed JSON or empty dict/list on failure.
     """
-    if endpoint.startswith("http://") or endpoint.startswith("https://"):
-        url = endpoint
-    else:
-        url = f"{SLEEPER_API_BASE.rstrip('/')}/{endpoint.lstrip('/')}"
+    url = _build_url(endpoint)
 
     if VERBOSE:
         print(f"[FETCH] {url}")
 
-    resp = requests.get(url, timeout=10)
+    resp = http.get(url)
     resp.raise_for_status()
     try:
         return resp.json()
@@ -38,13 +75,120 @@ def fetch(endpoint: str) -> Any:
         return {}  # or [] depending on expected type
 
 
+def fetch_cached(endpoint: str, key: str, ttl: Optional[float],
+                 transform: Optional[Callable[[Any], Any]] = None,
+                 parse: Optional[Callable[[Iterable[bytes]], Any]] = None) -> Any:
+    """
+    GET an endpoint through the on-disk cache.
+
+    - Fresh entries (younger than ttl seconds) are returned without any
+      network access or JSON parsing.
+    - Stale entries are revalidated with If-None-Match / If-Modified-Since;
+      a 304 just refreshes the entry's timestamp.
+    - Concurrent runs serialize on a per-key lock, and whoever waits picks
+      up the entry the first run wrote instead of downloading it again.
+    - If the network fails and a stale copy exists, the stale copy is used.
+
+    transform, if given, is applied to the parsed JSON before it is cached,
+    so callers can store a compact normalized form instead of the raw body.
+    parse, if given, replaces resp.json(): the body is streamed and handed
+    to parse as an iterable of byte chunks.
+
+    In record mode (FANTASY_AI_HTTP_MODE=record) the cache is bypassed and
+    no conditional headers are sent, so every fixture gets a full body.
+    """
+    if not replay.RECORDING and cache.is_fresh(cache.read_meta(key), ttl):
+        payload = cache.load(key)
+        if payload is not None:
+            if VERBOSE:
+                print(f"[CACHE] hit {key}")
+            return payload
+
+    url = _build_url(endpoint)
+    with cache.lock(key):
+        # Another process may have refreshed the entry while we waited.
+        meta = cache.read_meta(key)
+        cached = cache.load(key) if meta else None
+        if cached is not None and cache.is_fresh(meta, ttl) and not replay.RECORDING:
+            return cached
+
+        headers = {}
+        if cached is not None and not replay.RECORDING:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        if VERBOSE:
+            print(f"[FETCH] {url} (conditional={bool(headers)})")
+
+        try:
+            resp = http.get(url, headers=headers, timeout=30, stream=parse is not None)
+            if resp.status_code == 304 and cached is not None:
+                cache.touch(key, meta)
+                if VERBOSE:
+                    print(f"[CACHE] revalidated {key} (304)")
+                return cached
+            resp.raise_for_status()
+            if parse is not None:
+                with resp:
+                    payload = parse(resp.iter_content(chunk_size=64 * 1024))
+            else:
+                payload = resp.json()
+            if transform is not None:
+                payload = transform(payload)
+        except (requests.RequestException, ValueError) as e:
+            if cached is not None:
+                print(f"⚠️ Refresh of {key} failed ({e}) — using stale cached copy")
+                return cached
+            raise
+
+        cache.store(key, payload, {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+        })
+        return payload
+
+
+def fetch_concurrently(calls: Dict[str, Callable[[], Any]], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run independent fetch callables in parallel and return {name: result}.
+
+    Concurrency is bounded by max_workers (default FANTASY_AI_FETCH_WORKERS);
+    with a limit of 1 the calls simply run in order. If any call raises, the
+    first exception (in call order) is re-raised once all calls have finished.
+    """
+    workers = max(1, min(max_workers or FETCH_WORKERS, len(calls)))
+    if workers == 1:
+        return {name: fn() for name, fn in calls.items()}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+        futures = {name: pool.submit(fn) for name, fn in calls.items()}
+    return {name: fut.result() for name, fut in futures.items()}
+
+
+def _history_week() -> int:
+    """NFL week that snapshots without a week of their own (league, rosters) are filed under."""
+    try:
+        return int(fetch_state().get("week") or 0)
+    except (requests.RequestException, ValueError):
+        return 0
+
+
 def fetch_league_info(league_id: str) -> Dict[str, Any]:
     """Fetch league metadata including scoring, roster positions, etc."""
-    return fetch(f"league/{league_id}")
+    league = fetch(f"league/{league_id}")
+    if league and history.HISTORY_ENABLED:
+        history.record_league(league, _history_week())
+    return league
 
 
 def fetch_scoring_settings(league_id: str) -> Dict[str, Any]:
-    """Convenience function: fetch scoring settings from league info."""
+    """
+    Convenience function: fetch scoring settings from league info
+    (pass them to fetch_projections / fetch_matchups for league-scored points).
+    """
     league = fetch_league_info(league_id)
     return league.get("scoring_settings", {})
 
@@ -56,7 +200,10 @@ def fetch_users(league_id: str) -> List[Dict[str, Any]]:
 
 def fetch_rosters(league_id: str) -> List[Dict[str, Any]]:
     """Fetch all roster objects for the given league."""
-    return fetch(f"league/{league_id}/rosters")
+    rosters = fetch(f"league/{league_id}/rosters")
+    if rosters and history.HISTORY_ENABLED:
+        history.record_rosters(league_id, _history_week(), rosters)
+    return rosters
 
 
 def fetch_rostered(league_id: str, user_id: str) -> Optional[Dict[str, Any]]:
@@ -68,40 +215,48 @@ def fetch_rostered(league_id: str, user_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def fetch_matchups(league_id: str, week: int):
+def fetch_week_matchups(league_id: str, week: int, final: bool = False) -> List[Dict[str, Any]]:
+    """
+    Fetch a week's raw matchups (no projection merge). Sleeper publishes the
+    pairings for future weeks too, so this is also the schedule source.
+
+    final: the week has been scored and can no longer change; its matchups
+           are then kept in the disk cache permanently and fetched only once.
+    """
+    endpoint = f"league/{league_id}/matchups/{week}"
+    if final:
+        def record(matchups):  # runs only when the week is actually downloaded
+            history.record_matchups(league_id, week, matchups, final=True)
+            return matchups
+
+        return fetch_cached(endpoint, f"matchups_{league_id}_{week}", None, transform=record) or []
+    matchups = fetch(endpoint) or []
+    history.record_matchups(league_id, week, matchups)
+    return matchups
+
+
+def fetch_matchups(league_id: str, week: int, scoring_settings: Optional[Dict[str, Any]] = None,
+                   season: Optional[str] = None):
     """
     Fetch matchups for a given week and merge in projections from Sleeper's
     public projections feed so pre-kickoff totals match the web UI.
 
+    scoring_settings: the league's scoring_settings; projections are then
+                      scored under the league's rules (else the feed's PPR points)
+    season: season of the projections (default: the current one)
+
     Adds to each matchup dict:
       - 'display_points': team-level projection or actual points
       - 'player_points': dict of player_id -> projected points for that week
                          (covers ALL players in the projections feed, not just starters)
     """
-    # 1. Get the base matchups from Sleeper
-    matchups = fetch(f"league/{league_id}/matchups/{week}")
-
-    # 2. Fetch full player projections from Sleeper's .com feed
-    projections_url = (
-        f"https://api.sleeper.com/projections/nfl/2025/{week}"
-        "?season_type=regular"
-        "&position[]=DEF&position[]=FLEX&position[]=K"
-        "&position[]=QB&position[]=RB&position[]=SUPER_FLEX"
-        "&position[]=TE&position[]=WR"
-        "&order_by=ppr"
-    )
-    projections = fetch(projections_url)
-
-    # Normalize to dict keyed by player_id if API returned a list
-    if isinstance(projections, list):
-        projections = {str(p.get("player_id")): p for p in projections}
-
-    # 3. Build a global player_id -> projected points map for ALL players in the feed
-    global_player_points = {}
-    for pid, proj_entry in projections.items():
-        stats = proj_entry.get("stats", {})
-        pts = stats.get("pts_ppr") or stats.get("pts") or 0.0
-        global_player_points[str(pid)] = float(pts)
+    # 1-2. Base matchups and the shared projection index for the week, in parallel
+    results = fetch_concurrently({
+        "matchups": lambda: fetch_week_matchups(league_id, week),
+        "projections": lambda: fetch_projections(week, season=season, scoring_settings=scoring_settings),
+    })
+    matchups = results["matchups"]
+    global_player_points = results["projections"]
 
     # 4. Calculate team-level projected totals from starters
     calc_proj_totals = {}
@@ -133,14 +288,138 @@ def fetch_matchups(league_id: str, week: int):
 
     return matchups
 
+
+_projection_memo: Dict[tuple, tuple] = {}
+_points_memo: Dict[tuple, tuple] = {}
+# One lock per memo key, so different weeks / scorings load concurrently
+_key_locks: Dict[tuple, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+def _key_lock(key: tuple) -> threading.Lock:
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def fetch_projection_stats(week: int, season: Optional[str] = None) -> StatMatrix:
+    """
+    Projected stat lines for one week as a StatMatrix (players × stat keys).
+
+    The full projections feed is downloaded once per (season, week),
+    packed into the matrix, and cached on disk; the season defaults to
+    the current one from fetch_state(). Weeks that have already locked
+    are cached for FANTASY_AI_PROJECTIONS_TTL_LOCKED, the live/upcoming
+    week for FANTASY_AI_PROJECTIONS_TTL_LIVE. Within a process every
+    caller shares the same matrix, so treat it as read-only.
+    """
+    season = int(season or fetch_state().get("season") or 0)
+    week = int(week)
+    ttl = PROJECTIONS_TTL_LOCKED if week_locked(season, week) else PROJECTIONS_TTL_LIVE
+
+    key = (season, week)
+    with _key_lock(("projections",) + key):
+        loaded_at, matrix = _projection_memo.get(key, (0.0, None))
+        if matrix is None or time.monotonic() - loaded_at >= ttl:
+            url = (
+                f"{SLEEPER_PROJECTIONS_BASE}/{season}/{week}"
+                "?season_type=regular"
+                "&position[]=DEF&position[]=FLEX&position[]=K"
+                "&position[]=QB&position[]=RB&position[]=SUPER_FLEX"
+                "&position[]=TE&position[]=WR"
+                "&order_by=ppr"
+            )
+            matrix = fetch_cached(url, f"projection_stats_{season}_{week}", ttl, transform=StatMatrix.from_feed)
+            _projection_memo[key] = (time.monotonic(), matrix)
+    return matrix
+
+
+def fetch_projections(week: int, season: Optional[str] = None, scoring_key: str = "ppr",
+                      scoring_settings: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Return a compact player_id -> projected points index for one week.
+
+    With scoring_settings (a league's scoring_settings) every projected
+    stat line is scored under the league's rules in one vectorized pass
+    (scoring.league_scoring.league_points), memoized per (scoring hash,
+    season, week). Without it the feed's own pts_<scoring_key> is used.
+    Both derive from fetch_projection_stats(), so the feed is downloaded
+    once per week whatever the scoring. Treat the result as read-only.
+    """
+    season = int(season or fetch_state().get("season") or 0)
+    week = int(week)
+    matrix = fetch_projection_stats(week, season)
+    if scoring_settings:
+        key = ("league", scoring_hash(scoring_settings), season, week)
+        compute = lambda: league_points(matrix, scoring_settings)
+    else:
+        field = PROJECTION_POINT_FIELDS.get(scoring_key, f"pts_{scoring_key}")
+        key = (field, season, week)
+        compute = lambda: matrix.points_field(field)
+
+    with _key_lock(("points",) + key):
+        source, points = _points_memo.get(key, (None, None))
+        fresh = source is not matrix  # recomputed whenever the feed was refreshed
+        if fresh:
+            points = compute()
+            _points_memo[key] = (matrix, points)
+    if fresh:
+        history.record_projections(season, week, key[0] if key[0] != "league" else key[1], points)
+    return points
+
+
 def fetch_transactions(league_id: str, week: int) -> List[Dict[str, Any]]:
     """Fetch all transactions (waivers, trades, drops) for a given week."""
-    return fetch(f"league/{league_id}/transactions/{week}")
+    transactions = fetch(f"league/{league_id}/transactions/{week}")
+    history.record_transactions(league_id, week, transactions)
+    return transactions
+
+
+def _players_variant(active_only: bool) -> str:
+    """Cache-key suffix so a new field set / filter never reads an old entry."""
+    return hashlib.sha1(repr((PLAYER_FIELDS, active_only)).encode()).hexdigest()[:8]
 
 
-def fetch_players() -> Dict[str, Dict[str, Any]]:
-    """Fetch full player metadata for NFL (used for name/position lookups)."""
-    return fetch("players/nfl")
+def fetch_players(ttl: Optional[float] = None, active_only: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch NFL player metadata (used for name/position lookups).
+
+    The dump is stream-parsed keeping only utils.players.PLAYER_FIELDS
+    (see parse_players), then served from the on-disk cache and
+    revalidated at most once per ttl seconds (default
+    FANTASY_AI_PLAYERS_TTL, one day). active_only (default
+    FANTASY_AI_ACTIVE_PLAYERS_ONLY) drops inactive and teamless players.
+    """
+    if active_only is None:
+        active_only = ACTIVE_PLAYERS_ONLY
+    return fetch_cached(
+        "players/nfl",
+        f"players_nfl_{_players_variant(active_only)}",
+        PLAYERS_CACHE_TTL if ttl is None else ttl,
+        parse=lambda chunks: parse_players(chunks, active_only=active_only),
+    )
+
+
+def fetch_player_table(ttl: Optional[float] = None, active_only: Optional[bool] = None) -> PlayerTable:
+    """
+    Same data as fetch_players(), as a columnar PlayerTable.
+
+    The table is built straight from the response stream and cached on
+    disk in columnar form, so a hot load is a handful of array reads.
+    """
+    if active_only is None:
+        active_only = ACTIVE_PLAYERS_ONLY
+    return fetch_cached(
+        "players/nfl",
+        f"players_table_{_players_variant(active_only)}",
+        PLAYERS_CACHE_TTL if ttl is None else ttl,
+        parse=lambda chunks: _build_player_table(chunks, active_only),
+    )
+
+
+def _build_player_table(chunks: Iterable[bytes], active_only: bool) -> PlayerTable:
+    table = PlayerTable.from_records(iter_players(chunks, active_only=active_only))
+    table.fingerprint()  # computed once here and cached with the table (keys ROS memoization)
+    return table
 
 
 def fetch_drafts(league_id: str) -> List[Dict[str, Any]]:
@@ -148,6 +427,19 @@ def fetch_drafts(league_id: str) -> List[Dict[str, Any]]:
     return fetch(f"league/{league_id}/drafts")
 
 
+def week_locked(season: Any, week: int) -> bool:
+    """True once a (season, week) is over according to the NFL state (fetch_state)."""
+    state = fetch_state()
+    current_season = int(state.get("season") or 0)
+    current_week = int(state.get("week") or 0)
+    season = int(season or current_season)
+    return season < current_season or (season == current_season and int(week) < current_week)
+
+
 def fetch_state() -> Dict[str, Any]:
-    """Fetch global Sleeper state (current NFL week, season, etc)."""
-    return fetch("state")
\ No newline at end of file
+    """
+    Fetch global Sleeper state (current NFL week, season, etc).
+
+    Cached on disk for FANTASY_AI_STATE_TTL seconds (default 15 minutes).
+    """
+    return fetch_cached("state/nfl", "state_nfl", STATE_CACHE_TTL)
\ No newline at end of file
@@ -0,0 +1,351 @@
+"""
+fantasy_ai.utils.history
+
+Embedded SQLite history of everything the fetch layer downloads: league
+snapshots, rosters per week, matchups, transactions and projection
+snapshots. utils.fetch records each payload as it arrives, and reports
+query weeks in bulk with SQL (completed weeks' matchups, week-over-week
+changes, a player's weekly points) instead of one API call per week.
+
+Rows keep the raw JSON next to the indexed columns, so a stored week
+can stand in for the API response. Indexed on (league_id, week) (the
+primary keys), roster_id and player_id.
+
+  FANTASY_AI_HISTORY      record and query history (default true)
+  FANTASY_AI_HISTORY_DB   database path (default <cache dir>/history.sqlite3)
+
+Recording never breaks a fetch: database errors are reported (verbose
+mode) and skipped.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from fantasy_ai.utils import cache
+
+HISTORY_ENABLED = os.getenv("FANTASY_AI_HISTORY", "true").lower() == "true"
+HISTORY_DB = Path(os.getenv("FANTASY_AI_HISTORY_DB") or cache.CACHE_DIR / "history.sqlite3")
+VERBOSE = os.getenv("FANTASY_AI_VERBOSE", "false").lower() == "true"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS league_snapshots (
+    league_id  TEXT NOT NULL,
+    week       INTEGER NOT NULL,
+    season     TEXT,
+    name       TEXT,
+    fetched_at REAL NOT NULL,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (league_id, week)
+);
+CREATE TABLE IF NOT EXISTS rosters (
+    league_id  TEXT NOT NULL,
+    week       INTEGER NOT NULL,
+    roster_id  INTEGER NOT NULL,
+    owner_id   TEXT,
+    wins       INTEGER,
+    losses     INTEGER,
+    ties       INTEGER,
+    fpts       REAL,
+    fetched_at REAL NOT NULL,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (league_id, week, roster_id)
+);
+CREATE TABLE IF NOT EXISTS roster_players (
+    league_id  TEXT NOT NULL,
+    week       INTEGER NOT NULL,
+    roster_id  INTEGER NOT NULL,
+    player_id  TEXT NOT NULL,
+    starter    INTEGER NOT NULL,
+    PRIMARY KEY (league_id, week, roster_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    league_id  TEXT NOT NULL,
+    week       INTEGER NOT NULL,
+    roster_id  INTEGER NOT NULL,
+    ord        INTEGER NOT NULL,
+    matchup_id INTEGER,
+    points     REAL,
+    final      INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (league_id, week, roster_id)
+);
+CREATE TABLE IF NOT EXISTS matchup_players (
+    league_id  TEXT NOT NULL,
+    week       INTEGER NOT NULL,
+    roster_id  INTEGER NOT NULL,
+    player_id  TEXT NOT NULL,
+    points     REAL,
+    starter    INTEGER NOT NULL,
+    PRIMARY KEY (league_id, week, roster_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id TEXT PRIMARY KEY,
+    league_id      TEXT NOT NULL,
+    week           INTEGER NOT NULL,
+    type           TEXT,
+    status         TEXT,
+    status_updated INTEGER,
+    data           TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transaction_players (
+    transaction_id TEXT NOT NULL,
+    player_id      TEXT NOT NULL,
+    roster_id      INTEGER,
+    action         TEXT NOT NULL,
+    PRIMARY KEY (transaction_id, player_id, action)
+);
+CREATE TABLE IF NOT EXISTS projections (
+    season     INTEGER NOT NULL,
+    week       INTEGER NOT NULL,
+    scoring    TEXT NOT NULL,
+    player_id  TEXT NOT NULL,
+    points     REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (season, week, scoring, player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_rosters_roster ON rosters (league_id, roster_id);
+CREATE INDEX IF NOT EXISTS idx_roster_players_player ON roster_players (player_id);
+CREATE INDEX IF NOT EXISTS idx_roster_players_roster ON roster_players (league_id, roster_id);
+CREATE INDEX IF NOT EXISTS idx_matchups_roster ON matchups (league_id, roster_id);
+CREATE INDEX IF NOT EXISTS idx_matchup_players_player ON matchup_players (player_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_week ON transactions (league_id, week);
+CREATE INDEX IF NOT EXISTS idx_transaction_players_player ON transaction_players (player_id);
+CREATE INDEX IF NOT EXISTS idx_transaction_players_roster ON transaction_players (roster_id);
+CREATE INDEX IF NOT EXISTS idx_projections_player ON projections (player_id);
+"""
+
+_local = threading.local()
+_write_lock = threading.Lock()  # one writer at a time within the process
+_schema_ready: set = set()
+
+
+def connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    """This thread's connection to the history database (schema created on first use)."""
+    path = Path(path or HISTORY_DB)
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if path not in _schema_ready:
+            with _write_lock, conn:
+                conn.executescript(SCHEMA)
+            _schema_ready.add(path)
+        conns[path] = conn
+    return conn
+
+
+def _write(fn):
+    """Run a recorder inside one transaction; disabled or failing history is skipped."""
+    def wrapper(*args, **kwargs):
+        if not HISTORY_ENABLED:
+            return
+        try:
+            conn = connect()
+            with _write_lock, conn:
+                fn(conn, *args, **kwargs)
+        except (sqlite3.Error, OSError) as e:
+            if VERBOSE:
+                print(f"⚠️ History write {fn.__name__} skipped: {e}")
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+# --- Recording (called by utils.fetch) ---------------------------------------
+
+@_write
+def record_league(conn: sqlite3.Connection, league: Mapping[str, Any], week: int) -> None:
+    """League snapshot (settings, scoring, roster positions) as of a week."""
+    conn.execute(
+        "INSERT OR REPLACE INTO league_snapshots VALUES (?, ?, ?, ?, ?, ?)",
+        (str(league.get("league_id")), int(week), league.get("season"), league.get("name"),
+         time.time(), _dumps(league)),
+    )
+
+
+@_write
+def record_rosters(conn: sqlite3.Connection, league_id: str, week: int, rosters: Iterable[Mapping[str, Any]]) -> None:
+    """Rosters as of a week; replaces that week's earlier snapshot."""
+    now = time.time()
+    conn.execute("DELETE FROM roster_players WHERE league_id = ? AND week = ?", (league_id, week))
+    for r in rosters or []:
+        settings = r.get("settings") or {}
+        conn.execute(
+            "INSERT OR REPLACE INTO rosters VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (league_id, week, r.get("roster_id"), r.get("owner_id"), settings.get("wins"),
+             settings.get("losses"), settings.get("ties"), settings.get("fpts"), now, _dumps(r)),
+        )
+        starters = set(r.get("starters") or [])
+        conn.executemany(
+            "INSERT OR REPLACE INTO roster_players VALUES (?, ?, ?, ?, ?)",
+            [(league_id, week, r.get("roster_id"), str(pid), int(pid in starters))
+             for pid in dict.fromkeys((r.get("players") or []) + list(starters)) if pid],
+        )
+
+
+@_write
+def record_matchups(conn: sqlite3.Connection, league_id: str, week: int,
+                    matchups: Iterable[Mapping[str, Any]], final: bool = False) -> None:
+    """
+    A week's raw matchups; final marks a scored week that can stand in for
+    the API. A week stored as final is never overwritten by a non-final
+    fetch (e.g. a report re-reading a past week), so it stays final.
+    """
+    if not final and conn.execute(
+            "SELECT 1 FROM matchups WHERE league_id = ? AND week = ? AND final = 1 LIMIT 1",
+            (league_id, week)).fetchone():
+        return
+    now = time.time()
+    conn.execute("DELETE FROM matchup_players WHERE league_id = ? AND week = ?", (league_id, week))
+    for ord_, m in enumerate(matchups or []):
+        conn.execute(
+            "INSERT OR REPLACE INTO matchups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (league_id, week, m.get("roster_id"), ord_, m.get("matchup_id"), m.get("points"),
+             int(final), now, _dumps(m)),
+        )
+        starters = set(m.get("starters") or [])
+        points = m.get("players_points") or {}
+        conn.executemany(
+            "INSERT OR REPLACE INTO matchup_players VALUES (?, ?, ?, ?, ?, ?)",
+            [(league_id, week, m.get("roster_id"), str(pid), points.get(pid), int(pid in starters))
+             for pid in dict.fromkeys((m.get("players") or []) + list(starters)) if pid and pid != "0"],
+        )
+
+
+@_write
+def record_transactions(conn: sqlite3.Connection, league_id: str, week: int,
+                        transactions: Iterable[Mapping[str, Any]]) -> None:
+    """A week's transactions (upserted by transaction_id)."""
+    for txn in transactions or []:
+        tid = str(txn.get("transaction_id"))
+        conn.execute(
+            "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (tid, league_id, week, txn.get("type"), txn.get("status"), txn.get("status_updated"), _dumps(txn)),
+        )
+        conn.execute("DELETE FROM transaction_players WHERE transaction_id = ?", (tid,))
+        rows = [(tid, str(pid), rid, "add") for pid, rid in (txn.get("adds") or {}).items()]
+        rows += [(tid, str(pid), rid, "drop") for pid, rid in (txn.get("drops") or {}).items()]
+        conn.executemany("INSERT OR REPLACE INTO transaction_players VALUES (?, ?, ?, ?)", rows)
+
+
+@_write
+def record_projections(conn: sqlite3.Connection, season: int, week: int, scoring: str,
+                       points: Mapping[str, float]) -> None:
+    """A projection snapshot: player_id -> points under one scoring (hash or points field)."""
+    now = time.time()
+    conn.execute("DELETE FROM projections WHERE season = ? AND week = ? AND scoring = ?", (season, week, scoring))
+    conn.executemany(
+        "INSERT INTO projections VALUES (?, ?, ?, ?, ?, ?)",
+        [(season, week, scoring, pid, pts, now) for pid, pts in points.items()],
+    )
+
+
+# --- Queries -------------------------------------------------------------------
+
+def _query(sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+    if not HISTORY_ENABLED:
+        return []
+    try:
+        return connect().execute(sql, tuple(params)).fetchall()
+    except (sqlite3.Error, OSError) as e:
+        if VERBOSE:
+            print(f"⚠️ History query skipped: {e}")
+        return []
+
+
+def final_matchups(league_id: str, weeks: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    {week: raw matchups} for the given weeks that were stored as final,
+    in one query (weeks without a complete final copy are left out).
+    """
+    weeks = sorted({int(w) for w in weeks})
+    if not weeks:
+        return {}
+    rows = _query(
+        f"SELECT week, final, data FROM matchups WHERE league_id = ? AND week IN ({','.join('?' * len(weeks))}) "
+        "ORDER BY week, ord",
+        [league_id, *weeks],
+    )
+    by_week: Dict[int, List[Dict[str, Any]]] = {}
+    partial = set()
+    for row in rows:
+        if not row["final"]:
+            partial.add(row["week"])
+        by_week.setdefault(row["week"], []).append(json.loads(row["data"]))
+    return {w: ms for w, ms in by_week.items() if w not in partial}
+
+
+def week_over_week(league_id: str, week: int) -> List[Dict[str, Any]]:
+    """
+    Per roster: final points in `week` and the week before, and the change,
+    biggest gain first. Empty unless both weeks are stored as final.
+    """
+    rows = _query(
+        """
+        SELECT cur.roster_id, cur.points AS points, prev.points AS prev_points
+        FROM matchups AS cur
+        JOIN matchups AS prev
+          ON prev.league_id = cur.league_id AND prev.roster_id = cur.roster_id AND prev.week = cur.week - 1
+        WHERE cur.league_id = ? AND cur.week = ? AND cur.final = 1 AND prev.final = 1
+        ORDER BY cur.points - prev.points DESC, cur.roster_id
+        """,
+        [league_id, week],
+    )
+    return [
+        {"roster_id": r["roster_id"], "points": r["points"] or 0.0, "prev_points": r["prev_points"] or 0.0,
+         "delta": (r["points"] or 0.0) - (r["prev_points"] or 0.0)}
+        for r in rows
+    ]
+
+
+def player_movers(league_id: str, week: int, limit: int = 3) -> List[Dict[str, Any]]:
+    """
+    Starters whose points changed most from the previous week (by absolute
+    change), from the per-player points Sleeper reports in final matchups.
+    """
+    rows = _query(
+        """
+        SELECT cur.player_id, cur.roster_id, cur.points AS points, prev.points AS prev_points
+        FROM matchup_players AS cur
+        JOIN matchups AS m
+          ON m.league_id = cur.league_id AND m.week = cur.week AND m.roster_id = cur.roster_id AND m.final = 1
+        JOIN matchup_players AS prev
+          ON prev.league_id = cur.league_id AND prev.player_id = cur.player_id AND prev.week = cur.week - 1
+        WHERE cur.league_id = ? AND cur.week = ? AND cur.starter = 1
+          AND cur.points IS NOT NULL AND prev.points IS NOT NULL
+        ORDER BY ABS(cur.points - prev.points) DESC, cur.player_id
+        LIMIT ?
+        """,
+        [league_id, week, limit],
+    )
+    return [
+        {"player_id": r["player_id"], "roster_id": r["roster_id"], "points": r["points"],
+         "prev_points": r["prev_points"], "delta": r["points"] - r["prev_points"]}
+        for r in rows
+    ]
+
+
+def player_history(league_id: str, player_id: str) -> List[Dict[str, Any]]:
+    """A player's weekly roster and points in a league, oldest week first."""
+    rows = _query(
+        "SELECT week, roster_id, points, starter FROM matchup_players "
+        "WHERE league_id = ? AND player_id = ? ORDER BY week",
+        [league_id, str(player_id)],
+    )
+    return [dict(r) for r in rows]
@@ -0,0 +1,193 @@
+"""
+fantasy_ai.utils.http
+
+Shared HTTP session used by both the Sleeper fetch layer and the
+delivery channels. One place configures connection pooling, keep-alive,
+compression, timeouts and retries (bounded exponential backoff that
+honors Retry-After on 429/5xx), and records per-host latency plus the
+call / byte counters reported by utils.timing.
+
+Tunables (environment):
+  FANTASY_AI_HTTP_POOL         connections kept per host (default 10)
+  FANTASY_AI_HTTP_RETRIES      retries for connect errors / 429 / 5xx (default 3);
+                               POSTs are only retried on 429 or when the
+                               connection never opened, so a webhook or
+                               mail API call is never sent twice
+  FANTASY_AI_HTTP_BACKOFF      backoff factor in seconds (default 0.5)
+  FANTASY_AI_HTTP_BACKOFF_MAX  cap on a single backoff sleep (default 30)
+  FANTASY_AI_HTTP_TIMEOUT      default request timeout in seconds (default 10)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from fantasy_ai.utils import replay, timing
+
+HTTP_POOL_SIZE = int(os.getenv("FANTASY_AI_HTTP_POOL", "10"))
+HTTP_RETRIES = int(os.getenv("FANTASY_AI_HTTP_RETRIES", "3"))
+HTTP_BACKOFF = float(os.getenv("FANTASY_AI_HTTP_BACKOFF", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("FANTASY_AI_HTTP_BACKOFF_MAX", "30"))
+HTTP_TIMEOUT = float(os.getenv("FANTASY_AI_HTTP_TIMEOUT", "10"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_settings: Dict[str, Any] = {
+    "pool_size": HTTP_POOL_SIZE,
+    "retries": HTTP_RETRIES,
+    "backoff": HTTP_BACKOFF,
+    "backoff_max": HTTP_BACKOFF_MAX,
+    "timeout": HTTP_TIMEOUT,
+}
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_latency: Dict[str, Dict[str, float]] = {}
+_latency_lock = threading.Lock()
+
+
+class _Retry(Retry):
+    """
+    Idempotent methods retry on read errors and any RETRY_STATUSES. Other
+    methods (POST) only retry a 429, which the server rejected without
+    processing, after its Retry-After; read errors and 5xx are not retried
+    since the request may already have gone through.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if not self._is_method_retryable(method):
+            return status_code == 429 and self.total is not False
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        try:  # Discord sends fractional seconds, which urllib3 rejects
+            return max(0.0, float(retry_after))
+        except ValueError:
+            return super().parse_retry_after(retry_after)
+
+
+def _build_retry() -> Retry:
+    kwargs = dict(
+        total=_settings["retries"],
+        connect=_settings["retries"],
+        read=_settings["retries"],
+        status=_settings["retries"],
+        backoff_factor=_settings["backoff"],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # idempotent only; see _Retry
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response back so callers can raise_for_status()
+    )
+    try:
+        return _Retry(backoff_max=_settings["backoff_max"], **kwargs)
+    except TypeError:  # urllib3 < 2 has no backoff_max argument
+        retry = _Retry(**kwargs)
+        retry.BACKOFF_MAX = _settings["backoff_max"]
+        return retry
+
+
+def _record_latency(resp: requests.Response, *args, **kwargs) -> None:
+    """Response hook: accumulate per-host request count and latency."""
+    host = urlparse(resp.url).netloc
+    elapsed = resp.elapsed.total_seconds()
+    with _latency_lock:
+        stats = _latency.setdefault(host, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_settings["pool_size"],
+        pool_maxsize=_settings["pool_size"],
+        max_retries=_build_retry(),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "User-Agent": "fantasy_ai/0.1 (+requests)",
+    })
+    session.hooks["response"].append(_record_latency)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure(**overrides: Any) -> None:
+    """
+    Override session settings (pool_size, retries, backoff, backoff_max, timeout)
+    and rebuild the shared session.
+    """
+    global _session
+    unknown = set(overrides) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown HTTP settings: {sorted(unknown)}")
+    with _session_lock:
+        _settings.update(overrides)
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """
+    Issue a request through the shared session with the default timeout.
+
+    Honors FANTASY_AI_HTTP_MODE (see utils.replay): in replay mode the
+    response comes from fixtures, in record mode it is saved as one.
+    """
+    start = time.perf_counter()
+    if replay.REPLAYING:
+        resp = replay.replay(method, url, kwargs.get("headers"))
+    else:
+        kwargs.setdefault("timeout", _settings["timeout"])
+        resp = get_session().request(method, url, **kwargs)
+        if replay.RECORDING:
+            replay.record(resp, url)
+    timing.record_http(url, resp.status_code, _body_size(resp, kwargs.get("stream", False)),
+                       time.perf_counter() - start)
+    return resp
+
+
+def _body_size(resp: requests.Response, stream: bool) -> int:
+    """Bytes received: Content-Length when sent (wire size), else the read body."""
+    length = resp.headers.get("Content-Length")
+    if length and length.isdigit():
+        return int(length)
+    if stream and not getattr(resp, "_content_consumed", False):
+        return 0  # streamed without a length; not worth buffering just to count
+    return len(resp.content or b"")
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def host_latency() -> Dict[str, Dict[str, float]]:
+    """Return {host: {"count", "total", "max", "avg"}} for requests made so far."""
+    with _latency_lock:
+        return {
+            host: {**stats, "avg": stats["total"] / stats["count"] if stats["count"] else 0.0}
+            for host, stats in _latency.items()
+        }
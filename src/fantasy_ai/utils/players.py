@@ -0,0 +1,336 @@
+"""
+fantasy_ai.utils.players
+
+Streaming ingestion of the Sleeper players/nfl dump.
+
+The dump is one large JSON object keyed by player_id with dozens of
+fields per player (college, height, search metadata, news timestamps...)
+that nothing in the project reads. Instead of materializing it with
+resp.json(), the response is decoded incrementally one player at a time
+and only PLAYER_FIELDS are kept, with repeated codes (team, position,
+status) interned so thousands of players share the same string objects.
+
+PlayerTable then stores the pool column-wise for vectorized scans.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import re
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Fields any module in the project reads from a player record.
+PLAYER_FIELDS: Tuple[str, ...] = (
+    "player_id",
+    "full_name",
+    "first_name",
+    "last_name",
+    "position",
+    "fantasy_positions",
+    "team",
+    "adp",
+    "status",
+    "injury_status",
+    "active",
+)
+
+# Low-cardinality string fields worth interning.
+INTERN_FIELDS = frozenset({"position", "team", "status", "injury_status"})
+
+# Drop retired / teamless players while parsing (rostered free agents will show as "Unknown").
+ACTIVE_PLAYERS_ONLY = os.getenv("FANTASY_AI_ACTIVE_PLAYERS_ONLY", "false").lower() == "true"
+
+_WS = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def iter_object_items(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (key, value) pairs from a top-level JSON object delivered as byte chunks.
+
+    Only one member is held in decoded form at a time, so peak memory is
+    bounded by the chunk size plus the largest single value rather than
+    the whole document.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    started = False
+
+    def pending(final: bool) -> Iterator[Tuple[str, Any]]:
+        nonlocal pos, started
+        while True:
+            pos = _WS.match(buf, pos).end()
+            if pos >= len(buf):
+                return
+            if not started:
+                if buf[pos] != "{":
+                    raise ValueError("players dump is not a JSON object")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "}":
+                pos = len(buf)
+                return
+            if buf[pos] == ",":
+                pos += 1
+                continue
+            try:
+                key, end = _decoder.raw_decode(buf, pos)
+                end = _WS.match(buf, end).end()
+                if end >= len(buf) or buf[end] != ":":
+                    raise json.JSONDecodeError("expected ':'", buf, end)
+                end = _WS.match(buf, end + 1).end()
+                value, end = _decoder.raw_decode(buf, end)
+                # A bare number/literal may be cut at the chunk edge — wait for more.
+                if not final and end >= len(buf) and not isinstance(value, (dict, list, str)):
+                    return
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                return  # member spans the chunk boundary
+            pos = end
+            yield key, value
+
+    for chunk in chunks:
+        buf = buf[pos:] + utf8.decode(chunk)
+        pos = 0
+        yield from pending(final=False)
+    buf = buf[pos:] + utf8.decode(b"", final=True)
+    pos = 0
+    yield from pending(final=True)
+
+
+def project_player(pid: str, raw: Dict[str, Any], fields: Sequence[str] = PLAYER_FIELDS) -> Dict[str, Any]:
+    """Keep only the declared fields of a raw player record, interning short codes."""
+    out = {}
+    for field in fields:
+        val = raw.get(field)
+        if val is None:
+            continue
+        if field in INTERN_FIELDS and isinstance(val, str):
+            val = sys.intern(val)
+        elif field == "fantasy_positions" and isinstance(val, list):
+            val = [sys.intern(v) for v in val if isinstance(v, str)]
+        out[field] = val
+    out["player_id"] = pid
+    return out
+
+
+def iter_players(chunks: Iterable[bytes], fields: Sequence[str] = PLAYER_FIELDS,
+                 active_only: Optional[bool] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream (player_id, projected record) pairs from a players/nfl response body.
+
+    active_only (default FANTASY_AI_ACTIVE_PLAYERS_ONLY) drops players that
+    are inactive or have no NFL team.
+    """
+    if active_only is None:
+        active_only = ACTIVE_PLAYERS_ONLY
+    for pid, raw in iter_object_items(chunks):
+        if not isinstance(raw, dict):
+            continue
+        if active_only and (not raw.get("active") or not raw.get("team")):
+            continue
+        yield pid, project_player(pid, raw, fields)
+
+
+def parse_players(chunks: Iterable[bytes], fields: Sequence[str] = PLAYER_FIELDS,
+                  active_only: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+    """Stream-parse a players/nfl response body into {player_id: projected record}."""
+    return dict(iter_players(chunks, fields, active_only))
+
+
+# Low-cardinality fields stored as small integer codes in PlayerTable.
+CODE_FIELDS: Tuple[str, ...] = ("position", "team", "status", "injury_status")
+NAME_FIELDS: Tuple[str, ...] = ("full_name", "first_name", "last_name")
+
+
+class PlayerTable(Mapping):
+    """
+    Columnar, read-only player store.
+
+    Player ids live in one list with an id -> row index; positions, teams
+    and statuses are int16 codes into per-field label lists; ADP is a
+    float64 array (NaN when missing); names share one string blob indexed
+    by offsets. Full-pool scans use the column arrays directly, while the
+    Mapping interface (players[pid], players.get(pid, {}), iteration)
+    keeps dict-of-dicts callers working by building a small dict per
+    requested row.
+    """
+
+    def __init__(self, ids: List[str], codes: Dict[str, np.ndarray], labels: Dict[str, List[str]],
+                 adp: np.ndarray, active: np.ndarray, fantasy_mask: np.ndarray,
+                 names: str, name_offsets: np.ndarray):
+        self.ids = ids
+        self.index = {pid: i for i, pid in enumerate(ids)}
+        self.codes = codes
+        self.labels = labels
+        self.adp = adp
+        self.active = active
+        self.fantasy_mask = fantasy_mask
+        self._names = names
+        self._name_offsets = name_offsets
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        del state["index"]  # rebuilt on load; cheaper than pickling a dict
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.index = {pid: i for i, pid in enumerate(self.ids)}
+
+    @classmethod
+    def from_records(cls, records: Union[Mapping, Iterable[Tuple[str, Dict[str, Any]]]]) -> "PlayerTable":
+        """Build a table from {player_id: record} or an iterable of (player_id, record) pairs."""
+        items = records.items() if isinstance(records, Mapping) else records
+        ids: List[str] = []
+        labels: Dict[str, List[str]] = {f: [] for f in CODE_FIELDS}
+        lookup: Dict[str, Dict[str, int]] = {f: {} for f in CODE_FIELDS}
+        codes: Dict[str, List[int]] = {f: [] for f in CODE_FIELDS}
+        adp: List[float] = []
+        active: List[int] = []
+        fantasy: List[int] = []
+        names: List[str] = []
+        offsets = [0]
+
+        def code(field: str, val: Any) -> int:
+            if not isinstance(val, str):
+                return -1
+            c = lookup[field].get(val)
+            if c is None:
+                c = lookup[field][val] = len(labels[field])
+                labels[field].append(sys.intern(val))
+            return c
+
+        for pid, rec in items:
+            ids.append(pid)
+            for f in CODE_FIELDS:
+                codes[f].append(code(f, rec.get(f)))
+            val = rec.get("adp")
+            adp.append(float(val) if isinstance(val, (int, float)) else np.nan)
+            val = rec.get("active")
+            active.append(-1 if val is None else int(bool(val)))
+            mask = 0
+            for fp in rec.get("fantasy_positions") or ():
+                mask |= 1 << code("position", fp)
+            fantasy.append(mask)
+            for f in NAME_FIELDS:
+                name = rec.get(f) or ""
+                names.append(name)
+                offsets.append(offsets[-1] + len(name))
+
+        return cls(
+            ids=ids,
+            codes={f: np.array(v, dtype=np.int16) for f, v in codes.items()},
+            labels=labels,
+            adp=np.array(adp, dtype=np.float64),
+            active=np.array(active, dtype=np.int8),
+            fantasy_mask=np.array(fantasy, dtype=np.uint64),
+            names="".join(names),
+            name_offsets=np.array(offsets, dtype=np.int64),
+        )
+
+    # --- Mapping view --------------------------------------------------------
+
+    def __getitem__(self, pid: str) -> Dict[str, Any]:
+        return self.row(self.index[pid])
+
+    def __contains__(self, pid: object) -> bool:
+        return pid in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def name(self, i: int, field: str = "full_name") -> str:
+        """Return a name field for row i ('' if missing)."""
+        j = 3 * i + NAME_FIELDS.index(field)
+        return self._names[self._name_offsets[j]:self._name_offsets[j + 1]]
+
+    def label(self, field: str, i: int) -> Optional[str]:
+        """Return the decoded code field (position, team, ...) for row i."""
+        c = self.codes[field][i]
+        return self.labels[field][c] if c >= 0 else None
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Materialize row i as a fresh dict shaped like a players/nfl record."""
+        rec: Dict[str, Any] = {"player_id": self.ids[i]}
+        for f in NAME_FIELDS:
+            name = self.name(i, f)
+            if name:
+                rec[f] = name
+        for f in CODE_FIELDS:
+            val = self.label(f, i)
+            if val is not None:
+                rec[f] = val
+        if not np.isnan(self.adp[i]):
+            rec["adp"] = float(self.adp[i])
+        if self.active[i] >= 0:
+            rec["active"] = bool(self.active[i])
+        mask = int(self.fantasy_mask[i])
+        if mask:
+            rec["fantasy_positions"] = [p for b, p in enumerate(self.labels["position"]) if mask >> b & 1]
+        return rec
+
+    def fingerprint(self) -> str:
+        """
+        Content hash of the whole table (ids, codes, labels, numeric columns,
+        names). Tables are read-only, so it is computed once and kept.
+        """
+        fp = self.__dict__.get("_fingerprint")
+        if fp is None:
+            h = hashlib.sha1()
+            h.update("\x1f".join(self.ids).encode("utf-8"))
+            for f in CODE_FIELDS:
+                h.update("\x1f".join(self.labels[f]).encode("utf-8"))
+                h.update(self.codes[f].tobytes())
+            for arr in (self.adp, self.active, self.fantasy_mask, self._name_offsets):
+                h.update(arr.tobytes())
+            h.update(self._names.encode("utf-8"))
+            fp = self._fingerprint = h.hexdigest()
+        return fp
+
+    # --- Column helpers ------------------------------------------------------
+
+    def rows_of(self, pids: Iterable[Any]) -> np.ndarray:
+        """Row numbers for the given player ids (unknown ids are skipped)."""
+        index = self.index
+        return np.fromiter((index[p] for p in pids if p in index), dtype=np.int64)
+
+    def member_mask(self, pids: Iterable[Any]) -> np.ndarray:
+        """Boolean mask that is True for rows whose id is in pids."""
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[self.rows_of(pids)] = True
+        return mask
+
+    def label_mask(self, field: str, values: Iterable[Optional[str]]) -> np.ndarray:
+        """Boolean mask of rows whose code field is one of values (None matches missing)."""
+        lookup = {label: c for c, label in enumerate(self.labels[field])}
+        wanted = [-1 if v is None else lookup[v] for v in values if v is None or v in lookup]
+        return np.isin(self.codes[field], np.array(wanted, dtype=np.int16))
+
+    def column_from(self, values: Mapping, default: float = 0.0) -> np.ndarray:
+        """Align a {player_id: number} mapping to rows as a float64 array."""
+        out = np.full(len(self.ids), default, dtype=np.float64)
+        index = self.index
+        for pid, val in values.items():
+            i = index.get(str(pid))
+            if i is not None and val is not None:
+                out[i] = val
+        return out
+
+
+def as_player_table(players: Union[PlayerTable, Mapping]) -> PlayerTable:
+    """Return players as a PlayerTable, converting a dict-of-dicts if needed."""
+    if isinstance(players, PlayerTable):
+        return players
+    return PlayerTable.from_records(players or {})
@@ -0,0 +1,180 @@
+"""
+fantasy_ai.utils.replay
+
+Record/replay support for the HTTP layer, for deterministic offline runs,
+regression tests and profiling without live Sleeper access.
+
+  FANTASY_AI_HTTP_MODE=record   every GET response is saved as a fixture
+  FANTASY_AI_HTTP_MODE=replay   GETs are served from fixtures (no network);
+                                POSTs (delivery) are not sent
+  FANTASY_AI_FIXTURES_DIR       fixture directory (default <repo>/fixtures/http)
+
+Fixtures are keyed by the full request URL. They can also be served by
+a small local HTTP server, optionally with artificial latency, so the
+real network path (pooling, retries, streaming) gets exercised too:
+
+  python -m fantasy_ai.utils.replay serve --port 8808 --latency-ms 50
+  SLEEPER_API_BASE=http://127.0.0.1:8808/v1 \
+  SLEEPER_PROJECTIONS_BASE=http://127.0.0.1:8808/projections/nfl \
+      python src/fantasy_ai/cli.py digest
+"""
+
+import argparse
+import datetime
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import unquote, urlsplit
+
+import requests
+
+HTTP_MODE = os.getenv("FANTASY_AI_HTTP_MODE", "live").lower()
+FIXTURES_DIR = Path(os.getenv("FANTASY_AI_FIXTURES_DIR") or Path(__file__).resolve().parents[3] / "fixtures" / "http")
+
+RECORDING = HTTP_MODE == "record"
+REPLAYING = HTTP_MODE == "replay"
+
+# Response headers worth keeping in a fixture (validators matter for the disk cache).
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+_write_lock = threading.Lock()
+
+
+def _path_and_query(url: str) -> str:
+    parts = urlsplit(unquote(url))
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def fixture_path(url: str) -> Path:
+    """Fixture file for a URL: readable slug of the path plus a hash of the full URL."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", urlsplit(url).path).strip("_")[:80]
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    return FIXTURES_DIR / f"{slug}-{digest}.json"
+
+
+def record(resp: requests.Response, url: Optional[str] = None) -> None:
+    """
+    Save a successful GET response as a fixture.
+
+    url should be the URL as the caller passed it (resp.url is the
+    percent-encoded form, which would not match on replay).
+    """
+    if resp.request.method != "GET" or resp.status_code != 200:
+        return
+    url = url or resp.url
+    fixture = {
+        "url": url,
+        "status": resp.status_code,
+        "headers": {h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers},
+        "body": resp.content.decode(resp.encoding or "utf-8"),
+    }
+    path = fixture_path(url)
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(fixture), encoding="utf-8")
+
+
+def load_fixture(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(fixture_path(url).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def replay(method: str, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """Build a Response for a request from fixtures instead of the network."""
+    resp = requests.Response()
+    resp.url = url
+    resp.encoding = "utf-8"
+    resp.elapsed = datetime.timedelta(0)
+    resp.request = requests.Request(method, url, headers=headers).prepare()
+
+    if method != "GET":
+        # Never deliver anything while replaying
+        print(f"[REPLAY] suppressed {method} {url}")
+        return _with_body(resp, 204, b"")
+
+    fixture = load_fixture(url)
+    if fixture is None:
+        raise requests.ConnectionError(f"No replay fixture for {url} in {FIXTURES_DIR}")
+
+    resp.headers.update(fixture.get("headers") or {})
+    etag = fixture.get("headers", {}).get("ETag")
+    if etag and (headers or {}).get("If-None-Match") == etag:
+        return _with_body(resp, 304, b"")
+    return _with_body(resp, fixture.get("status", 200), fixture["body"].encode("utf-8"))
+
+
+def _with_body(resp: requests.Response, status: int, body: bytes) -> requests.Response:
+    """Fill in status and an already-read body (so .json(), iter_content() and close() all work)."""
+    resp.status_code = status
+    resp._content = body
+    resp._content_consumed = True
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+def serve(port: int = 8808, latency_ms: float = 0.0, host: str = "127.0.0.1") -> None:
+    """Serve recorded fixtures over HTTP, matching on path + query (host is ignored)."""
+    index = {}
+    for path in FIXTURES_DIR.glob("*.json"):
+        try:
+            fixture = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        index[_path_and_query(fixture["url"])] = fixture
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if latency_ms:
+                time.sleep(latency_ms / 1000.0)
+            fixture = index.get(_path_and_query(self.path))
+            if fixture is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            fixture_headers = fixture.get("headers") or {}
+            if fixture_headers.get("ETag") and self.headers.get("If-None-Match") == fixture_headers["ETag"]:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = fixture["body"].encode("utf-8")
+            self.send_response(fixture.get("status", 200))
+            for name, value in fixture_headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            if os.getenv("FANTASY_AI_VERBOSE", "false").lower() == "true":
+                super().log_message(fmt, *args)
+
+    print(f"📼 Serving {len(index)} fixtures from {FIXTURES_DIR} on http://{host}:{port} "
+          f"(latency {latency_ms:.0f} ms)")
+    ThreadingHTTPServer((host, port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fantasy AI HTTP fixture server")
+    parser.add_argument("command", choices=["serve"])
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    args = parser.parse_args()
+    serve(port=args.port, latency_ms=args.latency_ms, host=args.host)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+fantasy_ai.utils.timing
+
+Lightweight run instrumentation: wall time per report stage and HTTP
+call / byte / latency counters fed by utils.http.
+
+Stages and counters are always collected (a few perf_counter calls);
+they are only printed and written out when timings are enabled with
+--timings on the CLI, FANTASY_AI_TIMINGS=true or FANTASY_AI_VERBOSE=true.
+The summary is appended as one JSON line per run to
+FANTASY_AI_TIMINGS_LOG (default logs/timings.jsonl).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+TIMINGS_LOG = Path(os.getenv("FANTASY_AI_TIMINGS_LOG") or Path(__file__).resolve().parents[3] / "logs" / "timings.jsonl")
+
+_enabled = (
+    os.getenv("FANTASY_AI_TIMINGS", "false").lower() == "true"
+    or os.getenv("FANTASY_AI_VERBOSE", "false").lower() == "true"
+)
+_lock = threading.Lock()
+_local = threading.local()
+_run_started = time.perf_counter()
+_stages: List[Dict[str, Any]] = []
+_http: Dict[str, Any] = {"calls": 0, "bytes": 0, "latency_s": 0.0, "errors": 0, "by_host": {}}
+
+
+def enable(on: bool = True) -> None:
+    """Turn timing output on (e.g. from the --timings CLI flag)."""
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Clear all stages and counters (start of a new run in a long-lived process)."""
+    global _run_started
+    with _lock:
+        _run_started = time.perf_counter()
+        _stages.clear()
+        _http.update({"calls": 0, "bytes": 0, "latency_s": 0.0, "errors": 0, "by_host": {}})
+
+
+def record_http(url: str, status: int, nbytes: int, seconds: float) -> None:
+    """Count one HTTP exchange (called by utils.http for every request)."""
+    host = urlparse(url).netloc
+    with _lock:
+        _http["calls"] += 1
+        _http["bytes"] += nbytes
+        _http["latency_s"] += seconds
+        if status >= 400:
+            _http["errors"] += 1
+        h = _http["by_host"].setdefault(host, {"calls": 0, "bytes": 0, "latency_s": 0.0})
+        h["calls"] += 1
+        h["bytes"] += nbytes
+        h["latency_s"] += seconds
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a named section. Nested stages are recorded as "outer > inner".
+    HTTP calls/bytes made while the stage runs are attributed to it
+    (approximate when other threads are fetching at the same time).
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(name)
+    full_name = " > ".join(stack)
+    with _lock:
+        calls0, bytes0 = _http["calls"], _http["bytes"]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        with _lock:
+            _stages.append({
+                "stage": full_name,
+                "seconds": round(elapsed, 4),
+                "http_calls": _http["calls"] - calls0,
+                "http_bytes": _http["bytes"] - bytes0,
+            })
+        if _enabled:
+            print(f"⏱️ {full_name}: {elapsed * 1000:.1f} ms")
+
+
+def summary(**extra: Any) -> Dict[str, Any]:
+    """Machine-readable summary of the run so far."""
+    with _lock:
+        http = {
+            **{k: v for k, v in _http.items() if k != "by_host"},
+            "latency_s": round(_http["latency_s"], 4),
+            "by_host": {h: {**v, "latency_s": round(v["latency_s"], 4)} for h, v in _http["by_host"].items()},
+        }
+        return {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **extra,
+            "total_s": round(time.perf_counter() - _run_started, 4),
+            "stages": list(_stages),
+            "http": http,
+        }
+
+
+def write_summary(path: Optional[Path] = None, **extra: Any) -> Optional[Dict[str, Any]]:
+    """If timings are enabled, append the run summary as a JSON line and print a short recap."""
+    if not _enabled:
+        return None
+    data = summary(**extra)
+    path = Path(path or TIMINGS_LOG)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(data) + "\n")
+    http = data["http"]
+    print(
+        f"⏱️ Total {data['total_s']:.2f}s — {http['calls']} HTTP calls, "
+        f"{http['bytes'] / 1024:.0f} KB, {http['latency_s']:.2f}s network time → {path}"
+    )
+    return data
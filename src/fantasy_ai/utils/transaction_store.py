@@ -0,0 +1,98 @@
+"""
+fantasy_ai.utils.transaction_store
+
+Incremental transaction ingestion for a league.
+
+Sleeper serves transactions one week (leg) at a time and has no "since"
+filter, so the store keeps every week it has seen in the disk cache
+(utils.cache) and only refetches weeks that are still open. Each fetch
+is merged into the stored week by transaction_id: new transactions are
+appended, and known ones are replaced only when their status_updated
+moved forward (e.g. a pending waiver that completed). Once a week has
+been fetched after it went final it is closed and never requested
+again, so a season-long view costs one request per open week. The
+league's file lock is only held to merge and write, never across the
+downloads.
+
+  FANTASY_AI_TRANSACTION_STORE   persist transactions (default true)
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, List
+
+from fantasy_ai.utils import cache
+from fantasy_ai.utils.fetch import fetch_concurrently, fetch_transactions
+
+TRANSACTION_STORE = os.getenv("FANTASY_AI_TRANSACTION_STORE", "true").lower() == "true"
+
+
+def _stamp(txn: Dict[str, Any]) -> tuple:
+    return (txn.get("status_updated") or 0, str(txn.get("transaction_id") or ""))
+
+
+def merge_week(week_state: Dict[str, Any], fetched: List[Dict[str, Any]]) -> int:
+    """
+    Merge one fetch into a stored week; returns how many transactions
+    were new or updated. Order follows the latest fetch, with anything
+    only the store still knows kept at the end.
+    """
+    stored: Dict[str, Dict[str, Any]] = week_state.setdefault("txns", {})
+    changed = 0
+    merged: Dict[str, Dict[str, Any]] = {}
+    for txn in fetched or []:
+        tid = str(txn.get("transaction_id"))
+        old = stored.get(tid)
+        if old is None or _stamp(txn) > _stamp(old):
+            changed += 1
+            merged[tid] = txn
+        else:
+            merged[tid] = old
+    for tid, txn in stored.items():
+        merged.setdefault(tid, txn)
+
+    week_state["txns"] = merged
+    return changed
+
+
+class TransactionStore:
+    """
+    Persisted transactions of one league, week by week.
+
+    sync(weeks, week_final) returns {week: [transactions]} for the asked
+    weeks, fetching only the open ones (weeks not closed yet).
+    """
+
+    def __init__(self, league_id: str):
+        self.league_id = league_id
+        self.key = f"transactions_{league_id}"
+
+    def _load(self) -> Dict[int, Dict[str, Any]]:
+        return cache.load(self.key) or {}
+
+    def sync(self, weeks: Iterable[int], week_final: Callable[[int], bool]) -> Dict[int, List[Dict[str, Any]]]:
+        weeks = [int(w) for w in weeks]
+        state = self._load()  # cache writes are atomic renames, so reading needs no lock
+        open_weeks = [w for w in weeks if not state.get(w, {}).get("closed")]
+        if not open_weeks:
+            return {w: list(state[w]["txns"].values()) for w in weeks}
+
+        fetched = fetch_concurrently({
+            str(w): (lambda w=w: fetch_transactions(self.league_id, w)) for w in open_weeks
+        })
+        final = {w: week_final(w) for w in open_weeks}
+
+        with cache.lock(self.key):
+            state = self._load()  # another process may have synced meanwhile; merging is idempotent
+            dirty = False
+            for w in open_weeks:
+                week_state = state.setdefault(w, {"closed": False, "txns": {}})
+                if week_state.get("closed"):
+                    continue
+                if merge_week(week_state, fetched[str(w)]):
+                    dirty = True
+                if final[w]:
+                    week_state["closed"] = dirty = True
+            if dirty:
+                cache.store(self.key, state, {"league_id": self.league_id})
+
+        return {w: list(state.get(w, {}).get("txns", {}).values()) for w in weeks}
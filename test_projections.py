@@ -1,13 +1,15 @@
-import requests, json
+import json
 
+from fantasy_ai.utils.fetch import SLEEPER_PROJECTIONS_BASE, fetch, fetch_state
+
+# Goes through utils.fetch so FANTASY_AI_HTTP_MODE=replay works offline
+season = fetch_state().get("season") or "2025"
 week = 3
-url = f"https://api.sleeper.com/projections/nfl/2025/{week}?season_type=regular&position[]=DEF&position[]=FLEX&position[]=K&position[]=QB&position[]=RB&position[]=SUPER_FLEX&position[]=TE&position[]=WR&order_by=ppr"
+url = f"{SLEEPER_PROJECTIONS_BASE}/{season}/{week}?season_type=regular&position[]=DEF&position[]=FLEX&position[]=K&position[]=QB&position[]=RB&position[]=SUPER_FLEX&position[]=TE&position[]=WR&order_by=ppr"
 
-resp = requests.get(url)
-resp.raise_for_status()
-data = resp.json()
+data = fetch(url)
 
 print(f"Type: {type(data)}, length: {len(data)}")
 if isinstance(data, list) and data:
     print("Sample keys:", list(data[0].keys()))
-    print(json.dumps(data[0], indent=2)[:500])
\ No newline at end of file
+    print(json.dumps(data[0], indent=2)[:500])
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from fantasy_ai.daemon import CronSchedule, Daemon, parse_jobs
+
+
+def _brute_next(expr, after):
+    """Minute-by-minute reference for CronSchedule.next_after."""
+    s = CronSchedule(expr)
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(60 * 24 * 400):
+        if (t.minute in s.minutes and t.hour in s.hours and t.month in s.months and s._day_matches(t)):
+            return t
+        t += timedelta(minutes=1)
+    raise AssertionError("no match within 400 days")
+
+
+@pytest.mark.parametrize("expr, after, expected", [
+    ("0 9 * * 2", datetime(2026, 10, 17, 12, 0), datetime(2026, 10, 20, 9, 0)),      # Saturday -> Tuesday
+    ("0 9 * * 2", datetime(2026, 10, 20, 9, 0), datetime(2026, 10, 27, 9, 0)),       # strictly after
+    ("*/15 * * * *", datetime(2026, 1, 1, 10, 7, 30), datetime(2026, 1, 1, 10, 15)),
+    ("30 8-10/2 * * *", datetime(2026, 1, 1, 8, 31), datetime(2026, 1, 1, 10, 30)),
+    ("0 0 1 * *", datetime(2026, 12, 15), datetime(2027, 1, 1)),
+    ("0 12 * * 7", datetime(2026, 10, 17), datetime(2026, 10, 18, 12, 0)),            # 7 = Sunday
+    ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29)),
+    ("0 6 13 * 5", datetime(2026, 10, 1), datetime(2026, 10, 2, 6, 0)),              # day OR weekday
+])
+def test_next_after(expr, after, expected):
+    assert CronSchedule(expr).next_after(after) == expected
+
+
+@pytest.mark.parametrize("expr", ["0 9 * * 2", "*/7 3,15 * * 1-5", "5 0 1,15 * *", "0 6 13 * 5", "59 23 31 * *"])
+def test_next_after_matches_minute_scan(expr):
+    after = datetime(2026, 10, 17, 13, 37)
+    for _ in range(5):
+        want = _brute_next(expr, after)
+        assert CronSchedule(expr).next_after(after) == want
+        after = want
+
+
+@pytest.mark.parametrize("expr", ["0 9 * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "* * * 13 *", "5-1 * * * *"])
+def test_invalid_expressions(expr):
+    with pytest.raises(ValueError):
+        CronSchedule(expr)
+
+
+def test_never_firing_expression():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 30 2 *").next_after(datetime(2026, 1, 1))
+
+
+def test_parse_jobs():
+    jobs = parse_jobs(["digest=0 9 * * 2", "strategy=off"])
+    assert [(command, s.expr) for command, s in jobs] == [("digest", "0 9 * * 2")]
+    with pytest.raises(ValueError):
+        parse_jobs(["digest 0 9 * * 2"])
+
+
+def test_tick_runs_due_jobs_and_refreshes():
+    now = [datetime(2026, 10, 20, 8, 59)]
+    ran, refreshed = [], []
+
+    class Ctx:
+        league_id, week = "L", 7
+
+        def refresh(self, *groups):
+            refreshed.append(groups)
+
+        def prefetch(self, week):
+            pass
+
+        ros_scores = None
+
+        def standings_for(self):
+            pass
+
+    daemon = Daemon([Ctx()], parse_jobs(["digest=0 9 * * 2"]), lambda command, ctx: ran.append(command),
+                    intervals={"league": 300}, clock=lambda: now[0])
+    daemon.tick()
+    assert refreshed == [("league",)] and ran == []
+
+    now[0] = datetime(2026, 10, 20, 9, 0)
+    next_due = daemon.tick()
+    assert ran == ["digest"]
+    assert daemon.next_run[0] == datetime(2026, 10, 27, 9, 0)
+    assert next_due == datetime(2026, 10, 20, 9, 4)
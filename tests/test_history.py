@@ -0,0 +1,34 @@
+from fantasy_ai.utils import history
+
+
+def _matchups(points):
+    return [
+        {"roster_id": 1, "matchup_id": 1, "points": points, "starters": ["a"], "players": ["a", "b"],
+         "players_points": {"a": points, "b": 0.0}},
+        {"roster_id": 2, "matchup_id": 1, "points": 90.0, "starters": ["c"], "players": ["c"],
+         "players_points": {"c": 90.0}},
+    ]
+
+
+def test_non_final_fetch_keeps_final_week(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "HISTORY_ENABLED", True)
+    monkeypatch.setattr(history, "HISTORY_DB", tmp_path / "history.sqlite3")
+
+    history.record_matchups("L", 3, _matchups(101.5), final=True)
+    assert list(history.final_matchups("L", [3])) == [3]
+
+    history.record_matchups("L", 3, _matchups(0.0))
+    stored = history.final_matchups("L", [3])
+    assert list(stored) == [3]
+    assert stored[3][0]["points"] == 101.5
+
+
+def test_non_final_week_is_not_final(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "HISTORY_ENABLED", True)
+    monkeypatch.setattr(history, "HISTORY_DB", tmp_path / "history.sqlite3")
+
+    history.record_matchups("L", 4, _matchups(12.0))
+    assert history.final_matchups("L", [4]) == {}
+
+    history.record_matchups("L", 4, _matchups(120.0), final=True)
+    assert history.final_matchups("L", [4])[4][0]["points"] == 120.0
@@ -0,0 +1,25 @@
+import pytest
+
+from fantasy_ai.utils import http
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504, 429])
+def test_get_retries_server_errors(status):
+    assert http._build_retry().is_retry("GET", status)
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_post_does_not_retry_server_errors(status):
+    assert not http._build_retry().is_retry("POST", status)
+
+
+def test_post_retries_rate_limit():
+    assert http._build_retry().is_retry("POST", 429, has_retry_after=True)
+
+
+def test_post_read_errors_are_not_retryable():
+    assert not http._build_retry()._is_method_retryable("POST")
+
+
+def test_fractional_retry_after():
+    assert http._build_retry().parse_retry_after("0.25") == 0.25
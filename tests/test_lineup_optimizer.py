@@ -0,0 +1,60 @@
+import itertools
+import random
+
+import pytest
+
+from fantasy_ai.analysis.lineup_optimizer import _assign, best_lineup, slot_accepts
+
+
+def _brute_assign_cost(cost):
+    n, m = len(cost), len(cost[0])
+    return min(sum(cost[i][cols[i]] for i in range(n)) for cols in itertools.permutations(range(m), n))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_assign_matches_brute_force(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 5)
+    m = rng.randint(n, 6)
+    cost = [[rng.choice([0.0, -rng.uniform(0, 30)]) for _ in range(m)] for _ in range(n)]
+
+    cols = _assign(cost)
+    assert len(set(cols)) == n and all(0 <= c < m for c in cols)
+    assert sum(cost[i][c] for i, c in enumerate(cols)) == pytest.approx(_brute_assign_cost(cost))
+
+
+SLOTS = ["QB", "RB", "WR", "TE", "FLEX", "SUPER_FLEX"]
+POSITIONS = [frozenset({"QB"}), frozenset({"RB"}), frozenset({"WR"}), frozenset({"TE"}),
+             frozenset({"RB", "WR"}), frozenset({"K"})]
+
+
+def _brute_lineup_points(pool, slots, eligible_at, pts):
+    best = 0.0
+    options = [[None] + [pid for pid in pool if slot_accepts(s, eligible_at[pid])] for s in slots]
+    for pick in itertools.product(*options):
+        chosen = [pid for pid in pick if pid]
+        if len(chosen) == len(set(chosen)):
+            best = max(best, sum(pts[pid] for pid in chosen))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_best_lineup_matches_brute_force(seed):
+    rng = random.Random(seed)
+    pool = [f"p{i}" for i in range(rng.randint(3, 8))]
+    eligible_at = {pid: rng.choice(POSITIONS) for pid in pool}
+    pts = {pid: round(rng.uniform(0, 25), 1) for pid in pool}
+
+    lineup = best_lineup(pool, SLOTS, eligible_at, pts)
+    assert [slot for slot, _, _ in lineup] == SLOTS
+    starters = [pid for _, pid, _ in lineup if pid]
+    assert len(starters) == len(set(starters))
+    assert all(slot_accepts(slot, eligible_at[pid]) for slot, pid, _ in lineup if pid)
+    assert sum(p for _, _, p in lineup) == pytest.approx(_brute_lineup_points(pool, SLOTS, eligible_at, pts))
+
+
+def test_best_lineup_keeps_current_starter_on_ties():
+    eligible_at = {"a": frozenset({"WR"}), "b": frozenset({"WR"})}
+    pts = {"a": 10.0, "b": 10.0}
+    assert best_lineup(["a", "b"], ["WR"], eligible_at, pts, keep={"b"})[0][1] == "b"
+    assert best_lineup(["a", "b"], ["WR"], eligible_at, pts, keep={"a"})[0][1] == "a"
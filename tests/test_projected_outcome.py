@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from fantasy_ai.analysis.projected_outcome import PERCENTILES, _draw, _lineup_params, simulate_weekly_matchup
+
+PLAYERS = {
+    "qb1": {"position": "QB"}, "rb1": {"position": "RB"}, "wr1": {"position": "WR"},
+    "qb2": {"position": "QB"}, "rb2": {"position": "RB"}, "wr2": {"position": "WR"},
+    "k1": {"position": "K"}, "def1": {"position": "DEF"}, "k2": {"position": "K"}, "def2": {"position": "DEF"},
+}
+PROJ = {"qb1": 20.0, "rb1": 14.0, "wr1": 12.0, "qb2": 20.0, "rb2": 14.0, "wr2": 12.0,
+        "k1": 8.0, "def1": 7.0, "k2": 8.0, "def2": 7.0}
+
+
+def _percentiles_ordered(p):
+    values = [p[f"p{q}"] for q in PERCENTILES]
+    return values == sorted(values)
+
+
+def test_symmetric_matchup_is_a_coin_flip():
+    result = simulate_weekly_matchup(["qb1", "rb1", "wr1", "k1", "def1"], ["qb2", "rb2", "wr2", "k2", "def2"],
+                                     players=PLAYERS, player_proj_map=PROJ, trials=40000, seed=5)
+    assert result["my_score"] == result["opp_score"] == 61.0
+    assert result["win_prob"] == pytest.approx(50.0, abs=1.5)
+    assert result["margin_percentiles"]["p50"] == pytest.approx(0.0, abs=1.0)
+    for key in ("my_percentiles", "opp_percentiles", "margin_percentiles"):
+        assert _percentiles_ordered(result[key])
+
+
+def test_favorite_and_reproducibility():
+    args = (["qb1", "rb1", "wr1"], ["k2", "def2"])
+    result = simulate_weekly_matchup(*args, players=PLAYERS, player_proj_map=PROJ, trials=5000, seed=9)
+    assert result["win_prob"] > 90
+    assert result["upset_prob"] == pytest.approx(100 - result["win_prob"], abs=0.1)
+    assert simulate_weekly_matchup(*args, players=PLAYERS, player_proj_map=PROJ, trials=5000, seed=9) == result
+
+
+def test_zero_mean_lineups_use_the_normal_branch():
+    zero = {pid: 0.0 for pid in PROJ}
+    means, sds, is_gamma = _lineup_params(["k1", "def1", "wr1"], zero, PLAYERS)
+    assert not is_gamma.any()  # a zero-mean WR cannot be a gamma draw (shape 0/0)
+    assert (sds > 0).all()
+
+    totals = _draw(np.random.default_rng(1), means, sds, is_gamma, 1000)
+    assert np.isfinite(totals).all()
+
+    result = simulate_weekly_matchup(["k1", "def1"], ["k2", "def2"], players=PLAYERS, player_proj_map=zero,
+                                     trials=2000, seed=1)
+    assert all(np.isfinite(v) for k, v in result.items() if isinstance(v, float))
+    assert all(np.isfinite(v) for k in ("my_percentiles", "margin_percentiles") for v in result[k].values())
+    assert _percentiles_ordered(result["my_percentiles"])
+    assert result["win_prob"] == pytest.approx(50.0, abs=4)
+
+
+def test_empty_lineups():
+    result = simulate_weekly_matchup([], ["0", None], player_proj_map={}, trials=100, seed=1)
+    assert result["my_score"] == result["opp_score"] == 0.0
+    assert result["win_prob"] == 50.0 and result["upset_prob"] == 0.0
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from fantasy_ai.analysis import season_forecaster
+from fantasy_ai.analysis.season_forecaster import _simulate_batch, playoff_settings, round_weeks
+
+
+def _model(means, sds=None, wins=None, games=(), playoff_teams=4, reseed=False, playoff_round_type=0,
+           divisions=()):
+    n = len(means)
+    return {
+        "mean": np.array(means, dtype=float),
+        "sd": np.array(sds or [10.0] * n, dtype=float),
+        "wins": np.array(wins or [0.0] * n, dtype=float),
+        "points_for": np.zeros(n),
+        "games": np.array(games, dtype=np.int64).reshape(-1, 2),
+        "divisions": [np.array(m) for m in divisions],
+        "playoff_teams": playoff_teams,
+        "reseed": reseed,
+        "playoff_round_type": playoff_round_type,
+    }
+
+
+def test_playoff_settings_reads_round_type():
+    league = {"settings": {"playoff_teams": 4, "playoff_round_type": 1, "playoff_type": 0}}
+    assert playoff_settings(league)["playoff_round_type"] == 1
+    assert playoff_settings({"settings": {"playoff_type": 1}})["playoff_round_type"] == 0
+
+
+@pytest.mark.parametrize("round_type, weeks", [(0, [1, 1]), (1, [1, 2]), (2, [2, 2])])
+def test_round_lengths_in_bracket(monkeypatch, round_type, weeks):
+    seen = []
+
+    def spy(playoff_round_type, slots_left):
+        seen.append(round_weeks(playoff_round_type, slots_left))
+        return seen[-1]
+
+    monkeypatch.setattr(season_forecaster, "round_weeks", spy)
+    _simulate_batch(_model([100, 95, 90, 85], playoff_round_type=round_type), 10, (1, 0))
+    assert seen == weeks  # semifinal, then final
+
+
+def _league_teams(n=4):
+    teams = {rid: {"wins": 0, "losses": 0, "ties": 0, "points_for": 0.0, "mean": 100.0 + 5 * rid, "sd": 20.0}
+             for rid in range(1, n + 1)}
+    schedule = [(1, 2), (3, 4), (1, 3), (2, 4), (1, 4), (2, 3)]
+    return teams, schedule
+
+
+def test_results_do_not_depend_on_workers():
+    teams, schedule = _league_teams()
+    settings = {"playoff_teams": 2, "reseed": False, "playoff_round_type": 0}
+    one = season_forecaster.simulate_season(teams, schedule, settings, trials=30000, seed=7, workers=1)
+    many = season_forecaster.simulate_season(teams, schedule, settings, trials=30000, seed=7, workers=4)
+    assert one == many
+
+
+def test_bracket_order():
+    assert season_forecaster.bracket_order(1) == [0]
+    assert season_forecaster.bracket_order(4) == [0, 3, 1, 2]
+    assert season_forecaster.bracket_order(8) == [0, 7, 3, 4, 1, 6, 2, 5]
+
+
+@pytest.mark.parametrize("playoff_teams, byes", [(2, 0), (3, 1), (4, 0)])
+@pytest.mark.parametrize("reseed", [False, True])
+def test_odds_sum_to_bracket_totals(playoff_teams, byes, reseed):
+    teams, schedule = _league_teams()
+    settings = {"playoff_teams": playoff_teams, "reseed": reseed, "playoff_round_type": 1}
+    result = season_forecaster.simulate_season(teams, schedule, settings, trials=4000, seed=3, workers=1)
+
+    assert sum(r["playoff_odds"] for r in result.values()) == pytest.approx(100.0 * playoff_teams, abs=0.2)
+    assert sum(r["bye_odds"] for r in result.values()) == pytest.approx(100.0 * byes, abs=0.2)
+    assert sum(r["title_odds"] for r in result.values()) == pytest.approx(100.0, abs=0.2)
+    assert sum(r["avg_wins"] for r in result.values()) == pytest.approx(len(schedule), abs=0.05)
+    assert all(r["playoff_odds"] >= r["bye_odds"] for r in result.values())
+
+
+def test_seeding_record_then_points_for():
+    # No games left: seeds are fixed by record, then points for
+    model = _model([100] * 4, wins=[3, 3, 2, 1], playoff_teams=3)
+    model["points_for"] = np.array([100.0, 200.0, 300.0, 400.0])
+    counts = _simulate_batch(model, 50, (1, 0))
+    assert counts["playoffs"].tolist() == [50, 50, 50, 0]
+    assert counts["byes"].tolist() == [0, 50, 0, 0]  # 3-0 with more points for beats 3-0
+
+
+def test_division_winners_seed_first():
+    model = _model([100] * 4, wins=[3, 3, 2, 1], playoff_teams=2, divisions=[[0, 1], [2, 3]])
+    model["points_for"] = np.array([100.0, 200.0, 300.0, 400.0])
+    counts = _simulate_batch(model, 50, (1, 0))
+    assert counts["playoffs"].tolist() == [0, 50, 50, 0]  # 2-win division winner over a 3-win wildcard
+
+
+def test_dominant_team_wins_title():
+    teams, schedule = _league_teams()
+    teams[1]["mean"], teams[1]["sd"] = 400.0, 5.0
+    settings = {"playoff_teams": 4, "reseed": True, "playoff_round_type": 0}
+    result = season_forecaster.simulate_season(teams, schedule, settings, trials=2000, seed=1, workers=1)
+    assert result[1]["title_odds"] == pytest.approx(100.0, abs=0.1)
+    assert result[1]["avg_wins"] == pytest.approx(3.0)
+
+
+def test_build_season_model():
+    league = {"settings": {"playoff_teams": 2, "playoff_week_start": 15}}
+    rosters = [
+        {"roster_id": 1, "starters": ["a"], "settings": {"wins": 2, "losses": 0, "fpts": 240, "division": 1}},
+        {"roster_id": 2, "starters": ["b"], "settings": {"wins": 1, "losses": 1, "fpts": 200, "division": 1}},
+        {"roster_id": 3, "starters": [], "settings": {"wins": 0, "losses": 2, "fpts": 160, "division": 2}},
+        {"roster_id": 4, "starters": [], "settings": {"wins": 1, "losses": 1, "fpts": 0, "division": 2}},
+    ]
+    schedule_matchups = {
+        13: [{"roster_id": 1, "matchup_id": 1}, {"roster_id": 3, "matchup_id": 1},
+             {"roster_id": 2, "matchup_id": 2}, {"roster_id": 4, "matchup_id": 2}],
+        14: [{"roster_id": 1, "matchup_id": 1}, {"roster_id": 2, "matchup_id": 1}],
+    }
+    teams, schedule, settings = season_forecaster.build_season_model(
+        league, rosters, schedule_matchups, {"a": 120.0, "b": 90.0})
+
+    assert sorted(map(sorted, schedule)) == [[1, 2], [1, 3], [2, 4]]
+    assert teams[1]["wins"] == 2 and teams[1]["points_for"] == 240.0 and teams[1]["division"] == 1
+    assert teams[1]["mean"] == pytest.approx(120.0)
+    assert teams[3]["mean"] == pytest.approx(80.0)  # no projections: season scoring average
+    known = [teams[r]["mean"] for r in (1, 2, 3)]
+    assert teams[4]["mean"] == pytest.approx(sum(known) / 3)  # nothing to go on: league average
+    assert settings["playoff_teams"] == 2
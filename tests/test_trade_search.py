@@ -0,0 +1,77 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from fantasy_ai.analysis.trade_search import TRADE_SHAPES, TradeSearch, _dominated, search_trades, slot_groups
+
+ROSTER_POSITIONS = ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "BN", "BN"]
+POSITIONS = [["QB"], ["RB"], ["RB"], ["WR"], ["WR"], ["TE"], ["RB", "WR"]]
+
+
+def _league(seed, teams=4, size=7):
+    rng = random.Random(seed)
+    players, ros, rosters = {}, {}, []
+    for rid in range(1, teams + 1):
+        pids = [f"{rid}-{i}" for i in range(size)]
+        for pid in pids:
+            players[pid] = {"fantasy_positions": rng.choice(POSITIONS)}
+            ros[pid] = round(rng.uniform(0, 150), 1)
+        rosters.append({"roster_id": rid, "players": pids, "starters": pids[:5]})
+    return rosters, players, ros
+
+
+def _exhaustive(search, me_id, partner_id, min_gain=1.0):
+    me, them = search.side(me_id), search.side(partner_id)
+    trades = []
+    for n_give, n_get in TRADE_SHAPES:
+        for give in combinations(me.pieces, n_give):
+            for get in combinations(them.pieces, n_get):
+                my_gain = me.gain(frozenset(give), get)
+                their_gain = them.gain(frozenset(get), give)
+                if my_gain >= min_gain and their_gain >= min_gain:
+                    trades.append({"give": frozenset(give), "get": frozenset(get),
+                                   "my_gain": my_gain, "their_gain": their_gain})
+    return {(t["give"], t["get"]) for t in trades if not _dominated(t, trades)}
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_offers_match_exhaustive_search(seed):
+    rosters, players, ros = _league(seed)
+    search = TradeSearch(rosters, players, ros, ROSTER_POSITIONS)
+    for partner in (2, 3, 4):
+        got = {(t["give"], t["get"]) for t in search.offers(1, partner)}
+        assert got == _exhaustive(TradeSearch(rosters, players, ros, ROSTER_POSITIONS), 1, partner)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_bound_never_below_exact_gain(seed):
+    rosters, players, ros = _league(seed)
+    search = TradeSearch(rosters, players, ros, ROSTER_POSITIONS)
+    me, them = search.side(1), search.side(2)
+    for n_give, n_get in TRADE_SHAPES:
+        for give in map(frozenset, combinations(me.pieces, n_give)):
+            base, terms = me.bound_terms(give, them.pieces)
+            for get in combinations(them.pieces, n_get):
+                assert base + sum(terms[q] for q in get) >= me.gain(give, get) - 1e-9
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_search_trades_ranks_like_exhaustive(seed):
+    rosters, players, ros = _league(seed)
+    search = TradeSearch(rosters, players, ros, ROSTER_POSITIONS)
+    everything = [t for partner in (2, 3, 4) for t in search.offers(1, partner)]
+    everything.sort(key=lambda t: (-t["my_gain"], -t["their_gain"], len(t["give"]) + len(t["get"])))
+    want = [(set(t["give"]), set(t["get"]), round(t["my_gain"], 1)) for t in everything[:3]]
+
+    got = search_trades(rosters, players, ros, ROSTER_POSITIONS, 1, limit=3)
+    assert [(set(t["give"]), set(t["get"]), t["my_gain"]) for t in got] == want
+
+
+def test_slot_groups_link_through_dual_eligibility():
+    slots = ["QB", "RB", "WR", "TE"]
+    assert len(set(slot_groups(slots, [frozenset({"RB"}), frozenset({"WR"})]))) == 4
+    groups = slot_groups(slots, [frozenset({"RB", "WR"})])
+    assert groups[1] == groups[2] and len(set(groups)) == 3
+    groups = slot_groups(slots + ["FLEX"], [frozenset({"TE"}), frozenset({"RB"})])
+    assert groups[1] == groups[3] == groups[4] and groups[2] != groups[1]
@@ -0,0 +1,46 @@
+from fantasy_ai.utils import cache, transaction_store
+from fantasy_ai.utils.transaction_store import TransactionStore, merge_week
+
+
+def _txn(tid, updated, status="complete"):
+    return {"transaction_id": tid, "status_updated": updated, "status": status}
+
+
+def test_merge_week_appends_and_updates():
+    week = {}
+    assert merge_week(week, [_txn("a", 1, "pending"), _txn("b", 2)]) == 2
+    assert merge_week(week, [_txn("a", 1, "pending"), _txn("b", 2)]) == 0
+
+    assert merge_week(week, [_txn("c", 3), _txn("a", 5)]) == 2
+    assert list(week["txns"]) == ["c", "a", "b"]  # latest fetch order, store-only entries last
+    assert week["txns"]["a"]["status"] == "complete"
+
+
+def test_merge_week_ignores_stale_copies():
+    week = {}
+    merge_week(week, [_txn("a", 5)])
+    assert merge_week(week, [_txn("a", 4, "pending")]) == 0
+    assert week["txns"]["a"]["status_updated"] == 5
+
+
+def test_sync_fetches_only_open_weeks(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    feed = {1: [_txn("a", 1)], 2: [_txn("b", 2)]}
+    calls = []
+
+    def fetch(league_id, week):
+        calls.append(week)
+        return feed[week]
+
+    monkeypatch.setattr(transaction_store, "fetch_transactions", fetch)
+    store = TransactionStore("L")
+
+    assert store.sync([1, 2], lambda w: w == 1) == {1: [_txn("a", 1)], 2: [_txn("b", 2)]}
+    assert sorted(calls) == [1, 2]
+
+    feed[2] = [_txn("b", 2), _txn("c", 3)]
+    assert store.sync([1, 2], lambda w: w <= 2)[2] == [_txn("b", 2), _txn("c", 3)]
+    assert sorted(calls) == [1, 2, 2]
+
+    assert store.sync([1, 2], lambda w: True) == {1: [_txn("a", 1)], 2: [_txn("b", 2), _txn("c", 3)]}
+    assert sorted(calls) == [1, 2, 2]